@@ -3,151 +3,240 @@
 
 
 class Node(object):
-    def __init__(self, line_no=None):
+    __slots__ = ('line_no', 'col_no')
+    _fields = ()
+
+    def __init__(self, line_no=None, col_no=None):
         self.line_no = line_no
+        self.col_no = col_no
 
 
 class IntNum(Node):
-    def __init__(self, value, line_no=None):
-        super().__init__(line_no)
+    _fields = ('value',)
+    __slots__ = _fields
+
+    def __init__(self, value, line_no=None, col_no=None):
         self.value = value
+        self.line_no = line_no
+        self.col_no = col_no
 
     def __repr__(self):
         return str(self.value)
 
 
 class FloatNum(Node):
-    def __init__(self, value, line_no=None):
-        super().__init__(line_no)
+    _fields = ('value',)
+    __slots__ = _fields
+
+    def __init__(self, value, line_no=None, col_no=None):
         self.value = value
+        self.line_no = line_no
+        self.col_no = col_no
 
     def __repr__(self):
         return str(self.value)
 
 
 class Variable(Node):
-    def __init__(self, name, indices=None, line_no=None):
-        super().__init__(line_no)
+    _fields = ('name', 'indices')
+    __slots__ = _fields
+
+    def __init__(self, name, indices=None, line_no=None, col_no=None):
         self.name = name
         self.indices = indices
+        self.line_no = line_no
+        self.col_no = col_no
 
     def __repr__(self):
         return str(self.name)
 
 
 class Matrix(Node):
-    def __init__(self, matrix, line_no=None):
-        super().__init__(line_no)
+    _fields = ('matrix',)
+    __slots__ = _fields
+
+    def __init__(self, matrix, line_no=None, col_no=None):
         self.matrix = matrix
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class BinExpr(Node):
-    def __init__(self, op, left, right, line_no=None):
-        super().__init__(line_no)
+    _fields = ('op', 'left', 'right')
+    __slots__ = _fields
+
+    def __init__(self, op, left, right, line_no=None, col_no=None):
         self.op = op
         self.left = left
         self.right = right
+        self.line_no = line_no
+        self.col_no = col_no
+
+
+class ElementwiseChain(Node):
+    # operands[0] ops[0] operands[1] ops[1] ... from left to right, made by
+    # Optimizer out of nested element-wise BinExpr
+    _fields = ('operands', 'ops', 'op_lines')
+    __slots__ = _fields
+
+    def __init__(self, operands, ops, op_lines, line_no=None, col_no=None):
+        self.operands = operands
+        self.ops = ops
+        self.op_lines = op_lines
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class UnaryExpr(Node):
-    def __init__(self, op, expr, line_no=None):
-        super().__init__(line_no)
+    _fields = ('op', 'expr')
+    __slots__ = _fields
+
+    def __init__(self, op, expr, line_no=None, col_no=None):
         self.op = op
         self.expr = expr
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class String(Node):
-    def __init__(self, value, line_no=None):
-        super().__init__(line_no)
+    _fields = ('value',)
+    __slots__ = _fields
+
+    def __init__(self, value, line_no=None, col_no=None):
         self.value = value
+        self.line_no = line_no
+        self.col_no = col_no
 
     def __repr__(self):
         return str(self.value)
 
 
 class Instruction(Node):
-    def __init__(self, instruction_type, value=None, line_no=None):
-        super().__init__(line_no)
+    _fields = ('instruction_type', 'value')
+    __slots__ = _fields
+
+    def __init__(self, instruction_type, value=None, line_no=None,
+                 col_no=None):
         self.instruction_type = instruction_type
         self.value = value
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class Assign(Node):
-    def __init__(self, pid, assign_type, value, line_no=None):
-        super().__init__(line_no)
+    _fields = ('pid', 'assign_type', 'value')
+    __slots__ = _fields
+
+    def __init__(self, pid, assign_type, value, line_no=None, col_no=None):
         self.pid = pid
         self.assign_type = assign_type
         self.value = value
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class Equality(BinExpr):
-    def __init__(self, op, left, right, line_no=None):
-        super().__init__(op, left, right, line_no)
+    __slots__ = ()
 
 
 class Negation(Node):
-    def __init__(self, value, line_no=None):
-        super().__init__(line_no)
+    _fields = ('value',)
+    __slots__ = _fields
+
+    def __init__(self, value, line_no=None, col_no=None):
         self.value = value
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class MatrixOperation(Node):
-    def __init__(self, op_type, values, line_no=None):
-        super().__init__(line_no)
+    _fields = ('op_type', 'values')
+    __slots__ = _fields
+
+    def __init__(self, op_type, values, line_no=None, col_no=None):
         self.op_type = op_type
         self.values = values
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class Transpose(UnaryExpr):
-    def __init__(self, op, expr, line_no=None):
-        super().__init__(op, expr, line_no)
+    __slots__ = ()
 
 
 class Program(Node):
-    def __init__(self, instructions_opt, line_no=None):
-        super().__init__(line_no)
+    _fields = ('instructions_opt',)
+    __slots__ = _fields
+
+    def __init__(self, instructions_opt, line_no=None, col_no=None):
         self.instructions_opt = instructions_opt
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class InstructionsOpt(Node):
-    def __init__(self, instructions, line_no=None):
-        super().__init__(line_no)
+    _fields = ('instructions',)
+    __slots__ = _fields
+
+    def __init__(self, instructions, line_no=None, col_no=None):
         self.instructions = instructions
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class IfCondition(Node):
+    _fields = ('expr', 'block', 'else_cond', 'else_block')
+    __slots__ = _fields
+
     def __init__(self, expr, block, else_cond=None,
-                 else_block=None, line_no=None):
-        super().__init__(line_no)
+                 else_block=None, line_no=None, col_no=None):
         self.expr = expr
         self.block = block
         self.else_cond = else_cond
         self.else_block = else_block
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class ForCondition(Node):
-    def __init__(self, pid, for_range, block, line_no=None):
-        super().__init__(line_no)
+    _fields = ('pid', 'for_range', 'block')
+    __slots__ = _fields
+
+    def __init__(self, pid, for_range, block, line_no=None, col_no=None):
         self.pid = pid
         self.for_range = for_range
         self.block = block
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class WhileCondition(Node):
-    def __init__(self, expr, block, line_no=None):
-        super().__init__(line_no)
+    _fields = ('expr', 'block')
+    __slots__ = _fields
+
+    def __init__(self, expr, block, line_no=None, col_no=None):
         self.expr = expr
         self.block = block
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class Range(Node):
-    def __init__(self, start, end, line_no=None):
-        super().__init__(line_no)
+    _fields = ('start', 'end')
+    __slots__ = _fields
+
+    def __init__(self, start, end, line_no=None, col_no=None):
         self.start = start
         self.end = end
+        self.line_no = line_no
+        self.col_no = col_no
 
 
 class Error(Node):
-    def __init__(self, error_type, line_no=None):
-        super().__init__(line_no)
+    _fields = ('error_type',)
+    __slots__ = _fields
+
+    def __init__(self, error_type, line_no=None, col_no=None):
         self.error_type = error_type
+        self.line_no = line_no
+        self.col_no = col_no
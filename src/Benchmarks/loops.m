@@ -0,0 +1,9 @@
+# nested scalar loops
+
+s = 0;
+for i = 1:300 {
+    for j = 1:300 {
+        s += i * j - j;
+    }
+}
+print s;
@@ -0,0 +1,15 @@
+# element updates through indexing
+
+N = 120;
+A = zeros(N);
+for i = 1:N {
+    for j = 1:N {
+        A[i, j] = i + 2 * j;
+    }
+}
+
+t = 0;
+for i = 1:N {
+    t += A[i, i];
+}
+print t;
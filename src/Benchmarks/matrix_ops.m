@@ -0,0 +1,11 @@
+# vectorized matrix kernels
+
+A = ones(200) .* 0.5;
+B = eye(200) .+ 0.25;
+C = zeros(200);
+for i = 1:40 {
+    C = C + A * B';
+    C = C .* 0.5;
+    A = A .+ C ./ 100;
+}
+print C[1, 1];
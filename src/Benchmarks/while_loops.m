@@ -0,0 +1,16 @@
+# while loops with branches
+
+steps = 0;
+n = 1;
+while (n < 1000) {
+    k = n;
+    while (k != 1) {
+        if (k / 2 * 2 == k)
+            k = k / 2;
+        else
+            k = 3 * k + 1;
+        steps += 1;
+    }
+    n += 1;
+}
+print steps;
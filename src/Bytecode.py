@@ -0,0 +1,502 @@
+#!/usr/bin/python
+
+import array
+import operator
+import sys
+import AST
+import Values
+from Compiler import statement_nodes
+from Exceptions import *
+from scanner import string_value
+from TypeChecker import NodeVisitor
+
+
+# Opcodes, by number. Every instruction is an opcode and one argument: a
+# slot, a constant, a count, an operator or a jump target.
+opcode_names = ('LOAD', 'CONST', 'STORE', 'BINARY', 'JUMP_IF_FALSE', 'JUMP',
+                'FOR_NEXT', 'GET_ELEMENT', 'SET_ELEMENT', 'POP', 'COPY',
+                'REVERSED_BINARY', 'IN_PLACE', 'NEGATE', 'TRANSPOSE',
+                'BUILD_LIST', 'MATRIX', 'MATRIX_OP', 'FOR_RANGE', 'PRINT',
+                'RETURN', 'ERROR', 'HALT')
+
+(LOAD, CONST, STORE, BINARY, JUMP_IF_FALSE, JUMP, FOR_NEXT, GET_ELEMENT,
+ SET_ELEMENT, POP, COPY, REVERSED_BINARY, IN_PLACE, NEGATE, TRANSPOSE,
+ BUILD_LIST, MATRIX, MATRIX_OP, FOR_RANGE, PRINT, RETURN, ERROR,
+ HALT) = range(len(opcode_names))
+
+jump_opcodes = (JUMP_IF_FALSE, JUMP, FOR_NEXT)
+
+# Arguments of BINARY, REVERSED_BINARY, IN_PLACE and MATRIX_OP
+binary_ops = tuple(Values.operations)
+binary_functions = tuple(Values.operations[op] for op in binary_ops)
+matrix_ops = tuple(Values.matrix_operations)
+matrix_functions = tuple(Values.matrix_operations[op] for op in matrix_ops)
+
+# The operators of BINARY and REVERSED_BINARY on two ints, None where
+# Values.operations differs, the element-wise ones go through numpy
+int_functions = tuple(None if op.startswith('.') else
+                      operator.floordiv if op == '/' else
+                      Values.binary_operations[op] for op in binary_ops)
+
+arithmetic_errors = (ArithmeticError, TypeError, ValueError)
+
+
+class CodeObject(object):
+    # Parallel arrays of opcodes, arguments and source lines, 0 for none,
+    # with the constants pool and the variable name of each slot
+
+    def __init__(self):
+        self.ops = array.array('B')
+        self.args = array.array('L')
+        self.lines = array.array('L')
+        self.consts = []
+        self.names = []
+        self.frame = []
+
+    def __len__(self):
+        return len(self.ops)
+
+    def line(self, pc):
+        return self.lines[pc] or None
+
+    def run(self):
+        self.frame = [None] * len(self.names)
+
+        return execute(self, self.frame)
+
+    def variables(self):
+        return dict((name, value) for name, value in zip(self.names,
+                                                          self.frame)
+                    if value is not None)
+
+
+class BytecodeCompiler(NodeVisitor):
+    # Expressions leave their value on the stack, statements leave the
+    # stack as they found it. Jumps are emitted with no target and patched
+    # once the target is known.
+
+    def compile(self, node):
+        self.code = CodeObject()
+        self.slots = dict()
+        self.constants = dict()
+        # (continue target, break jumps) of the enclosing loops
+        self.loops = []
+        self.statement(node)
+        self.emit(HALT)
+
+        return self.code
+
+    def emit(self, op, arg=0, line_no=None):
+        self.code.ops.append(op)
+        self.code.args.append(arg)
+        self.code.lines.append(line_no or 0)
+
+        return len(self.code.ops) - 1
+
+    def patch(self, pc, target=None):
+        self.code.args[pc] = len(self.code.ops) if target is None else target
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.code.names)
+            self.code.names.append(name)
+
+        return self.slots[name]
+
+    def constant(self, value):
+        # 1, 1.0 and True are equal keys, the class keeps them apart
+        key = (value.__class__, value)
+
+        if key not in self.constants:
+            self.constants[key] = len(self.code.consts)
+            self.code.consts.append(value)
+
+        return self.constants[key]
+
+    def statement(self, node):
+        if node is None:
+            # An empty block, { }
+            return
+
+        self.visit(node)
+
+        if not isinstance(node, statement_nodes) and \
+                not isinstance(node, AST.Program):
+            self.emit(POP)
+
+    def values(self, nodes):
+        for node in nodes:
+            self.visit(node)
+
+        self.emit(BUILD_LIST, len(nodes))
+
+    def visit_Program(self, node):
+        if node.instructions_opt:
+            self.statement(node.instructions_opt)
+
+    def visit_InstructionsOpt(self, node):
+        for instruction in node.instructions:
+            self.statement(instruction)
+
+    def visit_IntNum(self, node):
+        self.emit(CONST, self.constant(node.value))
+
+    def visit_FloatNum(self, node):
+        self.emit(CONST, self.constant(node.value))
+
+    def visit_String(self, node):
+        self.emit(CONST, self.constant(string_value(node.value)))
+
+    def visit_Variable(self, node):
+        slot = self.slot(node.name)
+        self.emit(LOAD, slot, node.line_no)
+
+        if node.indices:
+            self.values(node.indices)
+            self.emit(GET_ELEMENT, slot, node.line_no)
+
+    def visit_Assign(self, node):
+        pid = node.pid
+        slot = self.slot(pid.name)
+        self.visit(node.value)
+
+        if node.assign_type != '=':
+            self.visit(pid)
+            self.emit(REVERSED_BINARY,
+                      binary_ops.index(node.assign_type[0]), node.line_no)
+        elif isinstance(node.value, (AST.Variable, AST.Transpose)):
+            # Matrices are values, the copy keeps indexed stores local
+            self.emit(COPY)
+
+        if not pid.indices:
+            self.emit(STORE, slot)
+            return
+
+        self.values(pid.indices)
+        self.emit(SET_ELEMENT, slot, node.line_no)
+
+    def visit_BinExpr(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+        self.emit(BINARY, binary_ops.index(node.op), node.line_no)
+
+    def visit_Equality(self, node):
+        self.visit_BinExpr(node)
+
+    def visit_ElementwiseChain(self, node):
+        self.visit(node.operands[0])
+        self.visit(node.operands[1])
+        self.emit(BINARY, binary_ops.index(node.ops[0]), node.op_lines[0])
+
+        # The first op made a new matrix, the others may write into it
+        for op, operand, line_no in zip(node.ops[1:], node.operands[2:],
+                                        node.op_lines[1:]):
+            self.visit(operand)
+            self.emit(IN_PLACE, binary_ops.index(op), line_no)
+
+    def visit_Negation(self, node):
+        self.visit(node.value)
+        self.emit(NEGATE, 0, node.line_no)
+
+    def visit_Transpose(self, node):
+        self.visit(node.expr)
+        self.emit(TRANSPOSE)
+
+    def visit_Matrix(self, node):
+        for row in node.matrix:
+            self.values(row)
+
+        self.emit(BUILD_LIST, len(node.matrix))
+        self.emit(MATRIX, 0, node.line_no)
+
+    def visit_MatrixOperation(self, node):
+        self.values(node.values)
+        self.emit(MATRIX_OP, matrix_ops.index(node.op_type), node.line_no)
+
+    def visit_IfCondition(self, node):
+        self.visit(node.expr)
+        to_else = self.emit(JUMP_IF_FALSE)
+        self.statement(node.block)
+        else_node = node.else_block or node.else_cond
+
+        if not else_node:
+            self.patch(to_else)
+            return
+
+        to_end = self.emit(JUMP)
+        self.patch(to_else)
+        self.statement(else_node)
+        self.patch(to_end)
+
+    def visit_WhileCondition(self, node):
+        start = len(self.code)
+        self.visit(node.expr)
+        to_end = self.emit(JUMP_IF_FALSE)
+        breaks = self.loop(start, node.block)
+        self.emit(JUMP, start)
+        self.patch(to_end)
+
+        for pc in breaks:
+            self.patch(pc)
+
+    def visit_ForCondition(self, node):
+        # The range iterator stays on the stack while the loop runs,
+        # FOR_NEXT drops it when done and a break drops it on the way out
+        self.visit(node.for_range.start)
+        self.visit(node.for_range.end)
+        self.emit(FOR_RANGE, 0, node.for_range.line_no)
+        start = self.emit(FOR_NEXT)
+        self.emit(STORE, self.slot(node.pid.name))
+        breaks = self.loop(start, node.block)
+        self.emit(JUMP, start)
+
+        if breaks:
+            to_end = self.emit(JUMP)
+
+            for pc in breaks:
+                self.patch(pc)
+
+            self.emit(POP)
+            self.patch(to_end)
+
+        self.patch(start)
+
+    def loop(self, start, block):
+        # Returns the break jumps, to be patched to the end of the loop
+        breaks = []
+        self.loops.append((start, breaks))
+        self.statement(block)
+        self.loops.pop()
+
+        return breaks
+
+    def visit_Error(self, node):
+        self.emit(ERROR, self.constant(node.error_type), node.line_no)
+
+    def visit_Instruction(self, node):
+        inst_type = node.instruction_type
+
+        if inst_type in ('break', 'continue'):
+            if not self.loops:
+                self.emit(ERROR, self.constant("Instruction outside a loop"),
+                          node.line_no)
+            elif inst_type == 'break':
+                self.loops[-1][1].append(self.emit(JUMP))
+            else:
+                self.emit(JUMP, self.loops[-1][0])
+            return
+
+        if isinstance(node.value, list):
+            values = node.value
+        elif node.value is not None:
+            values = [node.value]
+        else:
+            values = []
+
+        for value in values:
+            self.visit(value)
+
+        self.emit(PRINT if inst_type == 'print' else RETURN, len(values))
+
+
+def execute(code, frame):
+    # The dispatch loop, the most frequent opcodes are tested first and
+    # against locals, a module global costs a dictionary lookup per test
+    ops = code.ops
+    args = code.args
+    consts = code.consts
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    pc = 0
+    load, const, store, binary, jump_if_false, jump, for_next = \
+        LOAD, CONST, STORE, BINARY, JUMP_IF_FALSE, JUMP, FOR_NEXT
+
+    while True:
+        op = ops[pc]
+        arg = args[pc]
+        pc += 1
+
+        if op == load:
+            value = frame[arg]
+
+            if value is None:
+                raise RuntimeException("Not existing variable: " +
+                                       code.names[arg], code.line(pc - 1))
+            push(value)
+        elif op == const:
+            push(consts[arg])
+        elif op == store:
+            frame[arg] = pop()
+        elif op == binary:
+            right = pop()
+            left = stack[-1]
+
+            try:
+                if left.__class__ is int and right.__class__ is int and \
+                        int_functions[arg]:
+                    stack[-1] = int_functions[arg](left, right)
+                else:
+                    stack[-1] = binary_functions[arg](left, right)
+            except arithmetic_errors as error:
+                raise RuntimeException(str(error), code.line(pc - 1))
+        elif op == jump_if_false:
+            if not pop():
+                pc = arg
+        elif op == jump:
+            pc = arg
+        elif op == for_next:
+            # Loop counters are ints, None is the end of the range. The
+            # STORE that follows is done here.
+            value = next(stack[-1], None)
+
+            if value is None:
+                pop()
+                pc = arg
+            else:
+                frame[args[pc]] = value
+                pc += 1
+        elif op == GET_ELEMENT:
+            indices = pop()
+
+            try:
+                stack[-1] = stack[-1].get(indices)
+            except (AttributeError, IndexError, TypeError, ValueError):
+                raise RuntimeException("Invalid index for " + code.names[arg],
+                                       code.line(pc - 1))
+        elif op == SET_ELEMENT:
+            indices = pop()
+            value = pop()
+
+            try:
+                frame[arg].set(indices, value)
+            except (AttributeError, IndexError, TypeError, ValueError):
+                raise RuntimeException("Invalid index for " + code.names[arg],
+                                       code.line(pc - 1))
+        elif op == POP:
+            pop()
+        elif op == COPY:
+            if stack[-1].__class__ is Values.MatrixValue:
+                stack[-1] = stack[-1].copy()
+        elif op == REVERSED_BINARY:
+            # Compound assignment: the new value was computed before the
+            # current one was read
+            left = pop()
+            right = stack[-1]
+
+            try:
+                if left.__class__ is int and right.__class__ is int and \
+                        int_functions[arg]:
+                    stack[-1] = int_functions[arg](left, right)
+                else:
+                    stack[-1] = binary_functions[arg](left, right)
+            except arithmetic_errors as error:
+                raise RuntimeException(str(error), code.line(pc - 1))
+        elif op == IN_PLACE:
+            right = pop()
+
+            try:
+                stack[-1] = Values.in_place(binary_ops[arg], stack[-1], right)
+            except arithmetic_errors as error:
+                raise RuntimeException(str(error), code.line(pc - 1))
+        elif op == NEGATE:
+            try:
+                stack[-1] = Values.negate(stack[-1])
+            except arithmetic_errors as error:
+                raise RuntimeException(str(error), code.line(pc - 1))
+        elif op == TRANSPOSE:
+            stack[-1] = Values.transpose(stack[-1])
+        elif op == BUILD_LIST:
+            if arg:
+                values = stack[-arg:]
+                del stack[-arg:]
+            else:
+                values = []
+
+            push(values)
+        elif op == MATRIX:
+            try:
+                stack[-1] = Values.matrix(stack[-1])
+            except ValueError:
+                raise RuntimeException("Incompatible size for matrix",
+                                       code.line(pc - 1))
+        elif op == MATRIX_OP:
+            try:
+                stack[-1] = matrix_functions[arg](stack[-1])
+            except (TypeError, ValueError):
+                raise RuntimeException("Invalid dimension values",
+                                       code.line(pc - 1))
+        elif op == FOR_RANGE:
+            end = pop()
+
+            try:
+                stack[-1] = iter(Values.for_range(stack[-1], end))
+            except TypeError as error:
+                raise RuntimeException(str(error), code.line(pc - 1))
+        elif op == PRINT:
+            values = stack[len(stack) - arg:]
+            del stack[len(stack) - arg:]
+            print(*values)
+        elif op == RETURN:
+            values = stack[len(stack) - arg:]
+
+            return values[0] if len(values) == 1 else values or None
+        elif op == ERROR:
+            raise RuntimeException(consts[arg], code.line(pc - 1))
+        elif op == HALT:
+            return None
+
+
+def disassemble(code):
+    # One line per instruction: jump targets marked with >>, the source
+    # line where it changes, and what the argument stands for
+    targets = set(arg for op, arg in zip(code.ops, code.args)
+                  if op in jump_opcodes)
+    last_line = None
+
+    for pc, (op, arg) in enumerate(zip(code.ops, code.args)):
+        line_no = code.line(pc)
+
+        if op in (LOAD, STORE, GET_ELEMENT, SET_ELEMENT):
+            meaning = code.names[arg]
+        elif op in (CONST, ERROR):
+            meaning = repr(code.consts[arg])
+        elif op in (BINARY, REVERSED_BINARY, IN_PLACE):
+            meaning = binary_ops[arg]
+        elif op == MATRIX_OP:
+            meaning = matrix_ops[arg]
+        else:
+            meaning = ''
+
+        yield "{0:>4} {1:>2} {2:5} {3:<16}{4:>5} {5}".format(
+            line_no if line_no and line_no != last_line else '',
+            '>>' if pc in targets else '', pc, opcode_names[op], arg,
+            '(' + meaning + ')' if meaning else '').rstrip()
+
+        last_line = line_no or last_line
+
+
+if __name__ == '__main__':
+    from Mparser import Mparser
+
+    try:
+        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        file = open(filename, "r")
+    except IOError:
+        print("Cannot open {0} file".format(filename))
+        sys.exit(0)
+
+    parser = Mparser()
+    ast = parser.parse(file.read())
+
+    if parser.errors:
+        for error in parser.errors:
+            print(error)
+        sys.exit(1)
+
+    code = BytecodeCompiler().compile(ast)
+    print("{0} instructions, {1} constants, {2} slots".format(
+        len(code), len(code.consts), len(code.names)))
+
+    for line in disassemble(code):
+        print(line)
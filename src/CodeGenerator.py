@@ -0,0 +1,1015 @@
+#!/usr/bin/python
+
+import io
+import contextlib
+import keyword
+import math
+import os
+import sys
+import types
+import AST
+from scanner import string_value
+from TypeChecker import NodeVisitor, TypeChecker
+
+
+# What is known of a value: an int (or a bool), a float, a number of
+# either kind, a string or a matrix. None is anything.
+INT = 'int'
+FLOAT = 'float'
+SCALAR = 'scalar'
+STRING = 'string'
+MATRIX = 'matrix'
+numeric_kinds = (INT, FLOAT, SCALAR)
+
+comparison_ops = ('==', '!=', '<', '>', '<=', '>=')
+elementwise_ops = {'.+': '+', '.-': '-', '.*': '*', './': '/'}
+
+# Python precedence of the generated expressions, higher binds tighter
+COMPARISON, SUM, PRODUCT, UNARY, ATOM = range(1, 6)
+
+# Names the generated code uses, variables get another name
+reserved = set(keyword.kwlist) | {'numpy', 'operator', 'range', 'print',
+                                  'type', 'int', 'float', 'isinstance',
+                                  'run'}
+
+# Helpers of the generated module, where a value may or may not be a matrix
+# or an operation may fail. Index, division and range errors raise
+# RuntimeError('Line N: ...') with the engines' messages. Using a variable
+# before it is assigned, such as the counter of a for loop over an empty
+# range, is Python's NameError or UnboundLocalError instead.
+helpers = {
+    '_str': '''
+def _str(value):
+    if isinstance(value, numpy.ndarray):
+        return '[' + '; '.join(', '.join(str(elem) for elem in row)
+                               for row in value.tolist()) + ']'
+    return value
+''',
+    '_multiply': '''
+def _multiply(left, right):
+    if isinstance(left, numpy.ndarray) and isinstance(right, numpy.ndarray):
+        return left @ right
+    return left * right
+''',
+    '_divide': '''
+def _divide(left, right, line):
+    try:
+        if isinstance(left, int) and isinstance(right, int):
+            return left // right
+        elif isinstance(right, numpy.ndarray):
+            if isinstance(left, numpy.ndarray):
+                return numpy.linalg.solve(right.T, left.T).T
+            return left * numpy.linalg.inv(right)
+        return left / right
+    except (ArithmeticError, TypeError, ValueError) as error:
+        raise RuntimeError(line + str(error)) from None
+''',
+    '_get': '''
+def _get(matrix, message, *indices):
+    try:
+        return matrix[_at(matrix, indices)].item()
+    except (AttributeError, IndexError, TypeError, ValueError):
+        raise RuntimeError(message) from None
+''',
+    '_set': '''
+def _set(matrix, message, value, *indices):
+    try:
+        matrix[_at(matrix, indices)] = value
+    except (AttributeError, IndexError, TypeError, ValueError):
+        raise RuntimeError(message) from None
+''',
+    '_at': '''
+def _at(matrix, indices):
+    # 0 and below would count from the end in numpy
+    if any(i < 1 for i in indices):
+        raise IndexError(indices)
+    if len(indices) == 1:
+        return numpy.unravel_index(indices[0] - 1, matrix.shape)
+    return tuple(i - 1 for i in indices)
+''',
+    '_range': '''
+def _range(start, end, message):
+    # range() takes bools as ints, but not floats or strings
+    if not isinstance(start, int) or not isinstance(end, int):
+        raise RuntimeError(message)
+    return range(start, end + 1)
+''',
+    '_elementwise': '''
+def _elementwise(func, left, right):
+    result = func(left, right)
+    if isinstance(result, numpy.generic):
+        return result.item()
+    return result
+''',
+    '_compare': '''
+def _compare(op, left, right):
+    result = op(left, right)
+    if isinstance(result, numpy.ndarray):
+        return bool(result.all())
+    return result
+''',
+    '_transpose': '''
+def _transpose(value):
+    if isinstance(value, numpy.ndarray):
+        return value.T
+    return value
+''',
+    '_copy': '''
+def _copy(value):
+    if isinstance(value, numpy.ndarray):
+        return value.copy()
+    return value
+''',
+    '_true': '''
+def _true(value):
+    return isinstance(value, numpy.ndarray) or bool(value)
+''',
+}
+
+numpy_functions = {'.+': 'numpy.add', '.-': 'numpy.subtract',
+                   '.*': 'numpy.multiply', './': 'numpy.divide'}
+operator_functions = {'==': 'operator.eq', '!=': 'operator.eq',
+                      '<': 'operator.lt', '>': 'operator.gt',
+                      '<=': 'operator.le', '>=': 'operator.ge'}
+
+
+def join_kinds(kind1, kind2):
+    if kind1 == kind2:
+        return kind1
+    elif kind1 in numeric_kinds and kind2 in numeric_kinds:
+        return SCALAR
+
+    return None
+
+
+def binary_kind(op, left, right):
+    if op in comparison_ops:
+        return INT
+    elif op in elementwise_ops:
+        return MATRIX if MATRIX in (left, right) else None
+    elif left == MATRIX or right == MATRIX:
+        other = right if left == MATRIX else left
+
+        return MATRIX if other == MATRIX or other in numeric_kinds else None
+    elif left in numeric_kinds and right in numeric_kinds:
+        if left == right == INT:
+            return INT
+
+        return SCALAR if SCALAR in (left, right) else FLOAT
+    elif op == '+' and left == right == STRING:
+        return STRING
+
+    return None
+
+
+class Bottom(Exception):
+    # A variable read before any of its assignments was given a kind
+    pass
+
+
+class VariableKinds(NodeVisitor):
+    # The kind of each variable over the whole program, the join of the
+    # kinds of everything assigned to it, found again until none changes.
+    # Element stores keep the kind of the matrix.
+
+    def collect(self, node):
+        self.assignments = []
+        self.visit(node)
+        self.kinds = dict()
+        changed = True
+
+        while changed:
+            changed = False
+
+            for name, value, assign_type in self.assignments:
+                try:
+                    kind = self.assigned_kind(name, value, assign_type)
+                except Bottom:
+                    continue
+
+                new_kind = join_kinds(self.kinds[name], kind) \
+                    if name in self.kinds else kind
+
+                if name not in self.kinds or new_kind != self.kinds[name]:
+                    self.kinds[name] = new_kind
+                    changed = True
+
+        return self.kinds
+
+    def assigned_kind(self, name, value, assign_type):
+        if value is None:
+            return INT
+
+        kind = expression_kind(value, self.kind)
+
+        if assign_type != '=':
+            kind = binary_kind(assign_type[0], self.kind(name), kind)
+
+        return kind
+
+    def kind(self, name):
+        if name not in self.kinds:
+            raise Bottom()
+
+        return self.kinds[name]
+
+    def visit_Assign(self, node):
+        if not node.pid.indices:
+            self.assignments.append((node.pid.name, node.value,
+                                     node.assign_type))
+
+    def visit_ForCondition(self, node):
+        # The loop counter is an int
+        self.assignments.append((node.pid.name, None, '='))
+        self.visit(node.block)
+
+
+def expression_kind(node, kind):
+    node_class = node.__class__
+
+    if node_class is AST.IntNum:
+        return INT
+    elif node_class is AST.FloatNum:
+        return FLOAT
+    elif node_class is AST.String:
+        return STRING
+    elif node_class is AST.Variable:
+        # Elements are read as Python numbers
+        return SCALAR if node.indices else kind(node.name)
+    elif node_class in (AST.BinExpr, AST.Equality):
+        return binary_kind(node.op, expression_kind(node.left, kind),
+                           expression_kind(node.right, kind))
+    elif node_class is AST.ElementwiseChain:
+        return MATRIX if expression_kind(node.operands[0], kind) == MATRIX \
+            else None
+    elif node_class is AST.Negation:
+        return expression_kind(node.value, kind)
+    elif node_class is AST.Transpose:
+        return expression_kind(node.expr, kind)
+    elif node_class in (AST.Matrix, AST.MatrixOperation):
+        return MATRIX
+
+    return None
+
+
+class NameCollector(NodeVisitor):
+    def collect(self, node):
+        self.names = set()
+        self.visit(node)
+
+        return self.names
+
+    def visit_Variable(self, node):
+        self.names.add(node.name)
+        self.generic_visit(node)
+
+
+def python_names(names):
+    # Variables keep their name unless the generated code needs it, or it
+    # starts with an underscore like the helpers and temporaries
+    mapping = dict()
+
+    for name in sorted(names):
+        if name not in reserved and not name.startswith('_'):
+            mapping[name] = name
+            continue
+
+        new_name = 'v' + name if name.startswith('_') else name + '_'
+
+        while new_name in names or new_name in mapping.values() or \
+                new_name in reserved:
+            new_name += '_'
+
+        mapping[name] = new_name
+
+    return mapping
+
+
+def simple(node):
+    # A number or a variable, whose value is computed without errors
+    return node.__class__ in (AST.IntNum, AST.FloatNum) or \
+        node.__class__ is AST.Variable and not node.indices
+
+
+def single(block):
+    # The one statement of a block, through nested braces
+    while block.__class__ is AST.InstructionsOpt and \
+            len(block.instructions) == 1:
+        block = block.instructions[0]
+
+    return block
+
+
+class CodeGenerator(NodeVisitor):
+    # Writes the program as the body of run() in a Python module, with
+    # matrices as numpy arrays. Expressions visit to (code, kind,
+    # precedence). Where kinds are known operators map straight to Python
+    # and numpy, elsewhere the helpers decide when the program runs.
+
+    def generate(self, node, source=None):
+        self.kinds = VariableKinds().collect(node)
+        self.names = python_names(NameCollector().collect(node))
+        self.used = set()
+        self.lines = []
+        self.depth = 1
+        self.loop = 0
+        self.temps = 0
+        self.vectorized = 0
+        # Inside the loop kept for when the vectorized store cannot run
+        self.fallback = False
+        self.block(node)
+
+        header = ["# Generated from {0}, matrices are numpy "
+                  "arrays".format(source or "a program"), "",
+                  "import numpy"]
+
+        if any('operator.' in line for line in self.lines):
+            header.append("import operator")
+
+        for name in sorted(self.used):
+            header.extend(helpers[name].rstrip('\n').split('\n'))
+            header.append('')
+
+        return "\n".join(header + ["", "def run():"] + self.lines +
+                         ["", "", "if __name__ == '__main__':",
+                          "    run()", ""])
+
+    def emit(self, line):
+        self.lines.append('    ' * self.depth + line)
+
+    def helper(self, name):
+        self.used.add(name)
+
+        return name
+
+    def temp(self):
+        self.temps += 1
+
+        return self.temps - 1
+
+    def block(self, node):
+        start = len(self.lines)
+        self.visit(node)
+
+        if len(self.lines) == start:
+            self.emit('pass')
+
+    def name(self, name):
+        return self.names[name]
+
+    def kind(self, name):
+        return self.kinds.get(name)
+
+    def operand(self, node, precedence):
+        code, kind, node_precedence = self.visit(node)
+
+        if node_precedence < precedence:
+            code = '(' + code + ')'
+
+        return code, kind
+
+    def visit_Program(self, node):
+        if node.instructions_opt:
+            self.visit(node.instructions_opt)
+
+    def visit_InstructionsOpt(self, node):
+        for instruction in node.instructions:
+            self.visit(instruction)
+
+    def visit_IntNum(self, node):
+        return str(node.value), INT, UNARY if node.value < 0 else ATOM
+
+    def visit_FloatNum(self, node):
+        value = node.value
+
+        if not math.isfinite(value):
+            return "float('{0!r}')".format(value), FLOAT, ATOM
+
+        return repr(value), FLOAT, UNARY if value < 0 else ATOM
+
+    def visit_String(self, node):
+        return repr(string_value(node.value)), STRING, ATOM
+
+    def visit_Variable(self, node):
+        name = self.name(node.name)
+
+        if not node.indices:
+            return name, self.kind(node.name), ATOM
+
+        return self.element('_get', node.name, node.line_no, [],
+                            node.indices), SCALAR, ATOM
+
+    def element(self, helper, name, line_no, values, indices):
+        # Elements go through the helpers, which check the 1-based indices
+        # as the engines do. A single index walks the matrix row by row.
+        self.helper('_at')
+        message = "Line {0}: Invalid index for {1}".format(line_no, name)
+
+        return self.call(helper, self.name(name), repr(message),
+                         *(values + [self.visit(index)[0]
+                                     for index in indices]))
+
+    def visit_Assign(self, node):
+        pid = node.pid
+        code, kind, precedence = self.visit(node.value)
+
+        if node.assign_type != '=':
+            if pid.indices and not simple(node.value):
+                # The engines compute the value before they read the element
+                temp = '_v{0}'.format(self.temp())
+                self.emit('{0} = {1}'.format(temp, code))
+                code, precedence = temp, ATOM
+
+            code, kind, precedence = self.binary(
+                node.assign_type[0], self.visit(pid), (code, kind, precedence),
+                node.line_no, node.value)
+        elif isinstance(node.value, (AST.Variable, AST.Transpose)) and \
+                kind not in numeric_kinds and kind != STRING:
+            # Matrices are values, the copy keeps indexed stores local
+            if kind == MATRIX:
+                code = (code if precedence == ATOM else
+                        '(' + code + ')') + '.copy()'
+            else:
+                code = self.helper('_copy') + '(' + code + ')'
+
+        if not pid.indices:
+            self.emit('{0} = {1}'.format(self.name(pid.name), code))
+        else:
+            self.emit(self.element('_set', pid.name, node.line_no, [code],
+                                   pid.indices))
+
+    def binary(self, op, left, right, line_no, divisor=None):
+        # (code, kind, precedence) of left op right from those of both.
+        # Divisions by anything but a nonzero number report their errors at
+        # line_no.
+        left_code, left_kind, left_precedence = left
+        right_code, right_kind, right_precedence = right
+        kind = binary_kind(op, left_kind, right_kind)
+        known = (left_kind in numeric_kinds or left_kind == STRING) and \
+            (right_kind in numeric_kinds or right_kind == STRING)
+
+        if op in comparison_ops and not known:
+            code = '{0}({1}, {2}, {3})'.format(
+                self.helper('_compare'), operator_functions[op], left_code,
+                right_code)
+
+            return ('not ' + code, kind, UNARY) if op == '!=' else \
+                (code, kind, ATOM)
+        elif op in comparison_ops:
+            python_op, precedence = op, COMPARISON
+        elif op in ('+', '-'):
+            python_op, precedence = op, SUM
+        elif op == '*':
+            if left_kind == right_kind == MATRIX:
+                python_op = '@'
+            elif left_kind in numeric_kinds or right_kind in numeric_kinds \
+                    or STRING in (left_kind, right_kind):
+                python_op = '*'
+            else:
+                return self.call('_multiply', left_code, right_code), kind, \
+                    ATOM
+
+            precedence = PRODUCT
+        elif op == '/':
+            nonzero = divisor.__class__ in (AST.IntNum, AST.FloatNum) and \
+                divisor.value != 0
+
+            if left_kind == right_kind == INT and nonzero:
+                python_op = '//'
+            elif FLOAT in (left_kind, right_kind) and \
+                    left_kind in numeric_kinds and \
+                    right_kind in numeric_kinds and nonzero or \
+                    left_kind == MATRIX and right_kind in numeric_kinds:
+                python_op = '/'
+            else:
+                return self.call('_divide', left_code, right_code,
+                                 repr("Line {0}: ".format(line_no))), \
+                    kind, ATOM
+
+            precedence = PRODUCT
+        elif MATRIX in (left_kind, right_kind):
+            python_op = elementwise_ops[op]
+            precedence = SUM if python_op in '+-' else PRODUCT
+        else:
+            return '{0}({1}, {2}, {3})'.format(
+                self.helper('_elementwise'), numpy_functions[op], left_code,
+                right_code), kind, ATOM
+
+        # Left operands of the same precedence need no brackets, right ones
+        # and comparisons do
+        if left_precedence < precedence or precedence == COMPARISON and \
+                left_precedence == precedence:
+            left_code = '(' + left_code + ')'
+        if right_precedence <= precedence:
+            right_code = '(' + right_code + ')'
+
+        return '{0} {1} {2}'.format(left_code, python_op, right_code), kind, \
+            precedence
+
+    def call(self, helper, *args):
+        return '{0}({1})'.format(self.helper(helper), ', '.join(args))
+
+    def visit_BinExpr(self, node):
+        return self.binary(node.op, self.visit(node.left),
+                           self.visit(node.right), node.line_no, node.right)
+
+    def visit_Equality(self, node):
+        return self.visit_BinExpr(node)
+
+    def visit_ElementwiseChain(self, node):
+        result = self.visit(node.operands[0])
+
+        for op, operand, line_no in zip(node.ops, node.operands[1:],
+                                        node.op_lines):
+            result = self.binary(op, result, self.visit(operand), line_no)
+
+        return result
+
+    def visit_Negation(self, node):
+        code, kind = self.operand(node.value, UNARY)
+
+        return '-' + code, kind, UNARY
+
+    def visit_Transpose(self, node):
+        code, kind = self.operand(node.expr, ATOM)
+
+        if kind == MATRIX:
+            return code + '.T', kind, ATOM
+        elif kind in numeric_kinds or kind == STRING:
+            return code, kind, ATOM
+
+        return self.call('_transpose', code), kind, ATOM
+
+    def visit_Matrix(self, node):
+        rows = ', '.join('[' + ', '.join(self.visit(elem)[0] for elem in row)
+                         + ']' for row in node.matrix)
+
+        return 'numpy.array([' + rows + '])', MATRIX, ATOM
+
+    def visit_MatrixOperation(self, node):
+        values = [self.visit(value)[0] for value in node.values]
+
+        if node.op_type == 'eye':
+            return 'numpy.eye({0})'.format(', '.join(values)), MATRIX, ATOM
+
+        # A single size makes a square matrix
+        shape = values * 2 if len(values) == 1 else values
+
+        return 'numpy.{0}(({1}))'.format(node.op_type, ', '.join(shape)), \
+            MATRIX, ATOM
+
+    def condition(self, node):
+        code, kind, precedence = self.visit(node)
+
+        if kind in numeric_kinds or kind == STRING:
+            return code
+
+        return self.call('_true', code)
+
+    def visit_IfCondition(self, node, keyword='if'):
+        self.emit('{0} {1}:'.format(keyword, self.condition(node.expr)))
+        self.indented(node.block)
+
+        if node.else_block:
+            self.emit('else:')
+            self.indented(node.else_block)
+        elif node.else_cond:
+            self.visit_IfCondition(node.else_cond, 'elif')
+
+    def indented(self, node):
+        self.depth += 1
+        self.block(node)
+        self.depth -= 1
+
+    def visit_WhileCondition(self, node):
+        self.emit('while {0}:'.format(self.condition(node.expr)))
+        self.loop += 1
+        self.indented(node.block)
+        self.loop -= 1
+
+    def visit_ForCondition(self, node):
+        if self.vector_loop(node):
+            return
+
+        start = self.visit(node.for_range.start)[0]
+
+        if self.int_range(node):
+            counters = 'range({0}, {1})'.format(
+                start, self.range_end(node.for_range.end))
+        else:
+            counters = self.checked_range(node, start,
+                                          self.visit(node.for_range.end)[0])
+
+        self.emit('for {0} in {1}:'.format(self.name(node.pid.name),
+                                            counters))
+        self.loop += 1
+        self.indented(node.block)
+        self.loop -= 1
+
+    def range_end(self, node):
+        if node.__class__ is AST.IntNum:
+            return str(node.value + 1)
+
+        return self.operand(node, SUM)[0] + ' + 1'
+
+    def int_range(self, node):
+        return expression_kind(node.for_range.start, self.kind) == \
+            expression_kind(node.for_range.end, self.kind) == INT
+
+    def checked_range(self, node, start, end):
+        # Bounds that may not be ints fail as in the engines
+        return self.call('_range', start, end, repr(
+            "Line {0}: Range bounds must be integers".format(
+                node.for_range.line_no)))
+
+    def vector_loop(self, node):
+        # for loops, one or two deep, that only store elements of a matrix
+        # at their counters, from other elements and numbers, become one
+        # store of whole arrays. A check when the program runs falls back
+        # to the loop unless the ranges are ints, not empty, and in bounds.
+        loops = [node]
+        body = single(node.block)
+
+        if body.__class__ is AST.ForCondition:
+            loops.append(body)
+            body = single(body.block)
+
+        counters = [loop.pid.name for loop in loops]
+
+        if self.fallback or body.__class__ is not AST.Assign or \
+                not body.pid.indices or len(set(counters)) != len(counters):
+            return False
+
+        target = body.pid.name
+        analysis = VectorLoop(counters, target, self.kinds)
+        target_forms = analysis.store(body.pid.indices)
+
+        if target_forms is None or self.kind(target) != MATRIX or \
+                not all(analysis.invariant(bound) for loop in loops
+                        for bound in (loop.for_range.start,
+                                      loop.for_range.end)) or \
+                not analysis.expression(body.value) or \
+                body.assign_type not in ('=', '+=', '-=', '*='):
+            return False
+
+        temps = [self.temp() for loop in loops]
+        checks = []
+        self.emit('_a{0} = {1}'.format(
+            temps[0], self.visit(loops[0].for_range.start)[0]))
+        self.emit('_b{0} = {1}'.format(
+            temps[0], self.visit(loops[0].for_range.end)[0]))
+
+        for k, (loop, temp) in enumerate(zip(loops, temps)):
+            start = '_a{0}'.format(temp)
+            end = '_b{0}'.format(temp)
+
+            if k:
+                # The inner range is only computed where the loop did
+                start = '_a{0} := {1}'.format(
+                    temp, self.visit(loop.for_range.start)[0])
+                end = '_b{0} := {1}'.format(
+                    temp, self.visit(loop.for_range.end)[0])
+
+            checks.append('type({0}) is int'.format(start))
+            checks.append('type({0}) is int'.format(end))
+            checks.append('_a{0} <= _b{0}'.format(temp))
+
+        bounds = dict((counter, temp) for counter, temp in
+                      zip(counters, temps))
+
+        for name, forms in [(target, target_forms)] + analysis.reads:
+            name = self.name(name)
+            checks.append('isinstance({0}, numpy.ndarray)'.format(name))
+            checks.append("{0}.dtype.kind in 'if'".format(name))
+
+            if len(forms) == 2:
+                checks.append('{0}.ndim == 2'.format(name))
+
+            for k, form in enumerate(forms):
+                size = '{0}.size'.format(name) if len(forms) == 1 else \
+                    '{0}.shape[{1}]'.format(name, k)
+                checks.extend(self.bound_checks(form, size, bounds))
+
+        arrays = dict((counter, '_i{0}'.format(temp)) for counter, temp in
+                      zip(counters, temps))
+        separator = ' and\n' + '    ' * (self.depth + 2)
+        self.emit('if ({0}):'.format(separator.join(dict.fromkeys(checks))))
+        self.depth += 1
+
+        for k, (counter, temp) in enumerate(zip(counters, temps)):
+            shape = '' if len(loops) == 1 else ['[:, None]', '[None, :]'][k]
+            self.emit('_i{0} = numpy.arange(_a{0}, _b{0} + 1){1}'.format(
+                temp, shape))
+
+        generator = VectorExpression(self, arrays)
+        store = generator.element(target, body.pid.indices)
+
+        if body.assign_type != '=':
+            value = '{0} {1} {2}'.format(store, body.assign_type[0],
+                                         generator.operand(body.value,
+                                                           PRODUCT + 1))
+        else:
+            value = generator.visit(body.value)[0]
+
+        self.emit('{0} = {1}'.format(store, value))
+
+        # The counters end at the end of their ranges
+        for counter, temp in zip(counters, temps):
+            self.emit('{0} = _b{1}'.format(self.name(counter), temp))
+
+        self.depth -= 1
+        self.emit('else:')
+        self.depth += 1
+        start = '_a{0}'.format(temps[0])
+        end = '_b{0}'.format(temps[0])
+        self.emit('for {0} in {1}:'.format(
+            self.name(node.pid.name),
+            'range({0}, {1} + 1)'.format(start, end) if self.int_range(node)
+            else self.checked_range(node, start, end)))
+        self.loop += 1
+        self.fallback = True
+        self.indented(node.block)
+        self.fallback = False
+        self.loop -= 1
+        self.depth -= 1
+        self.vectorized += 1
+
+        return True
+
+    def bound_checks(self, form, size, bounds):
+        kind, value, offset = form
+
+        if kind == 'counter':
+            temp = bounds[value]
+
+            return ['1 <= _a{0}{1}'.format(temp, signed(offset)),
+                    '_b{0}{1} <= {2}'.format(temp, signed(offset), size)]
+        elif kind == 'constant':
+            return ['1 <= {0} <= {1}'.format(value, size)]
+
+        name = self.name(value)
+
+        return ['type({0}) is int'.format(name),
+                '1 <= {0} <= {1}'.format(name, size)]
+
+    def visit_Error(self, node):
+        self.emit('raise RuntimeError({0!r})'.format(
+            "Line {0}: {1}".format(node.line_no, node.error_type)))
+
+    def visit_Instruction(self, node):
+        inst_type = node.instruction_type
+
+        if inst_type in ('break', 'continue'):
+            if self.loop <= 0:
+                self.emit('raise RuntimeError({0!r})'.format(
+                    "Line {0}: Instruction outside a loop".format(
+                        node.line_no)))
+            else:
+                self.emit(inst_type)
+            return
+
+        if isinstance(node.value, list):
+            values = [self.visit(value) for value in node.value]
+        elif node.value is not None:
+            values = [self.visit(node.value)]
+        else:
+            values = []
+
+        if inst_type == 'print':
+            self.emit('print({0})'.format(', '.join(
+                code if kind in numeric_kinds or kind == STRING else
+                self.call('_str', code) for code, kind, precedence in values)))
+        elif len(values) == 1:
+            self.emit('return ' + values[0][0])
+        elif values:
+            self.emit('return [{0}]'.format(', '.join(
+                code for code, kind, precedence in values)))
+        else:
+            self.emit('return None')
+
+
+def signed(offset):
+    if offset > 0:
+        return ' + {0}'.format(offset)
+    elif offset < 0:
+        return ' - {0}'.format(-offset)
+
+    return ''
+
+
+class VectorLoop(object):
+    # Whether the store of a loop nest can be done for all counters at
+    # once: indices are counters, counters plus or minus a number, numbers,
+    # or int variables; the value is numbers and elements of int or float
+    # matrices combined by + - * and comparisons; the stored matrix is only
+    # read at the element being stored.
+
+    def __init__(self, counters, target, kinds):
+        self.counters = counters
+        self.target = target
+        self.kinds = kinds
+        # (matrix name, index forms) of each element read
+        self.reads = []
+        self.target_forms = None
+
+    def form(self, node):
+        # ('counter', name, offset), ('constant', value, 0) or
+        # ('name', name, 0) of an index, None if it is none of those
+        node_class = node.__class__
+
+        if node_class is AST.IntNum:
+            return 'constant', node.value, 0
+        elif node_class is AST.Variable and not node.indices:
+            if node.name in self.counters:
+                return 'counter', node.name, 0
+            elif node.name != self.target and \
+                    self.kinds.get(node.name) == INT:
+                return 'name', node.name, 0
+        elif node_class is AST.BinExpr and node.op in ('+', '-') and \
+                node.right.__class__ is AST.IntNum:
+            form = self.form(node.left)
+
+            if form is not None and form[0] == 'counter':
+                offset = node.right.value if node.op == '+' \
+                    else -node.right.value
+
+                return 'counter', form[1], form[2] + offset
+
+        return None
+
+    def store(self, indices):
+        forms = [self.form(index) for index in indices]
+
+        if None in forms or len(forms) > 2:
+            return None
+
+        counters = [form[1] for form in forms if form[0] == 'counter']
+
+        # Every counter once and as itself, so no element is stored twice
+        if sorted(counters) != sorted(self.counters) or \
+                any(form[2] for form in forms if form[0] == 'counter') or \
+                len(forms) == 1 and len(self.counters) > 1:
+            return None
+
+        self.target_forms = forms
+
+        return forms
+
+    def invariant(self, node):
+        node_class = node.__class__
+
+        if node_class is AST.IntNum:
+            return True
+        elif node_class is AST.Variable:
+            return not node.indices and node.name not in self.counters and \
+                node.name != self.target
+        elif node_class is AST.BinExpr:
+            return node.op in ('+', '-', '*') and \
+                self.invariant(node.left) and self.invariant(node.right)
+        elif node_class is AST.Negation:
+            return self.invariant(node.value)
+
+        return False
+
+    def expression(self, node, top=True):
+        # numpy bools do not add or negate as Python's do, so a comparison
+        # is only the whole value
+        node_class = node.__class__
+
+        if node_class in (AST.IntNum, AST.FloatNum):
+            return True
+        elif node_class is AST.Variable and not node.indices:
+            return node.name in self.counters or \
+                node.name != self.target and \
+                self.kinds.get(node.name) in numeric_kinds
+        elif node_class is AST.Variable:
+            forms = [self.form(index) for index in node.indices]
+
+            if None in forms or len(forms) > 2 or \
+                    self.kinds.get(node.name) != MATRIX:
+                return False
+            elif node.name == self.target:
+                return forms == self.target_forms
+
+            self.reads.append((node.name, forms))
+
+            return True
+        elif node_class in (AST.BinExpr, AST.Equality):
+            return (node.op in ('+', '-', '*') or
+                    top and node.op in comparison_ops) and \
+                self.expression(node.left, False) and \
+                self.expression(node.right, False)
+        elif node_class is AST.Negation:
+            return self.expression(node.value, False)
+
+        return False
+
+
+class VectorExpression(NodeVisitor):
+    # The value of a vectorized store over the counters' arrays, as
+    # (code, precedence). numpy operators bind as Python's do.
+
+    def __init__(self, generator, arrays):
+        self.generator = generator
+        self.arrays = arrays
+
+    def operand(self, node, precedence):
+        code, node_precedence = self.visit(node)
+
+        return code if node_precedence >= precedence else '(' + code + ')'
+
+    def index(self, node):
+        if node.__class__ is AST.IntNum:
+            return str(node.value - 1)
+
+        return self.operand(node, SUM) + ' - 1'
+
+    def element(self, name, indices):
+        name = self.generator.name(name)
+
+        if len(indices) == 1:
+            return '{0}[numpy.unravel_index({1}, {0}.shape)]'.format(
+                name, self.index(indices[0]))
+
+        return '{0}[{1}]'.format(name, ', '.join(map(self.index, indices)))
+
+    def visit_IntNum(self, node):
+        return self.generator.visit(node)[::2]
+
+    def visit_FloatNum(self, node):
+        return self.generator.visit(node)[::2]
+
+    def visit_Variable(self, node):
+        if node.indices:
+            return self.element(node.name, node.indices), ATOM
+
+        return self.arrays.get(node.name) or \
+            self.generator.name(node.name), ATOM
+
+    def visit_BinExpr(self, node):
+        if node.op in comparison_ops:
+            precedence = COMPARISON
+        else:
+            precedence = SUM if node.op in ('+', '-') else PRODUCT
+
+        # Comparisons do not chain on arrays, so both sides are bracketed
+        left = self.operand(node.left, precedence +
+                            (precedence == COMPARISON))
+        right = self.operand(node.right, precedence + 1)
+
+        return '{0} {1} {2}'.format(left, node.op, right), precedence
+
+    def visit_Equality(self, node):
+        return self.visit_BinExpr(node)
+
+    def visit_Negation(self, node):
+        return '-' + self.operand(node.value, UNARY), UNARY
+
+
+def generate(node, source=None):
+    return CodeGenerator().generate(node, source)
+
+
+def load(text, name='generated'):
+    # The generated module, without writing it to a file
+    module = types.ModuleType(name)
+    exec(compile(text, name + '.py', 'exec'), module.__dict__)
+
+    return module
+
+
+if __name__ == '__main__':
+    from Mparser import Mparser
+
+    try:
+        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        file = open(filename, "r")
+    except IOError:
+        print("Cannot open {0} file".format(filename))
+        sys.exit(0)
+
+    parser = Mparser()
+    ast = parser.parse(file.read())
+
+    if parser.errors:
+        for error in parser.errors:
+            print(error)
+        sys.exit(1)
+
+    # Only checked programs are generated
+    diagnostics = io.StringIO()
+
+    with contextlib.redirect_stdout(diagnostics):
+        TypeChecker().visit(ast)
+
+    if diagnostics.getvalue():
+        print(diagnostics.getvalue(), end='')
+        sys.exit(1)
+
+    text = generate(ast, os.path.basename(filename))
+
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w") as output:
+            output.write(text)
+    else:
+        print(text, end='')
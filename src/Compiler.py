@@ -0,0 +1,386 @@
+#!/usr/bin/python
+
+import AST
+import Values
+from Exceptions import *
+from scanner import string_value
+from TypeChecker import NodeVisitor
+
+
+# Statements return None, or one of these to unwind to the enclosing loop
+BREAK = 1
+CONTINUE = 2
+
+statement_nodes = (AST.Assign, AST.Instruction, AST.InstructionsOpt,
+                   AST.IfCondition, AST.WhileCondition, AST.ForCondition)
+
+
+class CompiledProgram(object):
+    def __init__(self, code, slots):
+        self.code = code
+        self.slots = slots
+        self.frame = []
+
+    def run(self):
+        self.frame = [None] * len(self.slots)
+
+        try:
+            self.code(self.frame)
+        except ReturnValueException as result:
+            return result.value
+
+    def variables(self):
+        return dict((name, self.frame[slot])
+                    for name, slot in self.slots.items()
+                    if self.frame[slot] is not None)
+
+
+class Compiler(NodeVisitor):
+    # Every node is visited once and turned into a closure over its
+    # children's closures. Variables live in a list, indexed by slot.
+
+    def compile(self, node):
+        self.slots = dict()
+        self.loop = 0
+
+        return CompiledProgram(self.statement(node), self.slots)
+
+    def slot(self, name):
+        return self.slots.setdefault(name, len(self.slots))
+
+    def statement(self, node):
+        if node is None:
+            # An empty block, { }
+            return lambda frame: None
+
+        code = self.visit(node)
+
+        if isinstance(node, statement_nodes) or isinstance(node, AST.Program):
+            return code
+
+        # An expression statement, its value is not a loop status
+        def expression_statement(frame):
+            code(frame)
+
+        return expression_statement
+
+    def block(self, nodes):
+        statements = tuple(self.statement(node) for node in nodes)
+
+        if len(statements) == 1:
+            return statements[0]
+
+        def run_block(frame):
+            for statement in statements:
+                status = statement(frame)
+
+                if status is not None:
+                    return status
+
+        return run_block
+
+    def visit_Program(self, node):
+        if not node.instructions_opt:
+            return lambda frame: None
+
+        return self.statement(node.instructions_opt)
+
+    def visit_InstructionsOpt(self, node):
+        return self.block(node.instructions)
+
+    def visit_IntNum(self, node):
+        value = node.value
+
+        return lambda frame: value
+
+    def visit_FloatNum(self, node):
+        value = node.value
+
+        return lambda frame: value
+
+    def visit_String(self, node):
+        value = string_value(node.value)
+
+        return lambda frame: value
+
+    def visit_Variable(self, node):
+        slot = self.slot(node.name)
+        name = node.name
+        line_no = node.line_no
+
+        if not node.indices:
+            def read(frame):
+                value = frame[slot]
+
+                if value is None:
+                    raise RuntimeException("Not existing variable: " + name,
+                                           line_no)
+                return value
+
+            return read
+
+        indices = tuple(self.visit(index) for index in node.indices)
+
+        def read_element(frame):
+            matrix = frame[slot]
+
+            if matrix is None:
+                raise RuntimeException("Not existing variable: " + name,
+                                       line_no)
+            try:
+                return matrix.get([index(frame) for index in indices])
+            except (AttributeError, IndexError, TypeError, ValueError):
+                raise RuntimeException("Invalid index for " + name, line_no)
+
+        return read_element
+
+    def visit_Assign(self, node):
+        value = self.visit(node.value)
+        pid = node.pid
+        slot = self.slot(pid.name)
+        line_no = node.line_no
+
+        if node.assign_type != '=':
+            current = self.visit(pid)
+            apply = Values.operations[node.assign_type[0]]
+
+            def compute(frame):
+                right = value(frame)
+                left = current(frame)
+
+                try:
+                    return apply(left, right)
+                except (ArithmeticError, TypeError, ValueError) as error:
+                    raise RuntimeException(str(error), line_no)
+        elif isinstance(node.value, (AST.Variable, AST.Transpose)):
+            # Matrices are values, the copy keeps indexed stores local
+            def compute(frame):
+                result = value(frame)
+
+                if result.__class__ is Values.MatrixValue:
+                    return result.copy()
+                return result
+        else:
+            compute = value
+
+        if not pid.indices:
+            def assign(frame):
+                frame[slot] = compute(frame)
+
+            return assign
+
+        indices = tuple(self.visit(index) for index in pid.indices)
+        name = pid.name
+
+        def assign_element(frame):
+            result = compute(frame)
+
+            try:
+                frame[slot].set([index(frame) for index in indices], result)
+            except (AttributeError, IndexError, TypeError, ValueError):
+                raise RuntimeException("Invalid index for " + name, line_no)
+
+        return assign_element
+
+    def visit_BinExpr(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        apply = Values.operations[node.op]
+        line_no = node.line_no
+
+        def binary(frame):
+            left_value = left(frame)
+            right_value = right(frame)
+
+            try:
+                return apply(left_value, right_value)
+            except (ArithmeticError, TypeError, ValueError) as error:
+                raise RuntimeException(str(error), line_no)
+
+        return binary
+
+    def visit_Equality(self, node):
+        return self.visit_BinExpr(node)
+
+    def visit_ElementwiseChain(self, node):
+        first = self.visit(node.operands[0])
+        second = self.visit(node.operands[1])
+        apply = Values.operations[node.ops[0]]
+        first_line = node.op_lines[0]
+        steps = tuple(zip(node.ops[1:], map(self.visit, node.operands[2:]),
+                          node.op_lines[1:]))
+        in_place = Values.in_place
+
+        def chain(frame):
+            left_value = first(frame)
+            right_value = second(frame)
+
+            try:
+                result = apply(left_value, right_value)
+            except (ArithmeticError, TypeError, ValueError) as error:
+                raise RuntimeException(str(error), first_line)
+
+            # The first op made a new matrix, the others may write into it
+            for op, operand, line_no in steps:
+                right_value = operand(frame)
+
+                try:
+                    result = in_place(op, result, right_value)
+                except (ArithmeticError, TypeError, ValueError) as error:
+                    raise RuntimeException(str(error), line_no)
+
+            return result
+
+        return chain
+
+    def visit_Negation(self, node):
+        value = self.visit(node.value)
+        negate = Values.negate
+        line_no = node.line_no
+
+        def negation(frame):
+            try:
+                return negate(value(frame))
+            except (ArithmeticError, TypeError, ValueError) as error:
+                raise RuntimeException(str(error), line_no)
+
+        return negation
+
+    def visit_Transpose(self, node):
+        value = self.visit(node.expr)
+        transpose = Values.transpose
+
+        return lambda frame: transpose(value(frame))
+
+    def visit_Matrix(self, node):
+        rows = tuple(tuple(self.visit(elem) for elem in row)
+                     for row in node.matrix)
+        line_no = node.line_no
+
+        def matrix(frame):
+            values = [[elem(frame) for elem in row] for row in rows]
+
+            try:
+                return Values.matrix(values)
+            except ValueError:
+                raise RuntimeException("Incompatible size for matrix",
+                                       line_no)
+
+        return matrix
+
+    def visit_MatrixOperation(self, node):
+        values = tuple(self.visit(value) for value in node.values)
+        create = Values.matrix_operations[node.op_type]
+        line_no = node.line_no
+
+        def matrix_operation(frame):
+            try:
+                return create([value(frame) for value in values])
+            except (TypeError, ValueError):
+                raise RuntimeException("Invalid dimension values", line_no)
+
+        return matrix_operation
+
+    def visit_IfCondition(self, node):
+        condition = self.visit(node.expr)
+        block = self.statement(node.block)
+
+        if node.else_block:
+            else_block = self.statement(node.else_block)
+        elif node.else_cond:
+            else_block = self.statement(node.else_cond)
+        else:
+            def if_block(frame):
+                if condition(frame):
+                    return block(frame)
+
+            return if_block
+
+        def if_else_block(frame):
+            if condition(frame):
+                return block(frame)
+            return else_block(frame)
+
+        return if_else_block
+
+    def visit_WhileCondition(self, node):
+        condition = self.visit(node.expr)
+        self.loop += 1
+        block = self.statement(node.block)
+        self.loop -= 1
+
+        def while_loop(frame):
+            while condition(frame):
+                if block(frame) == BREAK:
+                    break
+
+        return while_loop
+
+    def visit_ForCondition(self, node):
+        start = self.visit(node.for_range.start)
+        end = self.visit(node.for_range.end)
+        slot = self.slot(node.pid.name)
+        line_no = node.for_range.line_no
+        self.loop += 1
+        block = self.statement(node.block)
+        self.loop -= 1
+
+        def for_loop(frame):
+            try:
+                counters = Values.for_range(start(frame), end(frame))
+            except TypeError as error:
+                raise RuntimeException(str(error), line_no)
+
+            for i in counters:
+                frame[slot] = i
+
+                if block(frame) == BREAK:
+                    break
+
+        return for_loop
+
+    def visit_Error(self, node):
+        error_type = node.error_type
+        line_no = node.line_no
+
+        def error(frame):
+            raise RuntimeException(error_type, line_no)
+
+        return error
+
+    def visit_Instruction(self, node):
+        inst_type = node.instruction_type
+        line_no = node.line_no
+
+        if inst_type in ('break', 'continue'):
+            if self.loop <= 0:
+                def outside_loop(frame):
+                    raise RuntimeException("Instruction outside a loop",
+                                           line_no)
+
+                return outside_loop
+
+            status = BREAK if inst_type == 'break' else CONTINUE
+
+            return lambda frame: status
+
+        if isinstance(node.value, list):
+            values = tuple(self.visit(value) for value in node.value)
+        elif node.value is not None:
+            values = (self.visit(node.value),)
+        else:
+            values = ()
+
+        if inst_type == 'print':
+            def print_values(frame):
+                print(*[value(frame) for value in values])
+
+            return print_values
+
+        def return_values(frame):
+            results = [value(frame) for value in values]
+
+            raise ReturnValueException(results[0] if len(results) == 1
+                                       else results or None)
+
+        return return_values
@@ -0,0 +1,21 @@
+#!/usr/bin/python
+
+
+class RuntimeException(Exception):
+    def __init__(self, message, line_no=None):
+        super().__init__("Line {0}: {1}".format(line_no, message))
+        self.line_no = line_no
+
+
+class BreakException(Exception):
+    pass
+
+
+class ContinueException(Exception):
+    pass
+
+
+class ReturnValueException(Exception):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
@@ -0,0 +1,300 @@
+#!/usr/bin/python
+
+import bisect
+import contextlib
+import io
+import itertools
+import operator
+import re
+import sys
+import AST
+from Mparser import Mparser
+from SymbolTable import SymbolTable, VariableSymbol
+from TypeChecker import TypeChecker
+
+
+openers = ('(', '[', '{')
+closers = (')', ']', '}')
+
+# Reported lines are relative to the chunk, the number is shifted on output
+line_message = re.compile(r'^(Line |.* at line )(\d+)(.*)$')
+
+def relative_messages(output):
+    messages = []
+
+    for line in output.splitlines():
+        match = line_message.match(line)
+
+        if match:
+            messages.append((match.group(1), int(match.group(2)),
+                             match.group(3)))
+        else:
+            messages.append((line, None, ''))
+
+    return messages
+
+
+def first_difference(old, new, limit):
+    # Index of the first unequal pair, the compares run in C
+    return min(next(itertools.compress(itertools.count(),
+                                       map(operator.ne, old, new)), limit),
+               limit)
+
+
+def variable_names(node, names):
+    if isinstance(node, list):
+        for elem in node:
+            variable_names(elem, names)
+    elif isinstance(node, AST.Node):
+        if isinstance(node, AST.Variable):
+            names.add(node.name)
+
+        for field in node._fields:
+            child = getattr(node, field)
+
+            if isinstance(child, (AST.Node, list)):
+                variable_names(child, names)
+
+    return names
+
+
+class Chunk(object):
+    # Whole lines holding one or more top-level statements. A chunk is
+    # parsed once; it is checked again only when a name it uses had a
+    # different type or int value before it.
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.instructions = []
+        self.names = ()
+        self.parse_messages = []
+        self.check_messages = []
+        self.failed = False
+        self.key = None
+        self.types = {}
+
+    def parse(self, parser):
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            ast = parser.parse(''.join(self.lines))
+
+            for error in parser.errors:
+                print(error)
+
+        self.failed = bool(parser.errors)
+
+        if ast is not None and ast.instructions_opt:
+            self.instructions = ast.instructions_opt.instructions
+            self.names = tuple(sorted(variable_names(self.instructions,
+                                                     set())))
+
+        self.parse_messages = relative_messages(output.getvalue())
+
+    def check(self, key):
+        # key holds (type, value, dim) of self.names before the chunk, or
+        # None for names not defined
+        table = SymbolTable(None, 'global')
+        defined = {}
+
+        for name, state in zip(self.names, key):
+            if state is not None:
+                defined[name] = VariableSymbol(name, *state)
+                table.put(name, defined[name])
+
+        checker = TypeChecker()
+        checker.start(table)
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            for instruction in self.instructions:
+                checker.visit(instruction)
+
+        self.key = key
+        self.check_messages = relative_messages(output.getvalue())
+        self.types = dict((name, (symbol.type, symbol.value, symbol.dim))
+                          for name, symbol in table.symbol_table.items()
+                          if symbol is not defined.get(name))
+
+
+class Document(object):
+    def __init__(self, text='', parser=None):
+        # Chunks are split with the parser's own scanner, before parsing
+        self.parser = parser or Mparser()
+        self.scanner = self.parser.scanner
+        self.lines = []
+        self.chunks = []
+        self.checked = False
+        self.update(text)
+
+    def starts(self):
+        return list(itertools.accumulate(
+            map(len, map(operator.attrgetter('lines'), self.chunks)),
+            initial=0))
+
+    def update(self, text):
+        # The changed lines are what is left between the common prefix
+        # and the common suffix of the old and the new text
+        old = self.lines
+        new = text.splitlines(True)
+        limit = min(len(old), len(new))
+        prefix = first_difference(old, new, limit)
+        suffix = first_difference(reversed(old), reversed(new),
+                                  limit - prefix)
+
+        if prefix == len(old) == len(new):
+            return
+
+        self.edit(prefix, len(old) - prefix - suffix,
+                  new[prefix:len(new) - suffix])
+
+    def edit(self, first, count, new_lines):
+        # Replace count lines from line index first by new_lines
+        self.lines[first:first + count] = new_lines
+        chunks = self.chunks
+
+        if chunks:
+            starts = self.starts()
+            i = max(bisect.bisect_right(starts, first) - 1, 0)
+            j = max(bisect.bisect_right(starts, first + count - 1) - 1, i)
+            j = min(j, len(chunks) - 1)
+
+            # A neighbour may join the edited statement, e.g. an added else
+            i = max(i - 1, 0)
+            j = min(j + 1, len(chunks) - 1)
+            old = chunks[i:j + 1]
+            region = [line for chunk in old for line in chunk.lines]
+            offset = first - starts[i]
+            region[offset:offset + count] = new_lines
+        else:
+            i, j, old, region = 0, -1, [], list(new_lines)
+
+        pieces, complete = self.split(region)
+        more = 1
+
+        # An unclosed statement swallows the following chunks
+        while not complete and j + 1 < len(chunks):
+            added = chunks[j + 1:j + 1 + more]
+            j += len(added)
+            old.extend(added)
+
+            for chunk in added:
+                region.extend(chunk.lines)
+
+            pieces, complete = self.split(region)
+            more *= 2
+
+        # Old chunks by text, in order, each reused at most once
+        unchanged = {}
+
+        for chunk in old:
+            unchanged.setdefault(tuple(chunk.lines), []).append(chunk)
+
+        new_chunks = []
+
+        for piece in pieces:
+            same = unchanged.get(tuple(piece))
+            chunk = same.pop(0) if same else None
+
+            if chunk is None:
+                chunk = Chunk(piece)
+                chunk.parse(self.parser)
+
+            new_chunks.append(chunk)
+
+        chunks[i:j + 1] = new_chunks
+        self.checked = False
+
+    def split(self, lines):
+        # Statements end at a line break after ';' or '}' outside brackets,
+        # unless the next line goes on with else
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.scanner.input(''.join(lines))
+            tokens = list(iter(self.scanner.token, None))
+
+        pieces = []
+        start = 0
+        depth = 0
+        pending = False
+
+        for k, token in enumerate(tokens):
+            pending = True
+
+            if token.type in openers:
+                depth += 1
+            elif token.type in closers:
+                depth = max(depth - 1, 0)
+
+            if depth or token.type not in (';', '}'):
+                continue
+
+            if k + 1 < len(tokens) and (tokens[k + 1].lineno == token.lineno
+                                        or tokens[k + 1].type == 'ELSE'):
+                continue
+
+            pieces.append(lines[start:token.lineno])
+            start = token.lineno
+            pending = False
+
+        if start < len(lines):
+            if pieces and not pending:
+                pieces[-1] = pieces[-1] + lines[start:]
+            else:
+                pieces.append(lines[start:])
+
+        return pieces, not pending
+
+    def check(self):
+        if self.checked:
+            return
+
+        types = {}
+
+        for chunk in self.chunks:
+            key = tuple(map(types.get, chunk.names))
+
+            if key != chunk.key:
+                chunk.check(key)
+
+            types.update(chunk.types)
+
+        self.checked = True
+
+    def parsed(self):
+        return not any(chunk.failed for chunk in self.chunks)
+
+    def instructions(self):
+        # Line numbers in the nodes are relative to their chunk
+        return [instruction for chunk in self.chunks
+                for instruction in chunk.instructions]
+
+    def diagnostics(self):
+        self.check()
+        messages = []
+
+        for chunk, line in zip(self.chunks, self.starts()):
+            if not chunk.parse_messages and not chunk.check_messages:
+                continue
+
+            for prefix, line_no, suffix in chunk.parse_messages + \
+                    chunk.check_messages:
+                if line_no is None:
+                    messages.append(prefix)
+                else:
+                    messages.append(prefix + str(line_no + line) + suffix)
+
+        return messages
+
+
+if __name__ == '__main__':
+    try:
+        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        file = open(filename, "r")
+    except IOError:
+        print("Cannot open {0} file".format(filename))
+        sys.exit(0)
+
+    document = Document(file.read())
+
+    for message in document.diagnostics():
+        print(message)
@@ -0,0 +1,212 @@
+#!/usr/bin/python
+
+import AST
+import Values
+from Exceptions import *
+from Memory import Memory
+from scanner import string_value
+from TypeChecker import NodeVisitor
+
+
+class Interpreter(NodeVisitor):
+    def __init__(self):
+        self.memory = Memory('global')
+        self.loop = 0
+
+    def run(self, node):
+        try:
+            return self.visit(node)
+        except ReturnValueException as result:
+            return result.value
+
+    def visit_Program(self, node):
+        if node.instructions_opt:
+            self.visit(node.instructions_opt)
+
+    def visit_InstructionsOpt(self, node):
+        for instruction in node.instructions:
+            self.visit(instruction)
+
+    def visit_IntNum(self, node):
+        return node.value
+
+    def visit_FloatNum(self, node):
+        return node.value
+
+    def visit_String(self, node):
+        return string_value(node.value)
+
+    def visit_Variable(self, node):
+        value = self.memory.get(node.name)
+
+        if value is None:
+            raise RuntimeException("Not existing variable: " + node.name,
+                                   node.line_no)
+
+        if node.indices:
+            try:
+                return value.get(self.indices(node))
+            except (AttributeError, IndexError, TypeError, ValueError):
+                raise RuntimeException("Invalid index for " + node.name,
+                                       node.line_no)
+
+        return value
+
+    def indices(self, node):
+        return [self.visit(index) for index in node.indices]
+
+    def visit_Assign(self, node):
+        value = self.visit(node.value)
+        pid = node.pid
+
+        if node.assign_type != '=':
+            value = self.operation(node.assign_type[0], self.visit(pid),
+                                   value, node)
+        elif isinstance(value, Values.MatrixValue) and \
+                isinstance(node.value, (AST.Variable, AST.Transpose)):
+            # Matrices are values, the copy keeps indexed stores local
+            value = value.copy()
+
+        if not pid.indices:
+            self.memory.put(pid.name, value)
+            return
+
+        matrix = self.memory.get(pid.name)
+
+        try:
+            matrix.set(self.indices(pid), value)
+        except (AttributeError, IndexError, TypeError, ValueError):
+            raise RuntimeException("Invalid index for " + pid.name,
+                                   node.line_no)
+
+    def operation(self, op, left, right, node):
+        try:
+            return Values.binary_operation(op, left, right)
+        except (ArithmeticError, TypeError, ValueError) as error:
+            raise RuntimeException(str(error), node.line_no)
+
+    def visit_BinExpr(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+
+        return self.operation(node.op, left, right, node)
+
+    def visit_Equality(self, node):
+        return self.visit_BinExpr(node)
+
+    def visit_ElementwiseChain(self, node):
+        result = None
+
+        # The first op makes a new matrix, the others may write into it
+        for k, op in enumerate(node.ops):
+            left = self.visit(node.operands[0]) if k == 0 else result
+            right = self.visit(node.operands[k + 1])
+
+            try:
+                if k == 0:
+                    result = Values.binary_operation(op, left, right)
+                else:
+                    result = Values.in_place(op, left, right)
+            except (ArithmeticError, TypeError, ValueError) as error:
+                raise RuntimeException(str(error), node.op_lines[k])
+
+        return result
+
+    def visit_Negation(self, node):
+        try:
+            return Values.negate(self.visit(node.value))
+        except (ArithmeticError, TypeError, ValueError) as error:
+            raise RuntimeException(str(error), node.line_no)
+
+    def visit_Transpose(self, node):
+        return Values.transpose(self.visit(node.expr))
+
+    def visit_Matrix(self, node):
+        rows = [[self.visit(elem) for elem in row] for row in node.matrix]
+
+        try:
+            return Values.matrix(rows)
+        except ValueError:
+            raise RuntimeException("Incompatible size for matrix",
+                                   node.line_no)
+
+    def visit_MatrixOperation(self, node):
+        values = [self.visit(value) for value in node.values]
+
+        try:
+            return Values.matrix_operations[node.op_type](values)
+        except (TypeError, ValueError):
+            raise RuntimeException("Invalid dimension values", node.line_no)
+
+    def visit_IfCondition(self, node):
+        if self.visit(node.expr):
+            self.visit(node.block)
+        elif node.else_block:
+            self.visit(node.else_block)
+        elif node.else_cond:
+            self.visit(node.else_cond)
+
+    def visit_WhileCondition(self, node):
+        self.loop += 1
+
+        while self.visit(node.expr):
+            try:
+                self.visit(node.block)
+            except BreakException:
+                break
+            except ContinueException:
+                pass
+
+        self.loop -= 1
+
+    def visit_ForCondition(self, node):
+        start = self.visit(node.for_range.start)
+        end = self.visit(node.for_range.end)
+        name = node.pid.name
+
+        try:
+            counters = Values.for_range(start, end)
+        except TypeError as error:
+            raise RuntimeException(str(error), node.for_range.line_no)
+
+        self.loop += 1
+
+        for i in counters:
+            self.memory.put(name, i)
+
+            try:
+                self.visit(node.block)
+            except BreakException:
+                break
+            except ContinueException:
+                pass
+
+        self.loop -= 1
+
+    def visit_Error(self, node):
+        raise RuntimeException(node.error_type, node.line_no)
+
+    def visit_Instruction(self, node):
+        inst_type = node.instruction_type
+
+        if inst_type in ('break', 'continue') and self.loop <= 0:
+            raise RuntimeException("Instruction outside a loop",
+                                   node.line_no)
+
+        if inst_type == 'break':
+            raise BreakException()
+        elif inst_type == 'continue':
+            raise ContinueException()
+
+        if isinstance(node.value, list):
+            values = [self.visit(value) for value in node.value]
+        elif node.value is not None:
+            values = [self.visit(node.value)]
+        else:
+            values = []
+
+        if inst_type == 'print':
+            print(*values)
+        elif inst_type == 'return':
+            raise ReturnValueException(values[0] if len(values) == 1
+                                       else values or None)
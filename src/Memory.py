@@ -0,0 +1,16 @@
+#!/usr/bin/python
+
+
+class Memory(object):
+    def __init__(self, name):
+        self.name = name
+        self.memory = dict()
+
+    def has_key(self, name):
+        return name in self.memory
+
+    def get(self, name):
+        return self.memory.get(name, None)
+
+    def put(self, name, value):
+        self.memory[name] = value
@@ -1,15 +1,91 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import os
+import sys
 import ply.yacc as yacc
-from scanner import Scanner
+from scanner import Scanner, FastScanner
 from AST import *
 
 
+class Diagnostic(object):
+    __slots__ = ('line_no', 'col_no', 'message')
+
+    def __init__(self, line_no, col_no, message):
+        self.line_no = line_no
+        self.col_no = col_no
+        self.message = message
+
+    def __str__(self):
+        return "Line {0}: {1}".format(self.line_no, self.message)
+
+
 class Mparser(object):
-    def __init__(self):
-        self.scanner = Scanner()
+    # Frozen LALR tables, regenerated by running this module
+    tabmodule = 'parsetab'
+
+    def __init__(self, freeze=False, fast_lexer=False):
+        # FastScanner gives the same tokens as Scanner, without PLY's lexer
+        self.scanner = FastScanner() if fast_lexer else Scanner()
         self.scanner.build()
+        self.build(freeze)
+
+    def build(self, freeze=False):
+        if freeze:
+            self.parser = yacc.yacc(module=self, tabmodule=self.tabmodule,
+                                    outputdir=os.path.dirname(
+                                        os.path.abspath(__file__)))
+            return
+
+        # Load the frozen tables without writing parsetab.py or parser.out.
+        # PLY still compares the grammar signature and rebuilds the tables
+        # in memory when they are stale.
+        self.parser = yacc.yacc(module=self, tabmodule=self.tabmodule,
+                                debug=False, write_tables=False,
+                                errorlog=yacc.NullLogger())
+
+        if not isinstance(self.parser.productions[0], yacc.MiniProduction):
+            sys.stderr.write("Warning: {0}.py is out of date, run Mparser.py "
+                             "to regenerate it\n".format(self.tabmodule))
+
+    def parse(self, text):
+        # Syntax errors are collected in self.errors, the statements they
+        # hit become Error nodes
+        self.errors = []
+
+        return self.program(self.parser.parse(text, lexer=self.scanner))
+
+    def parse_tokens(self, tokens):
+        # Same as parse, for tokens the scanner has already produced
+        self.errors = []
+        self.scanner.replay(tokens)
+
+        return self.program(self.parser.parse(lexer=self.scanner))
+
+    def program(self, result):
+        # When PLY gives up, the statements completed at the top level are
+        # kept and the rest of the input is one Error node
+        if result is not None or not self.errors:
+            return result
+
+        instructions = []
+
+        for symbol in self.parser.symstack[1:2]:
+            if symbol.type == 'instructions':
+                instructions = list(symbol.value)
+
+        error = self.errors[-1]
+        instructions.append(Error("Syntax error", line_no=error.line_no,
+                                  col_no=error.col_no))
+
+        return Program(InstructionsOpt(instructions,
+                                       line_no=instructions[0].line_no,
+                                       col_no=instructions[0].col_no),
+                       line_no=instructions[0].line_no,
+                       col_no=instructions[0].col_no)
+
+    def column(self, p, n):
+        return p.slice[n].column
 
     tokens = Scanner.tokens
 
@@ -24,24 +100,84 @@ class Mparser(object):
     )
 
     def p_error(self, p):
-        if p:
-            error_type = "Syntax error at line " + \
-                "{0}, pos {1}: LexToken({2}, '{3}')""".format(
-                p.lineno, self.scanner.find_column(p), p.type, p.value)
-        else:
-            error_type = "Unexpected end of input"
+        scanner = self.scanner
+
+        if p is not None and getattr(p, 'synthetic', False):
+            # An inserted ';' did not fit either, recover at it
+            return
+
+        if p is None:
+            return self.end_of_input()
+
+        self.errors.append(Diagnostic(p.lineno, p.column,
+                                      "Syntax error at '{0}'".format(
+                                          p.value)))
+
+        if p.type == ';':
+            return
 
-        raise Exception
+        if p.type == '}' and not any(symbol.type == '{'
+                                     for symbol in self.parser.symstack):
+            # A '}' that closes no block: drop it, the ';' in its place ends
+            # what came before or recovers as an error statement
+            self.parser.errok()
+
+            return scanner.synthetic(';', p.lineno, None)
+
+        if p.type == '}' or scanner.starts_line(p):
+            # Most likely a missing ';' before a line break or '}': insert
+            # one and go on with p
+            scanner.push(p)
+            self.parser.errok()
+
+            return scanner.synthetic(';', scanner.previous_line, None)
+
+        # Panic mode: skip to ';', '}' or the next line. PLY then drops the
+        # statement up to the ';' that follows into instruction : error ';'
+        token = scanner.token()
+
+        while token is not None and token.type not in (';', '}') and \
+                token.lineno == p.lineno:
+            token = scanner.token()
+
+        if token is not None:
+            scanner.push(token)
+
+        if token is None or token.type != ';':
+            scanner.push(scanner.synthetic(';', p.lineno, None))
+
+    def end_of_input(self):
+        # Closes what is open at the end: a ';' where one fits, then a '}'
+        # for each open block, one at a time as the parser asks again
+        scanner = self.scanner
+
+        if not self.errors or self.errors[-1].message != \
+                "Unexpected end of input":
+            self.errors.append(Diagnostic(scanner.last_line, None,
+                                          "Unexpected end of input"))
+
+        actions = self.parser.action[self.parser.state]
+
+        for type, line_no in ((';', scanner.previous_line),
+                              ('}', scanner.last_line)):
+            if type in actions:
+                self.parser.errok()
+
+                return scanner.synthetic(type, line_no, None)
 
     def p_program(self, p):
         """program : instructions_opt"""
 
-        p[0] = Program(p[1], line_no=p.lineno)
+        if p[1] is None:
+            p[0] = Program(p[1], line_no=1, col_no=1)
+        else:
+            p[0] = Program(p[1], line_no=p[1].line_no, col_no=p[1].col_no)
 
     def p_instructions_opt_1(self, p):
         """instructions_opt : instructions """
 
-        p[0] = InstructionsOpt(p[1], line_no=p.lineno)
+        p[0] = InstructionsOpt(p[1], line_no=p[1][0].line_no,
+                               col_no=p[1][0].col_no)
 
     def p_instructions_opt_2(self, p):
         """instructions_opt : """
@@ -49,7 +185,8 @@ class Mparser(object):
     def p_instructions_1(self, p):
         """instructions : instructions instruction """
 
-        p[0] = p[1] + [p[2]]
+        p[0] = p[1]
+        p[0].append(p[2])
 
     def p_instructions_2(self, p):
         """instructions : instruction """
@@ -65,6 +202,14 @@ class Mparser(object):
 
         p[0] = p[1]
 
+    def p_instruction_error(self, p):
+        """instruction : error ';' """
+
+        token = p[1]
+
+        p[0] = Error("Syntax error", line_no=token.lineno,
+                     col_no=token.column)
+
     def p_inst_assign(self, p):
         """inst : ids '=' expr
                 | ids ADDASSIGN expr
@@ -72,26 +217,29 @@ class Mparser(object):
                 | ids MULASSIGN expr
                 | ids DIVASSIGN expr """
         
-        p[0] = Assign(p[1], p[2], p[3], line_no=p.lineno(2))
+        p[0] = Assign(p[1], p[2], p[3], line_no=p.lineno(2),
+                      col_no=self.column(p, 2))
 
     def p_ids(self, p):
         """ids : ID
                | ID '[' values ']' """
 
         if len(p) <= 2:
-            p[0] = Variable(p[1], line_no=p.lineno(1))
+            p[0] = Variable(p[1], line_no=p.lineno(1),
+                            col_no=self.column(p, 1))
         else:
-            p[0] = Variable(p[1], p[3], line_no=p.lineno(1))
+            p[0] = Variable(p[1], p[3], line_no=p.lineno(1),
+                            col_no=self.column(p, 1))
 
     def p_break(self, p):
         """inst : BREAK """
 
-        p[0] = Instruction(p[1], line_no=p.lineno(1))
+        p[0] = Instruction(p[1], line_no=p.lineno(1), col_no=self.column(p, 1))
 
     def p_continue(self, p):
         """inst : CONTINUE """
 
-        p[0] = Instruction(p[1], line_no=p.lineno(1))
+        p[0] = Instruction(p[1], line_no=p.lineno(1), col_no=self.column(p, 1))
 
     def p_return(self, p):
         """inst : RETURN
@@ -103,13 +251,15 @@ class Mparser(object):
         if len(p) > 2:
             value = p[2]
 
-        p[0] = Instruction(p[1], value, line_no=p.lineno(1))
+        p[0] = Instruction(p[1], value, line_no=p.lineno(1),
+                           col_no=self.column(p, 1))
 
     def p_print(self, p):
         """inst : PRINT values
                 | PRINT expr """
 
-        p[0] = Instruction(p[1], p[2], line_no=p.lineno(1))
+        p[0] = Instruction(p[1], p[2], line_no=p.lineno(1),
+                           col_no=self.column(p, 1))
 
     def p_expr_binary(self, p):
         """expr : expr '+' expr
@@ -117,7 +267,8 @@ class Mparser(object):
                 | expr '*' expr
                 | expr '/' expr """
 
-        p[0] = BinExpr(p[2], p[1], p[3], line_no=p.lineno(2))
+        p[0] = BinExpr(p[2], p[1], p[3], line_no=p.lineno(2),
+                       col_no=self.column(p, 2))
 
     def p_expr_elementwise(self, p):
         """expr : expr DOTADD expr
@@ -125,7 +276,8 @@ class Mparser(object):
                 | expr DOTMUL expr
                 | expr DOTDIV expr """
 
-        p[0] = BinExpr(p[2], p[1], p[3], line_no=p.lineno(2))
+        p[0] = BinExpr(p[2], p[1], p[3], line_no=p.lineno(2),
+                       col_no=self.column(p, 2))
 
     def p_expr_eq(self, p):
         """expr : expr EQ expr
@@ -135,7 +287,8 @@ class Mparser(object):
                 | expr '<' expr
                 | expr '>' expr"""
 
-        p[0] = Equality(p[2], p[1], p[3], line_no=p.lineno(2))
+        p[0] = Equality(p[2], p[1], p[3], line_no=p.lineno(2),
+                        col_no=self.column(p, 2))
 
     def p_expr_paren(self, p):
         """expr : '(' expr ')' """
@@ -145,12 +298,13 @@ class Mparser(object):
     def p_expr_transpose(self, p):
         """expr : expr "'" """
 
-        p[0] = Transpose(p[2], p[1], line_no=p.lineno(2))
+        p[0] = Transpose(p[2], p[1], line_no=p.lineno(2),
+                         col_no=self.column(p, 2))
 
     def p_expr_negative(self, p):
         """expr : '-' expr %prec UMINUS"""
 
-        p[0] = Negation(p[2], line_no=p.lineno(1))
+        p[0] = Negation(p[2], line_no=p.lineno(1), col_no=self.column(p, 1))
 
     def p_expr(self, p):
         """expr : ids
@@ -164,30 +318,31 @@ class Mparser(object):
     def p_integer(self, p):
         """integer : INTNUM """
 
-        p[0] = IntNum(p[1], line_no=p.lineno(1))
+        p[0] = IntNum(p[1], line_no=p.lineno(1), col_no=self.column(p, 1))
 
     def p_float(self, p):
         """float : FLOAT """
 
-        p[0] = FloatNum(p[1], line_no=p.lineno(1))
+        p[0] = FloatNum(p[1], line_no=p.lineno(1), col_no=self.column(p, 1))
 
     def p_string(self, p):
         """string : STRING """
 
-        p[0] = String(p[1], line_no=p.lineno(1))
+        p[0] = String(p[1], line_no=p.lineno(1), col_no=self.column(p, 1))
 
     def p_matrix_operations(self, p):
         """matrix : ZEROS '(' values ')'
                   | ONES '(' values ')'
                   | EYE '(' values ')' """
 
-        p[0] = MatrixOperation(p[1], p[3], line_no=p.lineno(1))
+        p[0] = MatrixOperation(p[1], p[3], line_no=p.lineno(1),
+                               col_no=self.column(p, 1))
 
     def p_matrix_init(self, p):
         """matrix : '[' rows ']'
                   | '[' rows ';' ']' """
 
-        p[0] = Matrix(p[2], line_no=p.lineno(1))
+        p[0] = Matrix(p[2], line_no=p.lineno(1), col_no=self.column(p, 1))
 
     def p_rows(self, p):
         """rows : values """
@@ -197,7 +352,8 @@ class Mparser(object):
     def p_rows_2(self, p):
         """rows : rows ';' values """
 
-        p[0] = p[1] + [p[3]]
+        p[0] = p[1]
+        p[0].append(p[3])
 
     def p_values(self, p):
         """values : expr """
@@ -207,17 +363,25 @@ class Mparser(object):
     def p_values_2(self, p):
         """values : values ',' expr """
 
-        p[0] = p[1] + [p[3]]
+        p[0] = p[1]
+        p[0].append(p[3])
 
     def p_block(self, p):
-        """ block : '{' instructions_opt '}' """
+        """ block : '{' instructions '}'
+                  | '{' '}' """
 
-        p[0] = p[2]
+        # Not instructions_opt: LALR would merge the state after a block's
+        # statements with the program's, and reduce the whole program on a
+        # stray '}' before reporting it
+        if len(p) == 4:
+            p[0] = InstructionsOpt(p[2], line_no=p[2][0].line_no,
+                                   col_no=p[2][0].col_no)
 
     def p_block_2(self, p):
         """ block : instruction """
 
-        p[0] = InstructionsOpt([p[1]], line_no=p.lineno)
+        p[0] = InstructionsOpt([p[1]], line_no=p[1].line_no,
+                               col_no=p[1].col_no)
 
     def p_conditional(self, p):
         """ condition : if_condition
@@ -246,19 +410,26 @@ class Mparser(object):
     def p_if_cond(self, p):
         """ if_cond : IF '(' expr ')' block """
 
-        p[0] = IfCondition(p[3], p[5], line_no=p.lineno)
+        p[0] = IfCondition(p[3], p[5], line_no=p.lineno(1),
+                           col_no=self.column(p, 1))
 
     def p_for(self, p):
         """ for_condition : FOR ids '=' range block """
 
-        p[0] = ForCondition(p[2], p[4], p[5], line_no=p.lineno(3))
+        p[0] = ForCondition(p[2], p[4], p[5], line_no=p.lineno(3),
+                            col_no=self.column(p, 3))
 
     def p_range(self, p):
         """ range : expr ':' expr """
 
-        p[0] = Range(p[1], p[3], line_no=p.lineno(2))
+        p[0] = Range(p[1], p[3], line_no=p.lineno(2), col_no=self.column(p, 2))
 
     def p_while(self, p):
         """ while_condition : WHILE '(' expr ')' block """
 
-        p[0] = WhileCondition(p[3], p[5], line_no=p.lineno(1))
+        p[0] = WhileCondition(p[3], p[5], line_no=p.lineno(1),
+                              col_no=self.column(p, 1))
+
+
+if __name__ == '__main__':
+    Mparser(freeze=True)
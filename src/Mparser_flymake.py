@@ -52,7 +52,8 @@ class Mparser(object):
     def p_instructions_1(self, p):
         """instructions : instructions instruction """
 
-        p[0] = p[1] + [p[2]]
+        p[0] = p[1]
+        p[0].append(p[2])
 
     def p_instructions_2(self, p):
         """instructions : instruction """
@@ -200,7 +201,8 @@ class Mparser(object):
     def p_rows_2(self, p):
         """rows : rows ';' values """
 
-        p[0] = p[1] + [p[3]]
+        p[0] = p[1]
+        p[0].append(p[3])
 
     def p_values(self, p):
         """values : expr """
@@ -210,7 +212,8 @@ class Mparser(object):
     def p_values_2(self, p):
         """values : values ',' expr """
 
-        p[0] = p[1] + [p[3]]
+        p[0] = p[1]
+        p[0].append(p[3])
 
     def p_block(self, p):
         """ block : '{' instructions_opt '}' """
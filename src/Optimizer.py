@@ -0,0 +1,427 @@
+#!/usr/bin/python
+
+import contextlib
+import io
+import sys
+import AST
+import Types
+import Values
+from SymbolTable import SymbolTable
+from TypeChecker import NodeVisitor, TypeChecker
+
+
+literal_nodes = (AST.IntNum, AST.FloatNum)
+
+
+class Assignments(NodeVisitor):
+    # Every assignment and for loop of the program, in any block
+
+    def collect(self, node):
+        self.nodes = []
+        self.visit(node)
+
+        return self.nodes
+
+    def visit_Assign(self, node):
+        self.nodes.append(node)
+
+    def visit_ForCondition(self, node):
+        self.nodes.append(node)
+        self.visit(node.block)
+
+
+class AssignedTypes(TypeChecker):
+    # Runs the type checker, quietly, and keeps every type a name is given
+    # anywhere in the program. A name given one type only has that type
+    # wherever it is read, whatever the order of branches and loops.
+
+    def collect(self, node):
+        self.assigned = dict()
+        self.seen = set()
+        self.start(SymbolTable(None, 'global'))
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            self.visit(node)
+
+        self.diagnostics = output.getvalue().splitlines()
+
+        # The checker skips blocks it cannot check, e.g. under a condition
+        # that is not a boolean: what they assign is of any type
+        for assignment in Assignments().collect(node):
+            if assignment.__class__ is AST.Assign and \
+                    id(assignment) not in self.seen:
+                self.assigned.setdefault(assignment.pid.name,
+                                         set()).add(None)
+
+        return dict((name, types.pop()) for name, types in
+                    self.assigned.items() if len(types) == 1)
+
+    def visit_Assign(self, node):
+        name = node.pid.name
+        old_symbol = self.table.get(name)
+        self.seen.add(id(node))
+
+        super().visit_Assign(node)
+
+        # An element store into a matrix keeps its symbol and its type
+        new_symbol = self.table.get(name)
+
+        if node.pid.indices and new_symbol is old_symbol and \
+                old_symbol is not None and old_symbol.type is not None and \
+                old_symbol.type.is_matrix:
+            return
+
+        new_type = new_symbol.type if new_symbol is not old_symbol else None
+        self.assigned.setdefault(name, set()).add(new_type)
+
+    def visit_ForCondition(self, node):
+        self.assigned.setdefault(node.pid.name, set()).add(Types.INT)
+
+        super().visit_ForCondition(node)
+
+
+class Optimizer(NodeVisitor):
+    # Folds constants, drops identity operations, orders matrix products
+    # and fuses element-wise chains. Expressions visit to (new node, type),
+    # the type is None unless it is proven for every run. Statements are
+    # rewritten in place.
+
+    def optimize(self, node):
+        assigned_types = AssignedTypes()
+        self.types = assigned_types.collect(node)
+        # Shapes are only trusted in programs the checker accepts
+        self.checked = not assigned_types.diagnostics
+        # (factor nodes, factor types, flops) of the products built so far
+        self.products = dict()
+        self.visit(node)
+        self.products = None
+
+        return node
+
+    def expr(self, node):
+        return self.visit(node)[0]
+
+    def visit_Program(self, node):
+        if node.instructions_opt:
+            self.visit(node.instructions_opt)
+
+    def visit_InstructionsOpt(self, node):
+        for instruction in node.instructions:
+            self.visit(instruction)
+
+    def visit_IntNum(self, node):
+        return node, Types.INT
+
+    def visit_FloatNum(self, node):
+        return node, Types.FLOAT
+
+    def visit_String(self, node):
+        return node, Types.STRING
+
+    def visit_Variable(self, node):
+        if node.indices:
+            node.indices = [self.expr(index) for index in node.indices]
+
+            return node, None
+
+        return node, self.types.get(node.name)
+
+    def visit_Assign(self, node):
+        if node.pid.indices:
+            self.visit(node.pid)
+
+        node.value = self.expr(node.value)
+
+    def visit_BinExpr(self, node):
+        left, left_type = self.visit(node.left)
+        right, right_type = self.visit(node.right)
+        node.left = left
+        node.right = right
+        op = node.op
+
+        if isinstance(left, literal_nodes) and \
+                isinstance(right, literal_nodes) and \
+                op in Types.arithmetic_ops:
+            try:
+                value = Values.binary_operation(op, left.value, right.value)
+            except (ArithmeticError, TypeError, ValueError):
+                # Raised again when the program runs
+                value = None
+
+            if value.__class__ is int:
+                return AST.IntNum(value, node.line_no, node.col_no), Types.INT
+            elif value.__class__ is float:
+                return AST.FloatNum(value, node.line_no,
+                                    node.col_no), Types.FLOAT
+
+        result_type, error_kind = Types.binary_result(op, left_type,
+                                                      right_type) \
+            if left_type and right_type else (None, None)
+
+        if error_kind:
+            result_type = None
+
+        # x * 1, 1 * x, x / 1 and x - 0 are x for int and float alike, while
+        # -0.0 + 0 is 0.0, so x + 0 is kept for all but ints
+        if op in ('*', '/', '-') and is_int(right, 0 if op == '-' else 1) \
+                and left_type and left_type.is_numeric:
+            return left, left_type
+        elif op == '*' and is_int(left, 1) and \
+                right_type and right_type.is_numeric:
+            return right, right_type
+        elif op == '+' and is_int(right, 0) and left_type is Types.INT:
+            return left, left_type
+        elif op == '+' and is_int(left, 0) and right_type is Types.INT:
+            return right, right_type
+
+        # Adding zeros of the same proven shape only turns the matrix into
+        # floats: zeros(n) + B is B .+ 0.0, and so is B + zeros(n)
+        if op == '+' and self.checked and is_zeros(left, right_type):
+            return AST.BinExpr('.+', right, AST.FloatNum(0.0), node.line_no,
+                               node.col_no), right_type
+        elif op in ('+', '-') and self.checked and \
+                is_zeros(right, left_type):
+            return AST.BinExpr('.' + op, left, AST.FloatNum(0.0), node.line_no,
+                               node.col_no), left_type
+
+        if op == '*' and is_sized(left_type) and is_sized(right_type) and \
+                result_type is not None:
+            return self.product(node, left, left_type, right,
+                                right_type), result_type
+        elif op in Types.elementwise_ops:
+            return fuse(node), result_type
+
+        return node, result_type
+
+    def product(self, node, left, left_type, right, right_type):
+        # Flattens nested products of matrices with known sizes and builds
+        # them again in the order of fewest multiplications
+        left_nodes, left_types, left_flops = self.products.pop(
+            left, ([left], [left_type], 0))
+        right_nodes, right_types, right_flops = self.products.pop(
+            right, ([right], [right_type], 0))
+        nodes = left_nodes + right_nodes
+        types = left_types + right_types
+        flops = left_flops + right_flops + \
+            left_type.rows * left_type.cols * right_type.cols
+        best, split = chain_order([factor.rows for factor in types] +
+                                  [types[-1].cols])
+
+        if best < flops:
+            node = build_product(nodes, split, 0, len(nodes) - 1, node)
+            flops = best
+
+        self.products[node] = (nodes, types, flops)
+
+        return node
+
+    def visit_ElementwiseChain(self, node):
+        operands = [self.visit(operand) for operand in node.operands]
+        node.operands = [operand for operand, operand_type in operands]
+        result_type = operands[0][1]
+
+        for op, (operand, operand_type) in zip(node.ops, operands[1:]):
+            result_type, error_kind = Types.binary_result(
+                op, result_type, operand_type) \
+                if result_type and operand_type else (None, None)
+
+            if error_kind:
+                result_type = None
+
+        return node, result_type
+
+    def visit_Equality(self, node):
+        node.left = self.expr(node.left)
+        node.right = self.expr(node.right)
+
+        return node, Types.BOOLEAN
+
+    def visit_Negation(self, node):
+        value, value_type = self.visit(node.value)
+        node.value = value
+
+        if isinstance(value, literal_nodes):
+            return value.__class__(-value.value, node.line_no,
+                                   node.col_no), value_type
+        elif isinstance(value, AST.Negation) and value_type and \
+                (value_type.is_numeric or value_type.is_matrix):
+            return value.value, value_type
+
+        return node, value_type if value_type and \
+            (value_type.is_numeric or value_type.is_matrix) else None
+
+    def visit_Transpose(self, node):
+        expr, expr_type = self.visit(node.expr)
+        node.expr = expr
+
+        if not expr_type or not expr_type.is_matrix:
+            return node, None
+        elif isinstance(expr, AST.Transpose):
+            return expr.expr, Types.matrix(expr_type.cols, expr_type.rows)
+
+        return node, Types.matrix(expr_type.cols, expr_type.rows)
+
+    def visit_Matrix(self, node):
+        node.matrix = [[self.visit(elem) for elem in row]
+                       for row in node.matrix]
+        rectangular = all(len(row) == len(node.matrix[0])
+                          for row in node.matrix)
+        numeric = all(elem_type and elem_type.is_numeric
+                      for row in node.matrix for elem, elem_type in row)
+        node.matrix = [[elem for elem, elem_type in row]
+                       for row in node.matrix]
+
+        if not rectangular or not numeric:
+            return node, None
+
+        return node, Types.matrix(len(node.matrix), len(node.matrix[0]))
+
+    def visit_MatrixOperation(self, node):
+        node.values = [self.expr(value) for value in node.values]
+
+        # Values.dimensions makes a single size square
+        dims = [value.value if value.__class__ is AST.IntNum else None
+                for value in node.values]
+
+        if len(dims) == 1:
+            return node, Types.matrix(dims[0], dims[0])
+        elif len(dims) == 2:
+            return node, Types.matrix(*dims)
+
+        return node, None
+
+    def visit_IfCondition(self, node):
+        node.expr = self.expr(node.expr)
+        self.visit(node.block)
+
+        if node.else_block:
+            self.visit(node.else_block)
+        elif node.else_cond:
+            self.visit(node.else_cond)
+
+    def visit_WhileCondition(self, node):
+        node.expr = self.expr(node.expr)
+        self.visit(node.block)
+
+    def visit_ForCondition(self, node):
+        self.visit(node.for_range)
+        self.visit(node.block)
+
+    def visit_Range(self, node):
+        node.start = self.expr(node.start)
+        node.end = self.expr(node.end)
+
+        return node, Types.INT
+
+    def visit_Instruction(self, node):
+        if isinstance(node.value, list):
+            node.value = [self.expr(value) for value in node.value]
+        elif node.value is not None:
+            node.value = self.expr(node.value)
+
+    def visit_Error(self, node):
+        pass
+
+
+def is_sized(node_type):
+    # Sizes known as numbers, not as Dims
+    return node_type is not None and node_type.is_matrix and \
+        node_type.rows.__class__ is int and node_type.cols.__class__ is int
+
+
+def chain_order(dims):
+    # Matrix chain order: factor k is dims[k] x dims[k + 1]. Returns the
+    # fewest multiplications and split[i][j], the last factor of the left
+    # part of the product of factors i to j. Ties go to the left-deep order.
+    count = len(dims) - 1
+    flops = [[0] * count for _ in range(count)]
+    split = [[0] * count for _ in range(count)]
+
+    for length in range(2, count + 1):
+        for i in range(count - length + 1):
+            j = i + length - 1
+            best = None
+
+            for k in range(j - 1, i - 1, -1):
+                cost = flops[i][k] + flops[k + 1][j] + \
+                    dims[i] * dims[k + 1] * dims[j + 1]
+
+                if best is None or cost < best:
+                    best = cost
+                    split[i][j] = k
+
+            flops[i][j] = best
+
+    return flops[0][count - 1], split
+
+
+def build_product(nodes, split, i, j, node):
+    if i == j:
+        return nodes[i]
+
+    k = split[i][j]
+
+    return AST.BinExpr('*', build_product(nodes, split, i, k, node),
+                       build_product(nodes, split, k + 1, j, node),
+                       node.line_no, node.col_no)
+
+
+def fuse(node):
+    # (a .+ b) .* c is one chain a .+ b .* c, evaluated into one new matrix
+    left = node.left
+
+    if left.__class__ is AST.ElementwiseChain:
+        left.operands.append(node.right)
+        left.ops.append(node.op)
+        left.op_lines.append(node.line_no)
+
+        return left
+    elif left.__class__ is AST.BinExpr and left.op in Types.elementwise_ops:
+        return AST.ElementwiseChain([left.left, left.right, node.right],
+                                    [left.op, node.op],
+                                    [left.line_no, node.line_no],
+                                    left.line_no, left.col_no)
+
+    return node
+
+
+def is_int(node, value):
+    return node.__class__ is AST.IntNum and node.value == value
+
+
+def is_zeros(node, shape):
+    # zeros with literal sizes, of the given proven shape
+    if node.__class__ is not AST.MatrixOperation or node.op_type != 'zeros' \
+            or not shape or not shape.is_matrix or shape.rows is None or \
+            shape.cols is None:
+        return False
+
+    sizes = [value.value for value in node.values
+             if value.__class__ is AST.IntNum]
+
+    if len(sizes) != len(node.values):
+        return False
+
+    return Values.dimensions(sizes) == (shape.rows, shape.cols)
+
+
+if __name__ == '__main__':
+    from Mparser import Mparser
+    from TreePrinter import write_tree
+
+    try:
+        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        file = open(filename, "r")
+    except IOError:
+        print("Cannot open {0} file".format(filename))
+        sys.exit(0)
+
+    parser = Mparser()
+    ast = parser.parse(file.read())
+
+    for error in parser.errors:
+        print(error)
+
+    if ast is not None:
+        write_tree(Optimizer().optimize(ast), sys.stdout)
@@ -0,0 +1,253 @@
+#!/usr/bin/python
+
+import array
+import hashlib
+import importlib
+import os
+import struct
+import sys
+import tempfile
+import AST
+from Mparser import Mparser
+
+
+# Layout of a serialized tree: magic, schema digest, a header with the
+# word type, word count and string count, the words, then the strings as
+# one UTF-8 block. The words start with the string lengths, followed by
+# the tree in prefix order: a tag per value, nodes are tagged by class and
+# followed by their _fields, then line and column (+1, 0 for None). Words
+# are as narrow as the largest one allows. Strings, large ints and floats
+# are written once in the string table and referred to by index.
+magic = b'MAST\x02'
+
+NONE = 0
+LIST = 1
+INT = 2
+NUMBER = 3
+FLOAT = 4
+STRING = 5
+NODE = 16
+
+# Ints up to this are written in place
+small_int = 1 << 15
+
+node_classes = sorted((cls for cls in vars(AST).values()
+                       if isinstance(cls, type) and issubclass(cls, AST.Node)
+                       and cls is not AST.Node),
+                      key=lambda cls: cls.__name__)
+node_tags = dict((cls, NODE + i) for i, cls in enumerate(node_classes))
+
+# Any change to the node classes or their fields changes the format
+schema = hashlib.sha256(';'.join(
+    cls.__name__ + ':' + ','.join(cls._fields)
+    for cls in node_classes).encode('utf-8')).digest()[:8]
+
+header = struct.Struct('<cII')
+
+
+def dumps(node):
+    words = []
+    strings = {}
+    add = words.append
+
+    def string(item):
+        index = strings.get(item)
+
+        if index is None:
+            index = strings[item] = len(strings)
+
+        add(index)
+
+    def value(item):
+        tag = node_tags.get(item.__class__)
+
+        if tag is not None:
+            add(tag)
+
+            for field in item._fields:
+                value(getattr(item, field))
+
+            add(0 if item.line_no is None else item.line_no + 1)
+            add(0 if item.col_no is None else item.col_no + 1)
+        elif item is None:
+            add(NONE)
+        elif isinstance(item, list):
+            add(LIST)
+            add(len(item))
+
+            for elem in item:
+                value(elem)
+        elif isinstance(item, str):
+            add(STRING)
+            string(item)
+        elif isinstance(item, bool):
+            raise TypeError("Cannot serialize bool in an AST")
+        elif isinstance(item, int):
+            if 0 <= item < small_int:
+                add(INT)
+                add(item)
+            else:
+                add(NUMBER)
+                string(str(item))
+        elif isinstance(item, float):
+            add(FLOAT)
+            string(repr(item))
+        else:
+            raise TypeError("Cannot serialize {0} in an AST".format(
+                item.__class__.__name__))
+
+    value(node)
+
+    words[:0] = map(len, strings)
+    largest = max(words)
+    typecode = next(code for code in 'BHIQ'
+                    if largest < 1 << 8 * array.array(code).itemsize)
+    packed = array.array(typecode, words)
+
+    if sys.byteorder == 'big':
+        packed.byteswap()
+
+    return b''.join((magic, schema,
+                     header.pack(typecode.encode('ascii'), len(packed),
+                                 len(strings)),
+                     packed.tobytes(), ''.join(strings).encode('utf-8')))
+
+
+def loads(data):
+    start = len(magic) + len(schema)
+
+    if data[:len(magic)] != magic or data[len(magic):start] != schema:
+        raise ValueError("Not a serialized AST of this version")
+
+    typecode, count, string_count = header.unpack_from(data, start)
+    words = array.array(typecode.decode('ascii'))
+    start += header.size
+    end = start + count * words.itemsize
+    words.frombytes(data[start:end])
+
+    if sys.byteorder == 'big':
+        words.byteswap()
+
+    text = data[end:].decode('utf-8')
+    strings = []
+    position = 0
+
+    for length in words[:string_count]:
+        strings.append(text[position:position + length])
+        position += length
+
+    word = iter(words[string_count:]).__next__
+    classes = [(cls, [getattr(cls, field).__set__ for field in cls._fields])
+               for cls in node_classes]
+    new = object.__new__
+
+    def value():
+        tag = word()
+
+        if tag >= NODE:
+            cls, setters = classes[tag - NODE]
+            node = new(cls)
+
+            for setter in setters:
+                setter(node, value())
+
+            line_no = word()
+            col_no = word()
+            node.line_no = line_no - 1 if line_no else None
+            node.col_no = col_no - 1 if col_no else None
+
+            return node
+        elif tag == NONE:
+            return None
+        elif tag == LIST:
+            return [value() for _ in range(word())]
+        elif tag == STRING:
+            return strings[word()]
+        elif tag == INT:
+            return word()
+        elif tag == NUMBER:
+            return int(strings[word()])
+        elif tag == FLOAT:
+            return float(strings[word()])
+
+        raise ValueError("Unknown tag {0}".format(tag))
+
+    return value()
+
+
+def cache_directory():
+    directory = os.environ.get('MPARSER_CACHE')
+
+    if directory:
+        return directory
+
+    return os.path.join(os.environ.get('XDG_CACHE_HOME') or
+                        os.path.expanduser(os.path.join('~', '.cache')),
+                        'mparser')
+
+
+class ParseCache(object):
+    # Serialized ASTs of error free sources, one file per source. The key
+    # is a hash of the source, the grammar signature of the LALR tables
+    # and the node layout, so any of them changing misses the cache.
+
+    def __init__(self, parser=None, directory=None):
+        self.parser = parser or Mparser()
+        self.directory = directory or cache_directory()
+
+        tables = importlib.import_module(self.parser.tabmodule)
+        self.signature = hashlib.sha256(
+            tables._lr_signature.encode('utf-8') + schema).digest()
+
+    def path(self, text):
+        digest = hashlib.sha256(self.signature +
+                                text.encode('utf-8')).hexdigest()
+
+        return os.path.join(self.directory, digest[:2], digest[2:])
+
+    def parse(self, text):
+        path = self.path(text)
+
+        try:
+            with open(path, 'rb') as file:
+                ast = loads(file.read())
+        except (IOError, ValueError, IndexError, StopIteration,
+                struct.error):
+            ast = None
+
+        if ast is not None:
+            # Only error free trees are stored
+            self.parser.errors = []
+
+            return ast
+
+        ast = self.parser.parse(text)
+
+        # Lexical errors are only printed, they are not in the tree either
+        if ast is not None and not self.parser.errors and \
+                not self.parser.scanner.errors:
+            self.store(path, ast)
+
+        return ast
+
+    def store(self, path, ast):
+        directory = os.path.dirname(path)
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            file = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+        except OSError:
+            # A read-only cache only costs the parse
+            return
+
+        try:
+            with file:
+                file.write(dumps(ast))
+
+            # Readers never see a partly written file
+            os.replace(file.name, path)
+        except OSError:
+            try:
+                os.unlink(file.name)
+            except OSError:
+                pass
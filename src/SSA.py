@@ -0,0 +1,1236 @@
+#!/usr/bin/python
+
+import heapq
+import sys
+import AST
+import Types
+import Values
+from Bytecode import binary_ops, binary_functions, int_functions, \
+    matrix_ops, matrix_functions, arithmetic_errors
+from Exceptions import *
+from scanner import string_value
+from TypeChecker import NodeVisitor
+
+
+# Values that only compute from their operands: equal ones may be merged,
+# and unless they can raise, dropped when unused or moved out of loops
+pure_ops = ('binary', 'negate', 'transpose', 'matrix', 'matrixop', 'get')
+movable_ops = ('binary', 'negate', 'transpose', 'matrix', 'matrixop')
+# Values that are kept whatever uses them
+effect_ops = ('check', 'set', 'print', 'range', 'get', 'inplace', 'binary',
+              'negate', 'matrix', 'matrixop')
+terminator_ops = ('jump', 'branch', 'next', 'return', 'error', 'halt')
+comparison_ops = ('==', '!=', '<', '>', '<=', '>=')
+
+
+class Value(object):
+    # An instruction and the value it defines. Operands are Values, arg is
+    # what is not a Value: an operator, a name, a constant.
+    __slots__ = ('id', 'op', 'args', 'arg', 'line_no', 'block',
+                 'replacement')
+
+    def __init__(self, op, args=(), arg=None, line_no=None):
+        self.id = None
+        self.op = op
+        self.args = list(args)
+        self.arg = arg
+        self.line_no = line_no
+        self.block = None
+        self.replacement = None
+
+    def __str__(self):
+        return 'v{0}'.format(self.id)
+
+    def __repr__(self):
+        return str(self)
+
+
+class Block(object):
+    __slots__ = ('id', 'phis', 'values', 'terminator', 'preds', 'succs',
+                 'sealed', 'incomplete')
+
+    def __init__(self, block_id):
+        self.id = block_id
+        self.phis = []
+        self.values = []
+        self.terminator = None
+        self.preds = []
+        self.succs = []
+        self.sealed = False
+        # Phis made before all predecessors were known, by variable name
+        self.incomplete = dict()
+
+    def __str__(self):
+        return 'block{0}'.format(self.id)
+
+
+def resolve(value):
+    while value.replacement is not None:
+        value = value.replacement
+
+    return value
+
+
+class IRProgram(object):
+    # The program as a control flow graph of blocks of SSA values.
+    # Constants and the undefined value live in the entry block.
+
+    def __init__(self):
+        self.blocks = []
+        self.entry = None
+        self.constants = []
+        self.undefined = None
+        # (preheader, header) of each loop
+        self.loops = []
+        self.count = 0
+
+    def number(self, value):
+        value.id = self.count
+        self.count += 1
+
+        return value
+
+    def order(self):
+        # Blocks in reverse postorder from the entry
+        seen = set()
+        order = []
+        stack = [(self.entry, iter(self.entry.succs))]
+        seen.add(self.entry)
+
+        while stack:
+            block, succs = stack[-1]
+
+            for succ in succs:
+                if succ not in seen:
+                    seen.add(succ)
+                    stack.append((succ, iter(succ.succs)))
+                    break
+            else:
+                order.append(block)
+                stack.pop()
+
+        order.reverse()
+
+        return order
+
+    def all_values(self):
+        for block in self.blocks:
+            yield from block.phis
+            yield from block.values
+
+            if block.terminator is not None:
+                yield block.terminator
+
+    def optimize(self):
+        eliminate_common(self)
+        hoist_invariants(self)
+        eliminate_dead(self)
+
+        return self
+
+    def run(self):
+        return lower(self).run()
+
+
+class SSABuilder(NodeVisitor):
+    # Lowers the tree to SSA as it is visited: each variable read finds
+    # its reaching definition, with phis at joins. A block is sealed once
+    # all its predecessors are known, phis asked for before are filled in
+    # then.
+
+    def build(self, node):
+        self.program = IRProgram()
+        # Value of each variable at the end of each block it is defined in
+        self.definitions = dict()
+        self.constants = dict()
+        # (continue block, break block) of the enclosing loops
+        self.loops = []
+        self.block = self.program.entry = self.new_block()
+        self.seal(self.block)
+        self.program.undefined = self.constant_value(Value('undef'))
+        self.statement(node)
+        self.terminate(Value('halt'))
+        self.finish()
+
+        return self.program
+
+    def new_block(self):
+        block = Block(len(self.program.blocks))
+        self.program.blocks.append(block)
+
+        return block
+
+    def add(self, op, args=(), arg=None, line_no=None):
+        value = self.program.number(Value(op, args, arg, line_no))
+        value.block = self.block
+        self.block.values.append(value)
+
+        return value
+
+    def terminate(self, value, *targets):
+        self.program.number(value)
+        value.block = self.block
+        self.block.terminator = value
+
+        for target in targets:
+            self.block.succs.append(target)
+            target.preds.append(self.block)
+
+    def jump(self, target):
+        self.terminate(Value('jump'), target)
+
+    def unreachable(self):
+        # Code after a jump out goes to a block no edge leads to
+        self.block = self.new_block()
+        self.seal(self.block)
+
+    def constant_value(self, value):
+        value.block = self.program.entry
+        self.program.constants.append(self.program.number(value))
+
+        return value
+
+    def constant(self, value):
+        # 1, 1.0 and True are equal keys, the class keeps them apart
+        key = (value.__class__, value)
+
+        if key not in self.constants:
+            self.constants[key] = self.constant_value(Value('const',
+                                                            arg=value))
+
+        return self.constants[key]
+
+    def write(self, name, value, block=None):
+        self.definitions.setdefault(name, dict())[block or self.block] = value
+
+    def read(self, name, block=None):
+        block = block or self.block
+        value = self.definitions.get(name, {}).get(block)
+
+        if value is not None:
+            return resolve(value)
+
+        if not block.sealed:
+            value = self.phi(block)
+            block.incomplete[name] = value
+        elif len(block.preds) == 1:
+            value = self.read(name, block.preds[0])
+        elif not block.preds:
+            value = self.program.undefined
+        else:
+            value = self.phi(block)
+            self.write(name, value, block)
+            self.add_operands(name, value)
+
+        self.write(name, value, block)
+
+        return value
+
+    def phi(self, block):
+        value = self.program.number(Value('phi'))
+        value.block = block
+        block.phis.append(value)
+
+        return value
+
+    def add_operands(self, name, phi):
+        for pred in phi.block.preds:
+            phi.args.append(self.read(name, pred))
+
+    def seal(self, block):
+        for name, phi in block.incomplete.items():
+            self.add_operands(name, phi)
+
+        block.incomplete = None
+        block.sealed = True
+
+    def finish(self):
+        remove_unreachable(self.program)
+        remove_trivial_phis(self.program)
+
+        for value in self.program.all_values():
+            value.args = [resolve(arg) for arg in value.args]
+
+        drop_checks(self.program)
+
+    def statement(self, node):
+        self.visit(node)
+
+    def visit_Program(self, node):
+        if node.instructions_opt:
+            self.statement(node.instructions_opt)
+
+    def visit_InstructionsOpt(self, node):
+        for instruction in node.instructions:
+            self.statement(instruction)
+
+    def visit_IntNum(self, node):
+        return self.constant(node.value)
+
+    def visit_FloatNum(self, node):
+        return self.constant(node.value)
+
+    def visit_String(self, node):
+        return self.constant(string_value(node.value))
+
+    def visit_Variable(self, node):
+        value = self.read(node.name)
+        self.add('check', [value], node.name, node.line_no)
+
+        if not node.indices:
+            return value
+
+        indices = [self.visit(index) for index in node.indices]
+
+        return self.add('get', [value] + indices, node.name, node.line_no)
+
+    def visit_Assign(self, node):
+        pid = node.pid
+        value = self.visit(node.value)
+
+        if node.assign_type != '=':
+            current = self.visit(pid)
+            value = self.add('binary', [current, value],
+                             node.assign_type[0], node.line_no)
+        elif isinstance(node.value, (AST.Variable, AST.Transpose)):
+            # Matrices are values, the copy keeps indexed stores local
+            value = self.add('copy', [value])
+
+        if not pid.indices:
+            self.write(pid.name, value)
+            return
+
+        # The store changes the matrix in place, and names it again
+        matrix = self.read(pid.name)
+        indices = [self.visit(index) for index in pid.indices]
+        self.write(pid.name, self.add('set', [matrix, value] + indices,
+                                      pid.name, node.line_no))
+
+    def visit_BinExpr(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+
+        return self.add('binary', [left, right], node.op, node.line_no)
+
+    def visit_Equality(self, node):
+        return self.visit_BinExpr(node)
+
+    def visit_ElementwiseChain(self, node):
+        left = self.visit(node.operands[0])
+        right = self.visit(node.operands[1])
+        result = self.add('binary', [left, right], node.ops[0],
+                          node.op_lines[0])
+
+        # The first op made a new matrix, the others may write into it
+        for op, operand, line_no in zip(node.ops[1:], node.operands[2:],
+                                        node.op_lines[1:]):
+            result = self.add('inplace', [result, self.visit(operand)], op,
+                              line_no)
+
+        return result
+
+    def visit_Negation(self, node):
+        return self.add('negate', [self.visit(node.value)],
+                        line_no=node.line_no)
+
+    def visit_Transpose(self, node):
+        return self.add('transpose', [self.visit(node.expr)])
+
+    def visit_Matrix(self, node):
+        elements = [self.visit(elem) for row in node.matrix for elem in row]
+
+        return self.add('matrix', elements,
+                        tuple(len(row) for row in node.matrix), node.line_no)
+
+    def visit_MatrixOperation(self, node):
+        values = [self.visit(value) for value in node.values]
+
+        return self.add('matrixop', values, node.op_type, node.line_no)
+
+    def visit_IfCondition(self, node):
+        condition = self.visit(node.expr)
+        else_node = node.else_block or node.else_cond
+        then_block = self.new_block()
+        else_block = self.new_block() if else_node else None
+        join = self.new_block()
+        self.terminate(Value('branch', [condition]), then_block,
+                       else_block or join)
+        self.seal(then_block)
+        self.block = then_block
+        self.statement(node.block)
+        self.jump(join)
+
+        if else_node:
+            self.seal(else_block)
+            self.block = else_block
+            self.statement(else_node)
+            self.jump(join)
+
+        self.seal(join)
+        self.block = join
+
+    def preheader(self):
+        # Loops are entered through a block of their own, values that do
+        # not change in the loop are moved there
+        preheader = self.new_block()
+        self.jump(preheader)
+        self.seal(preheader)
+        self.block = preheader
+        header = self.new_block()
+        self.jump(header)
+        self.program.loops.append((preheader, header))
+        self.block = header
+
+        return header
+
+    def visit_WhileCondition(self, node):
+        header = self.preheader()
+        condition = self.visit(node.expr)
+        body = self.new_block()
+        exit = self.new_block()
+        self.terminate(Value('branch', [condition]), body, exit)
+        self.seal(body)
+        self.block = body
+        self.loop(header, exit, node.block)
+
+    def visit_ForCondition(self, node):
+        # next gives the loop counter, or leaves at the end of the range
+        start = self.visit(node.for_range.start)
+        end = self.visit(node.for_range.end)
+        iterator = self.add('range', [start, end],
+                            line_no=node.for_range.line_no)
+        header = self.preheader()
+        counter = Value('next', [iterator])
+        body = self.new_block()
+        exit = self.new_block()
+        self.terminate(counter, body, exit)
+        self.seal(body)
+        self.block = body
+        self.write(node.pid.name, counter)
+        self.loop(header, exit, node.block)
+
+    def loop(self, header, exit, block):
+        self.loops.append((header, exit))
+        self.statement(block)
+        self.loops.pop()
+        self.jump(header)
+        self.seal(header)
+        self.seal(exit)
+        self.block = exit
+
+    def visit_Error(self, node):
+        self.terminate(Value('error', arg=node.error_type,
+                             line_no=node.line_no))
+        self.unreachable()
+
+    def visit_Instruction(self, node):
+        inst_type = node.instruction_type
+
+        if inst_type in ('break', 'continue'):
+            if not self.loops:
+                self.terminate(Value('error', arg="Instruction outside a loop",
+                                     line_no=node.line_no))
+            else:
+                header, exit = self.loops[-1]
+                self.jump(exit if inst_type == 'break' else header)
+
+            self.unreachable()
+            return
+
+        if isinstance(node.value, list):
+            values = [self.visit(value) for value in node.value]
+        elif node.value is not None:
+            values = [self.visit(node.value)]
+        else:
+            values = []
+
+        if inst_type == 'print':
+            self.add('print', values)
+            return
+
+        self.terminate(Value('return', values))
+        self.unreachable()
+
+
+def remove_unreachable(program):
+    # Blocks no path leads to go, with their phi operands in the others
+    reachable = set(program.order())
+
+    for block in program.blocks:
+        if block not in reachable:
+            continue
+
+        for k in range(len(block.preds) - 1, -1, -1):
+            if block.preds[k] not in reachable:
+                del block.preds[k]
+
+                for phi in block.phis:
+                    del phi.args[k]
+
+    program.blocks = [block for block in program.blocks
+                      if block in reachable]
+
+
+def remove_trivial_phis(program):
+    # A phi of itself and one other value is that value
+    changed = True
+
+    while changed:
+        changed = False
+
+        for block in program.blocks:
+            for phi in list(block.phis):
+                others = set(resolve(arg) for arg in phi.args) - {phi}
+
+                if len(others) <= 1:
+                    phi.replacement = others.pop() if others \
+                        else program.undefined
+                    block.phis.remove(phi)
+                    changed = True
+
+
+def drop_checks(program):
+    # Reads need the check for a missing variable only where a path leaves
+    # the variable undefined
+    undefined = {program.undefined}
+    changed = True
+
+    while changed:
+        changed = False
+
+        for block in program.blocks:
+            for phi in block.phis:
+                if phi not in undefined and \
+                        any(arg in undefined for arg in phi.args):
+                    undefined.add(phi)
+                    changed = True
+
+    for block in program.blocks:
+        block.values = [value for value in block.values
+                        if value.op != 'check' or value.args[0] in undefined]
+
+
+def dominators(program):
+    # Immediate dominators, by Cooper, Harvey and Kennedy
+    order = program.order()
+    index = dict((block, k) for k, block in enumerate(order))
+    idom = {program.entry: program.entry}
+    changed = True
+
+    while changed:
+        changed = False
+
+        for block in order[1:]:
+            new_idom = None
+
+            for pred in block.preds:
+                if pred not in idom:
+                    continue
+                elif new_idom is None:
+                    new_idom = pred
+                    continue
+
+                finger = pred
+
+                while finger is not new_idom:
+                    while index[finger] > index[new_idom]:
+                        finger = idom[finger]
+                    while index[new_idom] > index[finger]:
+                        new_idom = idom[new_idom]
+
+                new_idom = finger
+
+            if idom.get(block) is not new_idom:
+                idom[block] = new_idom
+                changed = True
+
+    return idom
+
+
+class Aliases(object):
+    # Values that may be the same matrix: a store, an in-place step or a
+    # transpose and its operand, a phi and its operands. A class holding a
+    # store or an in-place step is changed after it is made, its values
+    # may not be shared by merging or hoisting.
+
+    def __init__(self, program):
+        self.parent = dict()
+        changed = set()
+
+        for value in program.all_values():
+            if value.op in ('set', 'inplace', 'transpose'):
+                self.union(value, value.args[0])
+            elif value.op == 'phi':
+                for arg in value.args:
+                    self.union(value, arg)
+
+            if value.op in ('set', 'inplace'):
+                changed.add(value)
+
+        self.changed = set(self.find(value) for value in changed)
+
+    def find(self, value):
+        root = value
+
+        while self.parent.get(root, root) is not root:
+            root = self.parent[root]
+
+        while value is not root:
+            parent = self.parent[value]
+            self.parent[value] = root
+            value = parent
+
+        return root
+
+    def union(self, value, other):
+        self.parent[self.find(value)] = self.find(other)
+
+    def is_changed(self, value):
+        return self.find(value) in self.changed
+
+
+class ValueTypes(object):
+    # Types of values as far as they are known from constants, and which
+    # values can raise
+
+    def __init__(self):
+        self.types = dict()
+
+    def type(self, value):
+        if value not in self.types:
+            # A phi in a loop reaches itself, it is unknown meanwhile
+            self.types[value] = None
+            self.types[value] = self.compute(value)
+
+        return self.types[value]
+
+    def compute(self, value):
+        op = value.op
+
+        if op == 'const':
+            # Ints numpy cannot hold are left unknown
+            if value.arg.__class__ is int and abs(value.arg) >= 2 ** 63:
+                return None
+
+            return {int: Types.INT, float: Types.FLOAT,
+                    str: Types.STRING}.get(value.arg.__class__)
+        elif op == 'next':
+            return Types.INT
+        elif op in ('copy', 'negate'):
+            return self.type(value.args[0])
+        elif op == 'transpose':
+            arg_type = self.type(value.args[0])
+
+            if arg_type is not None and arg_type.is_matrix:
+                return Types.matrix(arg_type.cols, arg_type.rows)
+
+            return arg_type
+        elif op == 'phi':
+            arg_types = set(self.type(arg) for arg in value.args)
+
+            return arg_types.pop() if len(arg_types) == 1 else None
+        elif op == 'matrixop':
+            sizes = [arg.arg for arg in value.args if arg.op == 'const' and
+                     arg.arg.__class__ is int and arg.arg >= 0]
+
+            if len(sizes) == len(value.args) and len(sizes) in (1, 2):
+                return Types.matrix(*Values.dimensions(sizes))
+        elif op == 'matrix':
+            numeric = all(self.type(arg) in (Types.INT, Types.FLOAT)
+                          for arg in value.args)
+
+            if numeric and len(set(value.arg)) == 1:
+                return Types.matrix(len(value.arg), value.arg[0])
+        elif op in ('binary', 'inplace'):
+            return self.binary(value.arg, *map(self.type, value.args))
+
+    def binary(self, op, left, right):
+        # The result type when the operation cannot raise, None otherwise.
+        # Division may be by zero, an int too large for a float raises when
+        # mixed with one, numpy raises for mismatched shapes.
+        if left is None or right is None or op == '/':
+            return None
+        elif left.is_numeric and right.is_numeric:
+            if op in comparison_ops:
+                return Types.BOOLEAN
+
+            return left if left is right and op in Types.arithmetic_ops \
+                else None
+        elif not (sized(left) or left.is_numeric) or \
+                not (sized(right) or right.is_numeric) or \
+                op in comparison_ops:
+            return None
+
+        result, error_kind = Types.binary_result(op, left, right)
+
+        return result if error_kind is None and sized(result) else None
+
+    def can_raise(self, value):
+        op = value.op
+
+        if op in ('const', 'undef', 'phi', 'copy', 'transpose'):
+            return False
+        elif op == 'negate':
+            arg_type = self.type(value.args[0])
+
+            return arg_type is None or \
+                not (arg_type.is_numeric or arg_type.is_matrix)
+
+        return op not in ('matrixop', 'matrix', 'binary', 'inplace') or \
+            self.type(value) is None
+
+
+def sized(node_type):
+    return node_type is not None and node_type.is_matrix and \
+        node_type.rows.__class__ is int and node_type.cols.__class__ is int
+
+
+def eliminate_common(program):
+    # Walks the dominator tree with the pure values seen on the way: a
+    # value equal to one that dominates it is that value
+    idom = dominators(program)
+    aliases = Aliases(program)
+    children = dict((block, []) for block in idom)
+
+    for block, parent in idom.items():
+        if block is not parent:
+            children[parent].append(block)
+
+    available = dict()
+    stack = [(program.entry, None)]
+
+    while stack:
+        block, added = stack.pop()
+
+        if added is not None:
+            # Leaving the block's subtree
+            for key in added:
+                del available[key]
+            continue
+
+        added = []
+        stack.append((block, added))
+
+        for value in block.values:
+            value.args = [resolve(arg) for arg in value.args]
+
+            if value.op not in pure_ops or aliases.is_changed(value):
+                continue
+
+            key = (value.op, value.arg) + tuple(value.args)
+
+            if key in available:
+                value.replacement = available[key]
+            else:
+                available[key] = value
+                added.append(key)
+
+        block.values = [value for value in block.values
+                        if value.replacement is None]
+        stack.extend((child, None) for child in children[block])
+
+    for value in program.all_values():
+        value.args = [resolve(arg) for arg in value.args]
+
+
+def loop_blocks(index, header):
+    # The natural loop: the header and what reaches its back edges
+    # without passing through it. Loops are only made by while and for,
+    # so a back edge is one from a block at or after the header in
+    # reverse postorder.
+    body = {header}
+    stack = [pred for pred in header.preds if index[pred] >= index[header]]
+
+    while stack:
+        block = stack.pop()
+
+        if block not in body:
+            body.add(block)
+            stack.extend(block.preds)
+
+    return body
+
+
+def hoist_invariants(program):
+    # Values that do not change in a loop and cannot raise are computed
+    # once in its preheader, inner loops first so their values may move on
+    aliases = Aliases(program)
+    types = ValueTypes()
+    index = dict((block, k) for k, block in enumerate(program.order()))
+    loops = [(preheader, loop_blocks(index, header))
+             for preheader, header in program.loops if header in index]
+    loops.sort(key=lambda loop: len(loop[1]))
+
+    for preheader, body in loops:
+        for block in sorted(body, key=index.get):
+            for value in list(block.values):
+                if value.op in movable_ops and \
+                        not aliases.is_changed(value) and \
+                        not types.can_raise(value) and \
+                        all(arg.block not in body for arg in value.args):
+                    block.values.remove(value)
+                    preheader.values.append(value)
+                    value.block = preheader
+
+
+def eliminate_dead(program):
+    # Values nothing needs are dropped, unless they may raise
+    types = ValueTypes()
+    live = set()
+    stack = [value for value in program.all_values()
+             if value.op in terminator_ops or
+             value.op in effect_ops and types.can_raise(value)]
+
+    while stack:
+        value = stack.pop()
+
+        if value not in live:
+            live.add(value)
+            stack.extend(value.args)
+
+    for block in program.blocks:
+        block.phis = [phi for phi in block.phis if phi in live]
+        block.values = [value for value in block.values if value in live]
+
+    program.constants = [value for value in program.constants
+                         if value in live]
+
+
+# Register machine opcodes
+(MOVE, CONST, CHECK, BINARY, INPLACE, NEGATE, TRANSPOSE, COPY, MATRIX,
+ MATRIX_OP, GET, SET, PRINT, RANGE, NEXT, JUMP, JUMP_IF_FALSE, RETURN,
+ ERROR, HALT) = range(20)
+
+opcode_names = ('MOVE', 'CONST', 'CHECK', 'BINARY', 'INPLACE', 'NEGATE',
+                'TRANSPOSE', 'COPY', 'MATRIX', 'MATRIX_OP', 'GET', 'SET',
+                'PRINT', 'RANGE', 'NEXT', 'JUMP', 'JUMP_IF_FALSE', 'RETURN',
+                'ERROR', 'HALT')
+
+value_opcodes = {
+    'check': CHECK, 'binary': BINARY, 'inplace': INPLACE, 'negate': NEGATE,
+    'transpose': TRANSPOSE, 'copy': COPY, 'matrix': MATRIX,
+    'matrixop': MATRIX_OP, 'get': GET, 'set': SET, 'print': PRINT,
+    'range': RANGE,
+}
+
+
+class Temp(object):
+    # Where the predecessors of a block put a phi's operand
+    __slots__ = ()
+
+
+class RegisterCode(object):
+    # Instructions (opcode, destination, first operand, second operand,
+    # argument, line). Operands are registers, or tuples of them for
+    # instructions with any number of operands.
+
+    def __init__(self, instructions, registers):
+        self.instructions = instructions
+        self.registers = registers
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def run(self):
+        return execute(self.instructions, [None] * self.registers)
+
+
+def split_edges(program):
+    # A block with phis gets a block of its own on each edge from a block
+    # with two successors, for the copies of the phi operands
+    for block in list(program.blocks):
+        if not block.phis:
+            continue
+
+        for k, pred in enumerate(block.preds):
+            if len(pred.succs) < 2:
+                continue
+
+            edge = Block(len(program.blocks))
+            edge.sealed = True
+            program.blocks.append(edge)
+            pred.succs[pred.succs.index(block)] = edge
+            edge.preds.append(pred)
+            edge.succs.append(block)
+            edge.terminator = Value('jump')
+            edge.terminator.block = edge
+            block.preds[k] = edge
+
+
+def linear_code(program):
+    # Each block as (block, [(op, destination, operands, argument,
+    # line)]), phis turned into copies through temporaries. Operands and
+    # destinations are Values or Temps, registers are given later.
+    split_edges(program)
+    order = program.order()
+    code = dict((block, []) for block in order)
+    code[program.entry].extend(('const', value, [], value.arg, None)
+                               for value in program.constants)
+
+    for block in order:
+        code[block].extend((value.op, value if value.op not in
+                            ('check', 'print') else None,
+                            value.args, value.arg, value.line_no)
+                           for value in block.values)
+
+    # Split edges leave one successor to the blocks that copy operands
+    for block in order:
+        temps = [Temp() for phi in block.phis]
+
+        for k, pred in enumerate(block.preds):
+            code[pred].extend(('move', temp, [phi.args[k]], None, None)
+                              for phi, temp in zip(block.phis, temps))
+
+        code[block][:0] = [('move', phi, [temp], None, None)
+                           for phi, temp in zip(block.phis, temps)]
+
+    for block in order:
+        term = block.terminator
+        code[block].append((term.op, term if term.op == 'next' else None,
+                            term.args, term.arg, term.line_no))
+
+    return [(block, code[block]) for block in order]
+
+
+def live_intervals(blocks, constants):
+    # [first, last] position of each operand but the constants, over the
+    # block order, from liveness at block boundaries
+    uses = dict()
+    defs = dict()
+
+    for block, code in blocks:
+        block_uses = uses[block] = set()
+        block_defs = defs[block] = constants.copy()
+
+        for op, dest, args, arg, line_no in code:
+            block_uses.update(arg for arg in args if arg not in block_defs)
+
+            if dest is not None:
+                block_defs.add(dest)
+
+    live_in = dict((block, set()) for block, code in blocks)
+    live_out = dict((block, set()) for block, code in blocks)
+    changed = True
+
+    while changed:
+        changed = False
+
+        for block, code in reversed(blocks):
+            out = set()
+
+            for succ in block.succs:
+                out |= live_in[succ]
+
+            new_in = uses[block] | (out - defs[block])
+
+            if out != live_out[block] or new_in != live_in[block]:
+                live_out[block] = out
+                live_in[block] = new_in
+                changed = True
+
+    intervals = dict()
+
+    def extend(operand, position):
+        start, end = intervals.get(operand, (position, position))
+        intervals[operand] = (min(start, position), max(end, position))
+
+    position = 0
+
+    for block, code in blocks:
+        for operand in live_in[block]:
+            extend(operand, position)
+
+        for op, dest, args, arg, line_no in code:
+            for operand in args:
+                if operand not in constants:
+                    extend(operand, position)
+
+            if dest is not None and dest not in constants:
+                extend(dest, position)
+
+            position += 1
+
+        for operand in live_out[block]:
+            extend(operand, position - 1)
+
+    return intervals
+
+
+def allocate_registers(intervals, count=0):
+    # Linear scan: operands by start, each takes the lowest register free
+    # there, registers come back when an interval ends before the start.
+    # Registers below count are taken.
+    registers = dict()
+    active = []
+    free = []
+
+    for operand, (start, end) in sorted(intervals.items(),
+                                        key=lambda item: item[1]):
+        while active and active[0][0] < start:
+            heapq.heappush(free, heapq.heappop(active)[1])
+
+        if free:
+            register = heapq.heappop(free)
+        else:
+            register = count
+            count += 1
+
+        registers[operand] = register
+        heapq.heappush(active, (end, register))
+
+    return registers, count
+
+
+def lower(program):
+    # Constants keep a register each, set once at the start
+    blocks = linear_code(program)
+    constants = program.constants
+    registers, count = allocate_registers(
+        live_intervals(blocks, set(constants)), len(constants))
+    registers.update((value, k) for k, value in enumerate(constants))
+    starts = dict()
+    instructions = []
+    # (instruction index, target block) to patch
+    jumps = []
+
+    def register(operand):
+        return registers[operand]
+
+    for k, (block, code) in enumerate(blocks):
+        starts[block] = len(instructions)
+        next_block = blocks[k + 1][0] if k + 1 < len(blocks) else None
+
+        for op, dest, args, arg, line_no in code:
+            dest = registers.get(dest) if dest is not None else None
+            args = [registers[operand] for operand in args]
+
+            if op == 'move':
+                if dest != args[0]:
+                    instructions.append((MOVE, dest, args[0], None, None,
+                                         None))
+            elif op == 'const':
+                instructions.append((CONST, dest, None, None, arg, None))
+            elif op in ('binary', 'inplace'):
+                instructions.append((value_opcodes[op], dest, args[0],
+                                     args[1], binary_ops.index(arg), line_no))
+            elif op in ('negate', 'transpose', 'copy', 'check'):
+                instructions.append((value_opcodes[op], dest, args[0], None,
+                                     arg, line_no))
+            elif op == 'range':
+                instructions.append((RANGE, dest, args[0], args[1], None,
+                                     line_no))
+            elif op == 'matrixop':
+                instructions.append((MATRIX_OP, dest, tuple(args), None,
+                                     matrix_ops.index(arg), line_no))
+            elif op in ('matrix', 'get', 'set', 'print'):
+                instructions.append((value_opcodes[op], dest, tuple(args),
+                                     None, arg, line_no))
+            elif op == 'jump':
+                if block.succs[0] is not next_block:
+                    jumps.append((len(instructions), block.succs[0]))
+                    instructions.append((JUMP, None, None, None, None, None))
+            elif op in ('branch', 'next'):
+                # The first successor follows, or is jumped to
+                jumps.append((len(instructions), block.succs[1]))
+                instructions.append((JUMP_IF_FALSE if op == 'branch'
+                                     else NEXT, dest, args[0], None, None,
+                                     line_no))
+
+                if block.succs[0] is not next_block:
+                    jumps.append((len(instructions), block.succs[0]))
+                    instructions.append((JUMP, None, None, None, None, None))
+            elif op == 'return':
+                instructions.append((RETURN, None, tuple(args), None, None,
+                                     None))
+            elif op == 'error':
+                instructions.append((ERROR, None, None, None, arg, line_no))
+            elif op == 'halt':
+                instructions.append((HALT, None, None, None, None, None))
+
+    for k, target in jumps:
+        op, dest, first, second, arg, line_no = instructions[k]
+        instructions[k] = (op, dest, first, second, starts[target], line_no)
+
+    return RegisterCode(instructions, count)
+
+
+def execute(instructions, registers):
+    # The dispatch loop, as Bytecode.execute
+    move, const, binary, jump_if_false, jump, next_op, check = \
+        MOVE, CONST, BINARY, JUMP_IF_FALSE, JUMP, NEXT, CHECK
+    pc = 0
+
+    while True:
+        op, dest, first, second, arg, line_no = instructions[pc]
+        pc += 1
+
+        if op == binary:
+            left = registers[first]
+            right = registers[second]
+
+            try:
+                if left.__class__ is int and right.__class__ is int and \
+                        int_functions[arg]:
+                    registers[dest] = int_functions[arg](left, right)
+                else:
+                    registers[dest] = binary_functions[arg](left, right)
+            except arithmetic_errors as error:
+                raise RuntimeException(str(error), line_no)
+        elif op == move:
+            registers[dest] = registers[first]
+        elif op == jump_if_false:
+            if not registers[first]:
+                pc = arg
+        elif op == next_op:
+            # Loop counters are ints, None is the end of the range
+            value = next(registers[first], None)
+
+            if value is None:
+                pc = arg
+            else:
+                registers[dest] = value
+        elif op == jump:
+            pc = arg
+        elif op == check:
+            if registers[first] is None:
+                raise RuntimeException("Not existing variable: " + arg,
+                                       line_no)
+        elif op == const:
+            registers[dest] = arg
+        elif op == GET:
+            try:
+                registers[dest] = registers[first[0]].get(
+                    [registers[index] for index in first[1:]])
+            except (AttributeError, IndexError, TypeError, ValueError):
+                raise RuntimeException("Invalid index for " + arg, line_no)
+        elif op == SET:
+            matrix = registers[first[0]]
+
+            try:
+                matrix.set([registers[index] for index in first[2:]],
+                           registers[first[1]])
+            except (AttributeError, IndexError, TypeError, ValueError):
+                raise RuntimeException("Invalid index for " + arg, line_no)
+
+            registers[dest] = matrix
+        elif op == INPLACE:
+            try:
+                registers[dest] = Values.in_place(
+                    binary_ops[arg], registers[first], registers[second])
+            except arithmetic_errors as error:
+                raise RuntimeException(str(error), line_no)
+        elif op == NEGATE:
+            try:
+                registers[dest] = Values.negate(registers[first])
+            except arithmetic_errors as error:
+                raise RuntimeException(str(error), line_no)
+        elif op == TRANSPOSE:
+            registers[dest] = Values.transpose(registers[first])
+        elif op == COPY:
+            value = registers[first]
+            registers[dest] = value.copy() \
+                if value.__class__ is Values.MatrixValue else value
+        elif op == MATRIX:
+            elements = [registers[elem] for elem in first]
+            rows = []
+
+            for length in arg:
+                rows.append(elements[:length])
+                del elements[:length]
+
+            try:
+                registers[dest] = Values.matrix(rows)
+            except ValueError:
+                raise RuntimeException("Incompatible size for matrix",
+                                       line_no)
+        elif op == MATRIX_OP:
+            try:
+                registers[dest] = matrix_functions[arg](
+                    [registers[value] for value in first])
+            except (TypeError, ValueError):
+                raise RuntimeException("Invalid dimension values", line_no)
+        elif op == RANGE:
+            try:
+                registers[dest] = iter(Values.for_range(registers[first],
+                                                        registers[second]))
+            except TypeError as error:
+                raise RuntimeException(str(error), line_no)
+        elif op == PRINT:
+            print(*[registers[value] for value in first])
+        elif op == RETURN:
+            values = [registers[value] for value in first]
+
+            return values[0] if len(values) == 1 else values or None
+        elif op == ERROR:
+            raise RuntimeException(arg, line_no)
+        elif op == HALT:
+            return None
+
+
+def format_program(program):
+    # The blocks in order with their values, one per line
+    for block in program.order():
+        yield "{0}:{1}".format(block, "  <- " + ", ".join(
+            str(pred) for pred in block.preds) if block.preds else "")
+
+        values = block.phis + block.values
+
+        if block is program.entry:
+            values = program.constants + values
+
+        for value in values + [block.terminator]:
+            operands = ", ".join(str(arg) for arg in value.args)
+            arg = repr(value.arg) if value.arg is not None else ""
+            targets = ", ".join(str(succ) for succ in block.succs) \
+                if value is block.terminator else ""
+            text = " ".join(part for part in (value.op, arg, operands)
+                            if part)
+
+            if targets:
+                text += " -> " + targets
+
+            if value.op in ('check', 'print') or \
+                    value.op in terminator_ops and value.op != 'next':
+                yield "    " + text
+            else:
+                yield "    {0} = {1}".format(value, text)
+
+
+def compile_program(node, optimize=True):
+    program = SSABuilder().build(node)
+
+    if optimize:
+        program.optimize()
+
+    return lower(program)
+
+
+if __name__ == '__main__':
+    from Mparser import Mparser
+
+    try:
+        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        file = open(filename, "r")
+    except IOError:
+        print("Cannot open {0} file".format(filename))
+        sys.exit(0)
+
+    parser = Mparser()
+    ast = parser.parse(file.read())
+
+    if parser.errors:
+        for error in parser.errors:
+            print(error)
+        sys.exit(1)
+
+    program = SSABuilder().build(ast)
+    count = sum(1 for value in program.all_values())
+    program.optimize()
+
+    for line in format_program(program):
+        print(line)
+
+    code = lower(program)
+    print("{0} values, {1} after optimizing, {2} instructions in {3} "
+          "registers".format(count, sum(1 for value in program.all_values()),
+                             len(code), code.registers))
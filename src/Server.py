@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import AST
+from client import default_socket
+from Incremental import Document
+from Mparser import Mparser
+from TreePrinter import TreePrinter, write_tree
+
+
+class Server(object):
+    # One warm parser for every request, and an incremental document per
+    # file. Requests and responses are JSON objects, one per line:
+    #   {"id": 1, "method": "check", "file": "a.m", "text": "..."}
+    #   {"id": 1, "result": {"diagnostics": [...]}}
+    # "text" is optional, the file is read when it is missing.
+
+    def __init__(self):
+        self.parser = Mparser()
+        self.documents = dict()
+        self.lock = threading.Lock()
+        self.running = True
+        self.methods = {
+            'check': self.check,
+            'parse': self.parse,
+            'print': self.print_tree,
+            'close': self.close,
+            'shutdown': self.shutdown,
+        }
+
+    def document(self, params):
+        filename = os.path.abspath(params['file'])
+        text = params.get('text')
+
+        if text is None:
+            with open(filename, "r") as file:
+                text = file.read()
+
+        document = self.documents.get(filename)
+
+        if document is None:
+            document = self.documents[filename] = Document(text, self.parser)
+        else:
+            document.update(text)
+
+        return document
+
+    def check(self, params):
+        return {'diagnostics': self.document(params).diagnostics()}
+
+    def parse(self, params):
+        document = self.document(params)
+        messages = []
+
+        for chunk, line in zip(document.chunks, document.starts()):
+            for prefix, line_no, suffix in chunk.parse_messages:
+                messages.append(prefix if line_no is None
+                                else prefix + str(line_no + line) + suffix)
+
+        return {'diagnostics': messages,
+                'statements': len(document.instructions())}
+
+    def print_tree(self, params):
+        document = self.document(params)
+
+        if not document.parsed():
+            raise Exception("Syntax error")
+
+        output = io.StringIO()
+        program = AST.Program(AST.InstructionsOpt(document.instructions()))
+
+        write_tree(program, output, params.get('max_depth'),
+                   params.get('max_lines'))
+
+        return {'tree': output.getvalue()}
+
+    def close(self, params):
+        self.documents.pop(os.path.abspath(params['file']), None)
+
+        return {}
+
+    def shutdown(self, params):
+        self.running = False
+
+        return {}
+
+    def handle(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {'id': None, 'error': "Invalid request"}
+
+        response = {'id': request.get('id')}
+
+        method = self.methods.get(request.get('method'))
+
+        if method is None:
+            response['error'] = "Unknown method {0}".format(
+                request.get('method'))
+            return response
+
+        # The checker and the lexer report through print(), and the
+        # redirection of stdout is process wide
+        with self.lock:
+            try:
+                response['result'] = method(request)
+            except KeyError as error:
+                response['error'] = "Missing {0}".format(error)
+            except IOError:
+                response['error'] = "Cannot open {0} file".format(
+                    request['file'])
+            except Exception as error:
+                response['error'] = str(error) or "Syntax error"
+
+        return response
+
+    def serve(self, input, output):
+        for line in input:
+            if not line.strip():
+                continue
+
+            output.write(json.dumps(self.handle(line)) + "\n")
+            output.flush()
+
+            if not self.running:
+                break
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server.server
+        output = io.TextIOWrapper(self.wfile, encoding='utf-8')
+
+        server.serve(io.TextIOWrapper(self.rfile, encoding='utf-8'), output)
+        output.detach()
+
+        if not server.running:
+            threading.Thread(target=self.server.shutdown).start()
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_socket(server, path):
+    if os.path.exists(path):
+        os.unlink(path)
+
+    with UnixServer(path, RequestHandler) as unix_server:
+        unix_server.server = server
+
+        try:
+            unix_server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve parse, check and print requests as JSON lines")
+    parser.add_argument('--socket', nargs='?', const=default_socket(),
+                        help="listen on a Unix socket instead of stdio "
+                             "(default path: %(const)s)")
+    args = parser.parse_args(argv)
+    server = Server()
+
+    if args.socket:
+        serve_socket(server, args.socket)
+    else:
+        server.serve(sys.stdin, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
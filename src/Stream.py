@@ -0,0 +1,126 @@
+#!/usr/bin/python
+
+import itertools
+import mmap
+import os
+import sys
+from Mparser import Mparser
+from SymbolTable import SymbolTable
+from TreePrinter import write_tree
+from TypeChecker import TypeChecker
+
+
+# Files at least this large are streamed by main.py and main2.py
+stream_size = 64 * 2 ** 20
+
+
+def source_lines(filename):
+    # Lines of a file read through mmap, the text is never held whole.
+    # The file is opened here, so a missing one fails before iterating.
+    return mapped_lines(open(filename, 'rb'))
+
+
+def mapped_lines(file):
+    # Line ends are translated like open() does for '\r\n'
+    with file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for line in iter(data.readline, b''):
+                if line.endswith(b'\r\n'):
+                    line = line[:-2] + b'\n'
+
+                yield line.decode('utf-8')
+
+
+def statements(lines, scanner, block=1024):
+    # Tokens of one top-level statement at a time, split like
+    # Incremental.Document.split: after ';' or '}' ending a line outside
+    # brackets, unless the next token is else. Lines are scanned a block
+    # at a time.
+    lines = iter(lines)
+    line_no = 1
+    tokens = []
+    complete = None
+    depth = 0
+
+    while True:
+        text = ''.join(itertools.islice(lines, block))
+
+        if not text:
+            break
+
+        scanner.input(text)
+        scanner.lexer.lineno = line_no
+        line_no += text.count('\n')
+        scanned = list(iter(scanner.token, None))
+
+        for k, token in enumerate(scanned, 1):
+            if complete is not None:
+                if token.type == 'ELSE':
+                    tokens = complete
+                else:
+                    yield complete
+
+                complete = None
+
+            if token.type in ('(', '[', '{'):
+                depth += 1
+            elif token.type in (')', ']', '}'):
+                depth = max(depth - 1, 0)
+
+            tokens.append(token)
+
+            if depth or token.type not in (';', '}'):
+                continue
+
+            if k == len(scanned) or scanned[k].lineno != token.lineno:
+                complete = tokens
+                tokens = []
+
+    if complete is not None:
+        yield complete
+
+    if tokens:
+        yield tokens
+
+
+def parse_statements(lines, parser=None):
+    # Each top-level instruction as soon as its statement is parsed.
+    # Syntax errors are printed on the way.
+    parser = parser or Mparser()
+
+    for tokens in statements(lines, parser.scanner):
+        ast = parser.parse_tokens(tokens)
+
+        for error in parser.errors:
+            print(error)
+
+        if ast is not None and ast.instructions_opt:
+            yield from ast.instructions_opt.instructions
+
+
+def check_statements(instructions):
+    # The symbol table lives on, each instruction is dropped once checked
+    checker = TypeChecker()
+    checker.start(SymbolTable(None, 'global'))
+
+    for instruction in instructions:
+        checker.visit(instruction)
+
+
+def print_statements(instructions, stream=None):
+    for instruction in instructions:
+        write_tree(instruction, stream)
+
+
+if __name__ == '__main__':
+    try:
+        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        lines = source_lines(filename)
+    except IOError:
+        print("Cannot open {0} file".format(filename))
+        sys.exit(0)
+
+    check_statements(parse_statements(lines))
@@ -8,19 +8,52 @@ class Symbol(object):
 
 
 class VariableSymbol(Symbol):
-    def __init__(self, name, type):
+    # An int variable has its value when it is known, or else a Dim that
+    # stands for it in matrix sizes
+    def __init__(self, name, type, value=None, dim=None):
         super().__init__(name, type)
+        self.value = value
+        self.dim = dim
 
 
 class SymbolTable(object):
-    def __init__(self, name):
+    # One table per function scope, chained to the enclosing one. Entering
+    # and leaving a scope only creates or drops a table. As in MATLAB,
+    # blocks are not scopes: their variables live in the function's table.
+
+    def __init__(self, parent, name):
+        self.parent = parent
         self.name = name
         self.symbol_table = dict()
+        self.function = self if parent is None else parent.function
 
     def put(self, name, symbol):
         self.symbol_table[name] = symbol
 
     def get(self, name):
-        return self.symbol_table.get(name, None)
-        
+        scope = self.scope(name)
+
+        return scope.symbol_table[name] if scope else None
+
+    def scope(self, name):
+        # Innermost table that defines name, or None
+        table = self
+
+        while table is not None:
+            if name in table.symbol_table:
+                return table
+            table = table.parent
+
+    def assign(self, name, symbol):
+        # Assignment updates the visible binding, or defines one in the
+        # function scope
+        (self.scope(name) or self.function).put(name, symbol)
+
+    def getParentScope(self):
+        return self.parent
+
+    def pushScope(self, name):
+        return SymbolTable(self, name)
 
+    def popScope(self):
+        return self.parent
@@ -0,0 +1,228 @@
+#!/usr/bin/python
+
+import array
+import hashlib
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+from ParseCache import cache_directory
+from scanner import Scanner, FastScanner
+
+
+# Token type names by id: the scanner's token names, then its literals
+types = tuple(Scanner.tokens) + tuple(Scanner.literals)
+type_ids = dict((name, i) for i, name in enumerate(types))
+
+# Tokens whose value is not their text, their length is found again with
+# their own rule
+converted = dict((name, re.compile(getattr(Scanner, 't_' + name).__doc__,
+                                   re.VERBOSE))
+                 for name in ('FLOAT', 'INTNUM'))
+
+# Layout on disk: magic, digest of the type names, a header with the word
+# type and token count, then the type ids as bytes and the starts, lengths
+# and lines as words, as narrow as the largest one allows
+magic = b'MTOK\x01'
+schema = hashlib.sha256(' '.join(types).encode('utf-8')).digest()[:8]
+header = struct.Struct('<cI')
+
+
+class TokenStream(object):
+    # The tokens of one text as parallel arrays: type id, start offset,
+    # length and line. Token text is sliced from the source when asked.
+
+    def __init__(self, text, type_ids=None, starts=None, lengths=None,
+                 lines=None):
+        self.text = text
+        self.type_ids = type_ids or array.array('B')
+        self.starts = starts or array.array('L')
+        self.lengths = lengths or array.array('L')
+        self.lines = lines or array.array('L')
+        # Seconds it took to scan or load the stream
+        self.elapsed = 0.0
+
+    def __len__(self):
+        return len(self.type_ids)
+
+    def __iter__(self):
+        # (type, text, line) of each token
+        text = self.text
+
+        for type_id, start, length, line in zip(self.type_ids, self.starts,
+                                                self.lengths, self.lines):
+            yield types[type_id], text[start:start + length], line
+
+    def type(self, k):
+        return types[self.type_ids[k]]
+
+    def value(self, k):
+        start = self.starts[k]
+
+        return self.text[start:start + self.lengths[k]]
+
+    def column(self, k):
+        start = self.starts[k]
+
+        return start - self.text.rfind('\n', 0, start)
+
+    def names(self):
+        # Identifiers used anywhere in the text
+        id_type = type_ids['ID']
+
+        return set(self.value(k) for k, type_id in enumerate(self.type_ids)
+                   if type_id == id_type)
+
+    def rate(self):
+        # Tokens per second of the scan or load
+        return len(self) / self.elapsed if self.elapsed else 0.0
+
+    def dumps(self):
+        words = array.array('L')
+        words.extend(self.starts)
+        words.extend(self.lengths)
+        words.extend(self.lines)
+        largest = max(words, default=0)
+        typecode = next(code for code in 'BHIQ'
+                        if largest < 1 << 8 * array.array(code).itemsize)
+        words = array.array(typecode, words)
+        ids = array.array('B', self.type_ids)
+
+        if sys.byteorder == 'big':
+            words.byteswap()
+
+        return b''.join((magic, schema,
+                         header.pack(typecode.encode('ascii'), len(ids)),
+                         ids.tobytes(), words.tobytes()))
+
+
+def loads(data, text):
+    start = len(magic) + len(schema)
+
+    if data[:len(magic)] != magic or data[len(magic):start] != schema:
+        raise ValueError("Not a token stream of this version")
+
+    typecode, count = header.unpack_from(data, start)
+    start += header.size
+    ids = array.array('B', data[start:start + count])
+    words = array.array(typecode.decode('ascii'))
+    words.frombytes(data[start + count:])
+
+    if sys.byteorder == 'big':
+        words.byteswap()
+
+    if len(ids) != count or len(words) != 3 * count:
+        raise ValueError("Truncated token stream")
+
+    return TokenStream(text, ids, array.array('L', words[:count]),
+                       array.array('L', words[count:2 * count]),
+                       array.array('L', words[2 * count:]))
+
+
+def scan(text, scanner=None):
+    # Lexical errors are printed by the scanner, as when parsing
+    if scanner is None:
+        scanner = FastScanner()
+        scanner.build()
+
+    started = time.perf_counter()
+    stream = TokenStream(text)
+    add_type = stream.type_ids.append
+    add_start = stream.starts.append
+    add_length = stream.lengths.append
+    add_line = stream.lines.append
+    scanner.input(text)
+
+    for token in iter(scanner.token, None):
+        add_type(type_ids[token.type])
+        add_start(token.lexpos)
+        add_line(token.lineno)
+
+        if token.type in converted:
+            add_length(converted[token.type].match(text, token.lexpos).end()
+                       - token.lexpos)
+        else:
+            add_length(len(token.value))
+
+    stream.elapsed = time.perf_counter() - started
+
+    return stream
+
+
+class TokenCache(object):
+    # Token streams of error free texts on disk, keyed by a hash of the
+    # text and the token types, next to the parse cache
+
+    def __init__(self, scanner=None, directory=None):
+        if scanner is None:
+            scanner = FastScanner()
+            scanner.build()
+
+        self.scanner = scanner
+        self.directory = directory or os.path.join(cache_directory(),
+                                                   'tokens')
+
+    def path(self, text):
+        digest = hashlib.sha256(schema + text.encode('utf-8')).hexdigest()
+
+        return os.path.join(self.directory, digest[:2], digest[2:])
+
+    def scan(self, text):
+        path = self.path(text)
+        started = time.perf_counter()
+
+        try:
+            with open(path, 'rb') as file:
+                stream = loads(file.read(), text)
+        except (IOError, ValueError, struct.error):
+            stream = None
+
+        if stream is not None:
+            stream.elapsed = time.perf_counter() - started
+
+            return stream
+
+        stream = scan(text, self.scanner)
+
+        if not self.scanner.errors:
+            self.store(path, stream)
+
+        return stream
+
+    def store(self, path, stream):
+        directory = os.path.dirname(path)
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            file = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+        except OSError:
+            return
+
+        try:
+            with file:
+                file.write(stream.dumps())
+
+            os.replace(file.name, path)
+        except OSError:
+            try:
+                os.unlink(file.name)
+            except OSError:
+                pass
+
+
+if __name__ == '__main__':
+    cache = TokenCache()
+
+    for filename in sys.argv[1:] or ["example.txt"]:
+        try:
+            with open(filename, "r") as file:
+                text = file.read()
+        except IOError:
+            print("Cannot open {0} file".format(filename))
+            continue
+
+        stream = cache.scan(text)
+        print("{0}: {1} tokens, {2:.0f} tokens/s".format(filename, len(stream),
+                                                        stream.rate()))
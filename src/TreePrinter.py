@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import print_function
+import itertools
+import sys
 import AST
 
 
@@ -15,168 +17,219 @@ def addToClass(cls):
 
 filler = '|  '
 
+# indents[k] is the prefix of a line at depth k, extended on demand
+indents = [filler * k for k in range(32)]
 
-def indented(k):
-    print(k * filler, end='')
+
+def indentation(k):
+    while k >= len(indents):
+        indents.append(filler * len(indents))
+
+    return indents[k]
+
+
+def subtree(node, indent, limit):
+    # Lines of node, or a single elision mark below the depth limit
+    if indent > limit:
+        return (indentation(indent) + '...',)
+
+    return node.treeLines(indent, limit)
+
+
+def tree_lines(node, max_depth=None, indent=0):
+    limit = sys.maxsize if max_depth is None else indent + max_depth
+
+    return node.treeLines(indent, limit)
+
+
+def write_tree(node, stream=None, max_depth=None, max_lines=None, indent=0,
+               batch=4096):
+    # Lines are joined and written a batch at a time
+    stream = stream or sys.stdout
+    lines = tree_lines(node, max_depth, indent)
+
+    if max_lines is not None:
+        lines = itertools.islice(lines, max_lines + 1)
+
+    written = 0
+
+    while True:
+        lines_batch = list(itertools.islice(lines, batch))
+
+        if not lines_batch:
+            break
+
+        if max_lines is not None and written + len(lines_batch) > max_lines:
+            lines_batch[max_lines - written:] = ['...']
+
+        stream.write('\n'.join(lines_batch))
+        stream.write('\n')
+        written += len(lines_batch)
+
+    stream.flush()
 
 
 class TreePrinter:
     @addToClass(AST.Node)
-    def printTree(self, indent=0):
+    def printTree(self, indent=0, stream=None, max_depth=None,
+                  max_lines=None):
+        write_tree(self, stream, max_depth, max_lines, indent)
+
+    @addToClass(AST.Node)
+    def treeLines(self, indent, limit):
         raise Exception("printTree not defined in class " +
                         self.__class__.__name__)
 
     @addToClass(AST.IntNum)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.value)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + str(self.value)
 
     @addToClass(AST.FloatNum)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.value)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + str(self.value)
 
     @addToClass(AST.Variable)
-    def printTree(self, indent=0):
-        indented(indent)
-
+    def treeLines(self, indent, limit):
         if not self.indices:
-            print(self.name)
+            yield indentation(indent) + str(self.name)
         else:
-            print("REF")
-            indented(indent + 1)
-            print(self.name)
+            yield indentation(indent) + "REF"
+            inner = indentation(indent + 1)
+            yield inner + str(self.name)
 
             for i in self.indices:
-                indented(indent + 1)
-                print(i)
+                yield inner + str(i)
 
     @addToClass(AST.Matrix)
-    def printTree(self, indent=0):
-        indented(indent)
-        print("MATRIX")
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + "MATRIX"
+        row_indent = indentation(indent + 1)
+        elem_indent = indentation(indent + 2)
 
         for row in self.matrix:
-            indented(indent + 1)
-            print("VECTOR")
+            yield row_indent + "VECTOR"
 
             for num in row:
-                indented(indent + 2)
-                print(num)
+                yield elem_indent + str(num)
 
     @addToClass(AST.BinExpr)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.op)
-        self.left.printTree(indent + 1)
-        self.right.printTree(indent + 1)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + self.op
+        yield from subtree(self.left, indent + 1, limit)
+        yield from subtree(self.right, indent + 1, limit)
+
+    @addToClass(AST.ElementwiseChain)
+    def treeLines(self, indent, limit, count=None):
+        # Printed as the BinExpr it was fused from, count ops of it
+        if count is None:
+            count = len(self.ops)
+
+        if count == 0:
+            yield from subtree(self.operands[0], indent, limit)
+            return
+        elif indent > limit:
+            yield indentation(indent) + '...'
+            return
+
+        yield indentation(indent) + self.ops[count - 1]
+        yield from self.treeLines(indent + 1, limit, count - 1)
+        yield from subtree(self.operands[count], indent + 1, limit)
 
     @addToClass(AST.UnaryExpr)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.op)
-        indented(indent + 1)
-        print(self.expr)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + self.op
+        yield indentation(indent + 1) + str(self.expr)
 
     @addToClass(AST.String)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.value)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + self.value
 
     @addToClass(AST.Instruction)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.instruction_type.upper())
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + self.instruction_type.upper()
 
         if self.value:
-            for val in self.value:
-                val.printTree(indent + 1)
+            values = self.value if isinstance(self.value, list) \
+                else [self.value]
+
+            for val in values:
+                yield from subtree(val, indent + 1, limit)
 
     @addToClass(AST.Assign)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.assign_type)
-        self.pid.printTree(indent + 1)
-        self.value.printTree(indent + 1)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + self.assign_type
+        yield from subtree(self.pid, indent + 1, limit)
+        yield from subtree(self.value, indent + 1, limit)
 
     @addToClass(AST.Equality)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.op)
-        self.left.printTree(indent + 1)
-        self.right.printTree(indent + 1)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + self.op
+        yield from subtree(self.left, indent + 1, limit)
+        yield from subtree(self.right, indent + 1, limit)
 
     @addToClass(AST.Negation)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.value)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + str(self.value)
 
     @addToClass(AST.MatrixOperation)
-    def printTree(self, indent=0):
-        indented(indent)
-        print(self.op_type)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + self.op_type
 
         for value in self.values:
-            value.printTree(indent + 1)
+            yield from subtree(value, indent + 1, limit)
 
     @addToClass(AST.Transpose)
-    def printTree(self, indent=0):
-        indented(indent)
-        print("TRANSPOSE")
-        self.expr.printTree(indent + 1)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + "TRANSPOSE"
+        yield from subtree(self.expr, indent + 1, limit)
 
     @addToClass(AST.Program)
-    def printTree(self, indent=0):
-        self.instructions_opt.printTree(indent)
+    def treeLines(self, indent, limit):
+        if self.instructions_opt:
+            yield from self.instructions_opt.treeLines(indent, limit)
 
     @addToClass(AST.InstructionsOpt)
-    def printTree(self, indent=0):
+    def treeLines(self, indent, limit):
         for inst in self.instructions:
-            inst.printTree(indent)
+            yield from subtree(inst, indent, limit)
 
     @addToClass(AST.IfCondition)
-    def printTree(self, indent=0):
-        indented(indent)
-        print("IF")
-        self.expr.printTree(indent + 1)
+    def treeLines(self, indent, limit):
+        prefix = indentation(indent)
+
+        yield prefix + "IF"
+        yield from subtree(self.expr, indent + 1, limit)
 
-        indented(indent)
-        print("THEN")
-        self.block.printTree(indent + 1)
+        yield prefix + "THEN"
+        yield from subtree(self.block, indent + 1, limit)
 
         if self.else_cond:
-            indented(indent)
-            print("ELSE")
-            self.else_cond.printTree(indent)
+            yield prefix + "ELSE"
+            yield from subtree(self.else_cond, indent, limit)
 
         if self.else_block:
-            indented(indent)
-            print("ELSE")
-            self.else_block.printTree(indent + 1)
+            yield prefix + "ELSE"
+            yield from subtree(self.else_block, indent + 1, limit)
 
     @addToClass(AST.ForCondition)
-    def printTree(self, indent=0):
-        indented(indent)
-        print("FOR")
-        indented(indent + 1)
-        print(self.pid)
-        self.for_range.printTree(indent + 1)
-        self.block.printTree(indent + 1)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + "FOR"
+        yield indentation(indent + 1) + str(self.pid)
+        yield from subtree(self.for_range, indent + 1, limit)
+        yield from subtree(self.block, indent + 1, limit)
 
     @addToClass(AST.WhileCondition)
-    def printTree(self, indent=0):
-        indented(indent)
-        print("WHILE")
-        self.expr.printTree(indent + 1)
-        self.block.printTree(indent + 1)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + "WHILE"
+        yield from subtree(self.expr, indent + 1, limit)
+        yield from subtree(self.block, indent + 1, limit)
 
     @addToClass(AST.Range)
-    def printTree(self, indent=0):
-        indented(indent)
-        print("RANGE")
-        self.start.printTree(indent + 1)
-        self.end.printTree(indent + 1)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + "RANGE"
+        yield from subtree(self.start, indent + 1, limit)
+        yield from subtree(self.end, indent + 1, limit)
 
     @addToClass(AST.Error)
-    def printTree(self, indent=0):
-        print(self.error_type)
+    def treeLines(self, indent, limit):
+        yield indentation(indent) + self.error_type
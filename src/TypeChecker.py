@@ -1,36 +1,108 @@
 #!/usr/bin/python
 
+import operator
+import AST
+import Types
 from SymbolTable import *
 
 
+# Int arithmetic of constant sizes, / is floor division like Values
+int_operations = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.floordiv,
+}
+
+
+def fold(op, left, right):
+    # Value of a constant int operation, or None
+    if left is None or right is None:
+        return None
+
+    try:
+        return int_operations[op](left, right)
+    except ArithmeticError:
+        return None
+
+
+def assigned_names(node, names):
+    # Names a block may assign, loop variables included. Expressions
+    # assign nothing, only statements are walked.
+    if isinstance(node, list):
+        for elem in node:
+            assigned_names(elem, names)
+    elif isinstance(node, AST.Assign):
+        names.add(node.pid.name)
+    elif isinstance(node, AST.ForCondition):
+        names.add(node.pid.name)
+        assigned_names(node.block, names)
+    elif isinstance(node, AST.InstructionsOpt):
+        assigned_names(node.instructions, names)
+    elif isinstance(node, (AST.IfCondition, AST.WhileCondition)):
+        assigned_names(node.block, names)
+
+        if isinstance(node, AST.IfCondition):
+            assigned_names(node.else_block, names)
+            assigned_names(node.else_cond, names)
+
+    return names
+
+
 class NodeVisitor(object):
+    # Visitor method for each node class, filled in on first use
+    dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = {}
+
+    @classmethod
+    def resolve(cls, node_class):
+        # visit_<Class> of the node class or its nearest base class
+        for klass in node_class.__mro__:
+            visitor = getattr(cls, 'visit_' + klass.__name__, None)
+
+            if visitor is not None:
+                break
+        else:
+            visitor = cls.generic_visit
+
+        cls.dispatch[node_class] = visitor
+
+        return visitor
+
     def visit(self, node):
-        method = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        # print(method, visitor, node)
+        try:
+            visitor = self.dispatch[node.__class__]
+        except KeyError:
+            visitor = self.resolve(node.__class__)
 
-        return visitor(node)
+        return visitor(self, node)
 
     def generic_visit(self, node):
         if isinstance(node, list):
             for elem in node:
                 self.visit(elem)
-        else:
-            for child in node.children:
-                if isinstance(child, list):
-                    for item in child:
-                        if isinstance(item, AST.Node):
-                            self.visit(item)
-                elif isinstance(child, AST.Node):
+        elif isinstance(node, AST.Node):
+            for field in node._fields:
+                child = getattr(node, field)
+
+                if isinstance(child, (AST.Node, list)):
                     self.visit(child)
 
 
 class TypeChecker(NodeVisitor):
-    def visit_Program(self, node):
-        self.global_table = SymbolTable('global')
-        self.tables = [self.global_table]
+    def start(self, table):
+        self.global_table = table
+        self.table = table
 
         self.loop = 0
+        # Sizes a product in the current statement proved equal, by Dim
+        self.dims = {}
+
+    def visit_Program(self, node):
+        self.start(SymbolTable(None, 'global'))
 
         return self.visit(node.instructions_opt)
 
@@ -38,19 +110,19 @@ class TypeChecker(NodeVisitor):
         return self.visit(node.instructions)
 
     def visit_IntNum(self, node):
-        return 'int'
+        return Types.INT
 
     def visit_FloatNum(self, node):
-        return 'float'
+        return Types.FLOAT
 
     def visit_String(self, node):
-        return 'string'
+        return Types.STRING
 
     def visit_Variable(self, node):
         name = node.name
         line_no = node.line_no
 
-        symbol = self.tables[-1].get(name)
+        symbol = self.table.get(name)
 
         try:
             if not symbol:
@@ -61,6 +133,7 @@ class TypeChecker(NodeVisitor):
             print("Line {0}: {1}".format(line_no, error_type))
     
     def visit_Assign(self, node):
+        self.dims = {}
         expr = self.visit(node.value)
         line_no = node.line_no
 
@@ -68,117 +141,189 @@ class TypeChecker(NodeVisitor):
             name = node.pid.name
             assign_type = node.assign_type
 
-            old_symbol = self.tables[-1].get(name)
+            old_symbol = self.table.get(name)
+
+            if node.pid.indices and old_symbol is not None and \
+                    old_symbol.type is not None and old_symbol.type.is_matrix:
+                # An element store keeps the matrix, its type and its sizes
+                if expr is not None and not expr.is_numeric:
+                    error_type = "Invalid assigning of " + str(expr) + \
+                        " to a matrix element"
+                    raise Exception(error_type)
+
+                return
 
             if old_symbol == None and assign_type != '=':
                 error_type = "Variable does not exist!"
                 raise Exception(error_type)
             elif assign_type == '=':
-                new_symbol = VariableSymbol(node.pid, expr)
+                new_symbol = self.variable(name, node.pid,
+                                           self.substitute(expr),
+                                           self.size(node.value)
+                                           if expr is Types.INT else None)
 
-                self.tables[-1].put(name, new_symbol)
+                self.table.assign(name, new_symbol)
             else:
-                type1 = expr
-                type2 = old_symbol.type
+                type1 = self.substitute(expr)
+                type2 = self.substitute(old_symbol.type)
 
                 if not type1:
                     error_type = "Assigning to an unknown variable"
                     raise Exception(error_type)
-                
-                if type1 == 'int' and type2 == 'int':
-                    new_type = 'int'
-                elif type1 == 'float' and type2 == 'int':
-                    new_type = 'float'
-                elif type1 == 'int' and type2 == 'float':
-                    new_type =  'float'
-                elif type1 == 'float' and type2 == 'float':
-                    new_type = 'float'
-                elif type1.startswith('matrix') and type2.startswith('matrix'):
-                    dim1 = type1[6:]
-                    dim2 = type2[6:]
-
-                    if dim1 == dim2:
-                        new_type = type1
-                    elif dim1[0] == "1" and dim1[2] == dim2[2]:
-                        new_type = type2
-                    elif dim2[0] == "1" and dim1[2] == dim2[2]:
-                        new_type = type1
-                    else:
-                        error_type = "Invalid dimensions for matrices " + \
-                            node.pid.name + ' (' + dim1 + ')' + " and " + \
-                            '(' + dim2 + ')'
-                        raise Exception(error_type)
-                elif type2.startswith('matrix') and type1 in ('int', 'float'):
+
+                new_type, error_kind = Types.binary_result(assign_type[0],
+                                                           type2, type1)
+
+                if error_kind == Types.DIMENSIONS:
+                    error_type = "Invalid dimensions for matrices " + \
+                        node.pid.name + ' (' + type1.dims + ')' + " and " + \
+                        '(' + type2.dims + ')'
+                    raise Exception(error_type)
+                elif error_kind == Types.MIXED and type2.is_matrix:
                     error_type = "Invalid assigning with numerical value " + \
                         "and matrix"
                     raise Exception(error_type)
-                else:
-                    print(type1, type2)
+                elif error_kind:
                     error_type = "Invalid operations for assignment"
                     raise Exception(error_type)
 
-                new_symbol = VariableSymbol(node.pid, new_type)
-                self.tables[-1].put(name, new_symbol)
+                self.unify_product(assign_type[0], type2, type1)
+                value = fold(assign_type[0], old_symbol.value,
+                             self.constant(node.value)) \
+                    if new_type is Types.INT else None
+                new_symbol = self.variable(name, node.pid,
+                                           self.substitute(new_type), value)
+                self.table.assign(name, new_symbol)
         except TypeError:
             error_type = "Type Error!"
             print("Line {0}: {1}".format(line_no, error_type))
         except Exception as error_type:
             print("Line {0}: {1}".format(line_no, error_type))
 
+    def variable(self, name, pid, type, size=None):
+        # Symbol of a new value of name. An int whose value is not known
+        # gets a new Dim, unless it is a copy of another variable.
+        if type is not Types.INT:
+            return VariableSymbol(pid, type)
+        elif size.__class__ is int:
+            return VariableSymbol(pid, type, value=size)
+
+        return VariableSymbol(pid, type, dim=size if size.__class__ is
+                              Types.Dim else Types.Dim(name))
+
+    def forget(self, names):
+        # Ints assigned in a loop or a branch may have any of their values
+        for name in names:
+            symbol = self.table.get(name)
+
+            if symbol is not None and symbol.type is Types.INT:
+                self.table.assign(name, self.variable(name, symbol.name,
+                                                      Types.INT))
+
+    def constant(self, node):
+        # Value of an int expression of literals and known variables
+        if node.__class__ is AST.IntNum:
+            return node.value
+        elif node.__class__ is AST.Variable:
+            symbol = None if node.indices else self.table.get(node.name)
+
+            if symbol is not None and symbol.type is Types.INT:
+                return symbol.value
+        elif node.__class__ is AST.Negation:
+            value = self.constant(node.value)
+
+            return None if value is None else -value
+        elif node.__class__ is AST.BinExpr and node.op in int_operations:
+            return fold(node.op, self.constant(node.left),
+                        self.constant(node.right))
+
+    def size(self, node):
+        # An int expression as a size: its value, the Dim of the variable
+        # it reads, or None
+        value = self.constant(node)
+
+        if value is not None:
+            return value
+        elif node.__class__ is AST.Variable and not node.indices:
+            symbol = self.table.get(node.name)
+
+            if symbol is not None and symbol.type is Types.INT:
+                return self.find(symbol.dim)
+
+    def find(self, dim):
+        while dim.__class__ is Types.Dim and dim in self.dims:
+            dim = self.dims[dim]
+
+        return dim
+
+    def substitute(self, type):
+        # The type with the sizes proved so far in the statement
+        if not self.dims or type is None or not type.symbolic:
+            return type
+
+        return Types.matrix(self.find(type.rows), self.find(type.cols))
+
+    def unify_product(self, op, left, right):
+        # A product only runs with equal inner sizes. Element-wise sizes
+        # broadcast, a 1 goes with any size, so they prove nothing.
+        if op != '*' or not left.is_matrix or not right.is_matrix:
+            return
+
+        dim1 = left.cols
+        dim2 = right.rows
+
+        if dim1 is dim2 or dim1 is None or dim2 is None:
+            return
+        elif dim1.__class__ is Types.Dim:
+            self.dims[dim1] = dim2
+        elif dim2.__class__ is Types.Dim:
+            self.dims[dim2] = dim1
+
     def visit_BinExpr(self, node):
         type1 = self.visit(node.left)
         type2 = self.visit(node.right)
-        op    = node.op
-        line_no = node.line_no
 
+        return self.binary_type(node.op, type1, type2, node.line_no)
+
+    def visit_ElementwiseChain(self, node):
+        result = self.visit(node.operands[0])
+
+        for op, operand, line_no in zip(node.ops, node.operands[1:],
+                                        node.op_lines):
+            result = self.binary_type(op, result, self.visit(operand),
+                                      line_no)
+
+        return result
+
+    def binary_type(self, op, type1, type2, line_no):
         try:
             if not type1 or not type2:
                 error_type = "Expression with an unknown variable"
                 raise Exception(error_type)
-            if op in ('.*', '.+', '.-', './'):
-                if not type1.startswith('matrix'):
-                    error_type = "Element-wise operation without a matrix"
-                    raise Exception(error_type)
-                elif type2 not in ('int', 'float'):
-                    error_type = "Element-wise with not a int or float"
-                    raise Exception(error_type)
-                else:
-                    return type1
+
+            type1 = self.substitute(type1)
+            type2 = self.substitute(type2)
+            result, error_kind = Types.binary_result(op, type1, type2)
+
+            if not error_kind:
+                self.unify_product(op, type1, type2)
+
+                return self.substitute(result)
+            elif error_kind == Types.NOT_MATRIX:
+                error_type = "Element-wise operation without a matrix"
+            elif error_kind == Types.NOT_NUMERIC:
+                error_type = "Element-wise with not a int or float"
+            elif error_kind == Types.DIMENSIONS:
+                error_type = "Invalid dimensions for matrices " + \
+                    ' (' + type1.dims + ')' + " and " + \
+                    '(' + type2.dims + ')'
+            elif error_kind == Types.MIXED:
+                error_type = "Binary operations with numerical value " + \
+                    "and matrix"
             else:
-                if type1 == 'int' and type2 == 'int':
-                    return 'int'
-                elif type1 == 'float' and type2 == 'int':
-                    return 'float'
-                elif type1 == 'int' and type2 == 'float':
-                    return 'float'
-                elif type1 == 'float' and type2 == 'float':
-                    return 'float'
-                elif type1.startswith('matrix') and type2.startswith('matrix'):
-                    dim1 = type1[6:]
-                    dim2 = type2[6:]
-
-                    if dim1 == dim2:
-                        return type1
-                    elif dim1[0] == "1" and dim1[2] == dim2[2]:
-                        return type2
-                    elif dim2[0] == "1" and dim1[2] == dim2[2]:
-                        return type1
-                    else:
-                        error_type = "Invalid dimensions for matrices " + \
-                            ' (' + dim1 + ')' + " and " + \
-                            '(' + dim2 + ')'
-                        raise Exception(error_type)
-                elif type1.startswith('matrix') and type2 in ('int', 'float'):
-                    error_type = "Binary operations with numerical value " + \
-                        "and matrix"
-                    raise Exception(error_type)
-                elif type2.startswith('matrix') and type1 in ('int', 'float'):
-                    error_type = "Binary operations with numerical value " + \
-                        "and matrix"
-                    raise Exception(error_type)
-                else:
-                    error_type = "Invalid operations for assignment"
-                    raise Exception(error_type)
+                error_type = "Invalid operations for assignment"
+
+            raise Exception(error_type)
         except Exception as error_type:
             print("Line {0}: {1}".format(line_no, error_type))
 
@@ -188,7 +333,7 @@ class TypeChecker(NodeVisitor):
         op    = node.op
         line_no = node.line_no
 
-        return 'boolean'
+        return Types.BOOLEAN
 
     def visit_UnaryExpr(self, node):
         type1 = self.visit(node.expr)
@@ -207,30 +352,26 @@ class TypeChecker(NodeVisitor):
             for elem in vector:
                 elem_type = self.visit(elem)
 
-                if elem_type not in ('float', 'int'):
+                if not elem_type or not elem_type.is_numeric:
                     error_type = "Wrong type in matrix"
                     print("Line {0}: {1}".format(line_no, error_type))
                     break
 
-        row = len(node.matrix)
-        column = len(node.matrix[0])
-
-        dim = str(row) + 'x' + str(column)
-
-        return 'matrix' + str(dim)
+        return Types.matrix(len(node.matrix), len(node.matrix[0]))
 
     def visit_Transpose(self, node):
-        type1 = self.visit(node.expr)
+        type1 = self.substitute(self.visit(node.expr))
         line_no = node.line_no
 
         try:
-            if not type1.startswith('matrix'):
+            if not type1:
+                error_type = "Expression with an unknown variable"
+                raise Exception(error_type)
+            elif not type1.is_matrix:
                 error_type = 'Transpose operation with a non-matrix'
                 raise Exception(error_type)
 
-            dim = type1[6:][::-1]
-
-            return 'matrix' + str(dim)
+            return Types.matrix(type1.cols, type1.rows)
         except Exception as error_type:
             print("Line {0}: {1}".format(line_no, error_type))
 
@@ -241,44 +382,41 @@ class TypeChecker(NodeVisitor):
             for val in node.values:
                 val_type = self.visit(val)
 
-                if val_type != 'int':
+                if val_type is not Types.INT:
                     error_type = "Invalid dimension values"
                     raise Exception(error_type)
 
-            len_values = len(node.values)
+            # Negative sizes fail when the program runs
+            dims = [self.size(val) for val in node.values]
+            dims = [None if dim.__class__ is int and dim < 0 else dim
+                    for dim in dims]
 
-            if len_values == 1:
-                dim = str(node.values[0]) + 'x' + '1'
-            else:
-                dim = 'x'.join([str(d) for d in node.values])
+            # One size makes a square matrix
+            if len(dims) == 1:
+                return Types.matrix(dims[0], dims[0])
 
-            return 'matrix' + dim
+            return Types.matrix(*dims[:2])
 
         except Exception as error_type:
             print("Line {0}: {1}".format(line_no, error_type))
 
     def visit_IfCondition(self, node):
         line_no = node.line_no
+        self.dims = {}
 
         try:
             expr_type = self.visit(node.expr)
 
-            if expr_type != 'boolean':
+            if expr_type is not Types.BOOLEAN:
                 error_type = "Condition is not a boolean"
                 raise Exception(error_type)
 
-            new_table = SymbolTable('New')
-            new_table.symbol_table = self.tables[-1].symbol_table
-            
-            self.tables.append(new_table)
             self.visit(node.block)
-
-            for elem in self.tables[-1].symbol_table:
-                self.tables[-2].put(elem, self.tables[-1].get(elem))
-            self.tables.pop()
+            self.forget(assigned_names(node.block, set()))
 
             if node.else_block:
                 self.visit(node.else_block)
+                self.forget(assigned_names(node.else_block, set()))
             elif node.else_cond:
                 self.visit(node.else_cond)
         except Exception as error_type:
@@ -286,26 +424,22 @@ class TypeChecker(NodeVisitor):
 
     def visit_WhileCondition(self, node):
         line_no = node.line_no
+        self.dims = {}
+        # Values from one iteration are seen by the next
+        names = assigned_names(node.block, set())
+        self.forget(names)
 
         try:
             expr_type = self.visit(node.expr)
 
-            if expr_type != 'boolean':
+            if expr_type is not Types.BOOLEAN:
                 error_type = "Condition is not a boolean"
                 raise Exception(error_type)
 
             self.loop += 1
-            new_table = SymbolTable('New')
-            new_table.symbol_table = self.tables[-1].symbol_table
-            self.tables.append(new_table)
             self.visit(node.block)
-
             self.loop -= 1
-
-            for elem in self.tables[-1].symbol_table:
-                self.tables[-2].put(elem, self.tables[-1].get(elem))
-
-            self.tables.pop()
+            self.forget(names)
 
         except Exception as error_type:
             print("Line {0}: {1}".format(line_no, error_type))
@@ -317,11 +451,11 @@ class TypeChecker(NodeVisitor):
             type1 = self.visit(node.start)
             type2 = self.visit(node.end)
 
-            if type1 != 'int' or type2 != 'int':
+            if type1 is not Types.INT or type2 is not Types.INT:
                 error_type = "Invalid range arguments"
                 raise Exception(error_type)
 
-            return 'int'
+            return Types.INT
             
         except Exception as error_type:
             print("Line {0}: {1}".format(line_no, error_type))
@@ -329,36 +463,40 @@ class TypeChecker(NodeVisitor):
     def visit_ForCondition(self, node):
         line_no = node.line_no
 
+        self.dims = {}
+        names = assigned_names(node.block, {node.pid.name})
+        self.forget(names)
+
         try:
             self.loop += 1
-            new_table = SymbolTable('New')
-            new_table.symbol_table = self.tables[-1].symbol_table
-
             name = node.pid.name
             for_range = self.visit(node.for_range)
-            new_symbol = VariableSymbol(node.pid, for_range)
-            new_table.put(name, new_symbol)
+            new_symbol = self.variable(name, node.pid, for_range)
 
-            self.tables.append(new_table)
+            # Blocks do not open a scope, see SymbolTable
+            self.table.assign(name, new_symbol)
             self.visit(node.block)
-            self.loop -= 1
 
-            for elem in self.tables[-1].symbol_table:
-                self.tables[-2].put(elem, self.tables[-1].get(elem))
+            self.loop -= 1
+            self.forget(names)
 
-            self.tables.pop()
-            
         except Exception as error_type:
             print("Line {0}: {1}".format(line_no, error_type))
     
+    def visit_Error(self, node):
+        # Reported by the parser already
+        pass
+
     def visit_Negation(self, node):
         line_no = node.line_no
 
         try:
             type1 = self.visit(node.value)
-            print(type1)
 
-            if type1 not in ('int', 'float') and not type1.startswith('matrix'):
+            if not type1:
+                error_type = "Expression with an unknown variable"
+                raise Exception(error_type)
+            elif not type1.is_numeric and not type1.is_matrix:
                 error_type = "Invalid arguments for negation"
                 raise Exception(error_type)
             else:
@@ -369,6 +507,7 @@ class TypeChecker(NodeVisitor):
     def visit_Instruction(self, node):
         line_no = node.line_no
         inst_type = node.instruction_type
+        self.dims = {}
 
         try:
             if self.loop <= 0 and inst_type not in ('print', 'return'):
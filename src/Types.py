@@ -0,0 +1,163 @@
+#!/usr/bin/python
+
+
+class Type(object):
+    __slots__ = ('name',)
+    is_matrix = False
+    is_numeric = False
+    symbolic = False
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return self.name
+
+
+class ScalarType(Type):
+    __slots__ = ('is_numeric',)
+
+    def __init__(self, name, numeric=False):
+        self.name = name
+        self.is_numeric = numeric
+
+
+class MatrixType(Type):
+    # Dimensions are ints, Dims, or None when unknown
+    __slots__ = ('rows', 'cols', 'dims', 'symbolic')
+    is_matrix = True
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.symbolic = rows.__class__ is Dim or cols.__class__ is Dim
+        self.dims = '{0}x{1}'.format(dim_name(rows), dim_name(cols))
+        self.name = 'matrix' + self.dims
+
+
+INT = ScalarType('int', numeric=True)
+FLOAT = ScalarType('float', numeric=True)
+STRING = ScalarType('string')
+BOOLEAN = ScalarType('boolean')
+
+
+class Dim(object):
+    # A size that is the value of an int variable at one point, like n in
+    # zeros(n) when n is not a constant. Each assignment of the variable
+    # makes a new Dim, so equal Dims are equal sizes.
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return self.name
+
+
+def dim_name(dim):
+    return '?' if dim is None else str(dim)
+
+
+# Types are interned, so they compare and hash by identity. Types with
+# Dims are not, they would only pile up.
+matrix_types = {}
+
+
+def matrix(rows, cols):
+    try:
+        return matrix_types[rows, cols]
+    except KeyError:
+        new_type = MatrixType(rows, cols)
+
+        if not new_type.symbolic:
+            matrix_types[rows, cols] = new_type
+
+        return new_type
+
+
+def same_dim(dim1, dim2):
+    # Sizes that may be equal when the program runs
+    return dim1 == dim2 or dim1 is None or dim2 is None or \
+        dim1.__class__ is Dim or dim2.__class__ is Dim
+
+
+def join_dim(dim1, dim2):
+    # The better known of two sizes that may be equal: an int, a Dim, None
+    if dim1 is None or (dim1.__class__ is Dim and dim2 is not None):
+        return dim2
+
+    return dim1
+
+
+# Error kinds of binary_result, TypeChecker words the messages
+DIMENSIONS = 'dimensions'
+MIXED = 'mixed'
+INVALID = 'invalid'
+NOT_MATRIX = 'not matrix'
+NOT_NUMERIC = 'not numeric'
+
+arithmetic_ops = ('+', '-', '*', '/')
+elementwise_ops = ('.+', '.-', '.*', './')
+
+
+def broadcast(left, right):
+    # Equal shapes, or a single row against a matrix of as many columns
+    if same_dim(left.rows, right.rows) and same_dim(left.cols, right.cols):
+        return matrix(join_dim(left.rows, right.rows),
+                      join_dim(left.cols, right.cols))
+    elif left.rows == 1 and same_dim(left.cols, right.cols):
+        return right
+    elif right.rows == 1 and same_dim(left.cols, right.cols):
+        return left
+
+
+def compute_result(op, left, right):
+    if op in elementwise_ops:
+        if not left.is_matrix:
+            return None, NOT_MATRIX
+        elif right.is_numeric:
+            return left, None
+        elif not right.is_matrix:
+            return None, NOT_NUMERIC
+
+        result = broadcast(left, right)
+
+        return (result, None) if result else (None, DIMENSIONS)
+
+    if left.is_numeric and right.is_numeric:
+        return (INT if left is INT and right is INT else FLOAT), None
+    elif left.is_matrix and right.is_matrix:
+        if op == '*':
+            if same_dim(left.cols, right.rows):
+                return matrix(left.rows, right.cols), None
+            return None, DIMENSIONS
+
+        result = broadcast(left, right)
+
+        return (result, None) if result else (None, DIMENSIONS)
+    elif (left.is_matrix and right.is_numeric) or \
+            (right.is_matrix and left.is_numeric):
+        return None, MIXED
+
+    return None, INVALID
+
+
+# Memoized (result type, error kind) by (op, left type, right type)
+binary_results = {}
+
+
+def binary_result(op, left, right):
+    key = (op, left, right)
+
+    try:
+        return binary_results[key]
+    except KeyError:
+        result = compute_result(op, left, right)
+
+        if not left.symbolic and not right.symbolic:
+            binary_results[key] = result
+
+        return result
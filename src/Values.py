@@ -0,0 +1,218 @@
+#!/usr/bin/python
+
+import operator
+import numpy
+
+
+class MatrixValue(object):
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def copy(self):
+        return MatrixValue(self.data.copy())
+
+    def transpose(self):
+        return MatrixValue(self.data.T)
+
+    def index(self, indices):
+        # Indices are 1-based, a single index walks the matrix row by row.
+        # 0 and below would count from the end in numpy.
+        if any(i < 1 for i in indices):
+            raise IndexError("Invalid index")
+
+        if len(indices) == 1:
+            return numpy.unravel_index(indices[0] - 1, self.data.shape)
+
+        return tuple(i - 1 for i in indices)
+
+    def get(self, indices):
+        return self.data[self.index(indices)].item()
+
+    def set(self, indices, value):
+        self.data[self.index(indices)] = value
+
+    def __str__(self):
+        return '[' + '; '.join(', '.join(str(elem) for elem in row)
+                               for row in self.data.tolist()) + ']'
+
+    def __repr__(self):
+        return str(self)
+
+
+def unwrap(value):
+    return value.data if isinstance(value, MatrixValue) else value
+
+
+def wrap(value):
+    if value.__class__ in (int, float, bool):
+        return value
+    elif isinstance(value, numpy.ndarray):
+        return MatrixValue(value)
+    elif isinstance(value, numpy.generic):
+        return value.item()
+
+    return value
+
+
+def multiply(left, right):
+    if isinstance(left, numpy.ndarray) and isinstance(right, numpy.ndarray):
+        return numpy.matmul(left, right)
+
+    return left * right
+
+
+def divide(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        return left // right
+    elif isinstance(right, numpy.ndarray):
+        if isinstance(left, numpy.ndarray):
+            # Right division, left * inv(right)
+            return numpy.linalg.solve(right.T, left.T).T
+
+        return left * numpy.linalg.inv(right)
+
+    return left / right
+
+
+def compare(op):
+    def compare_values(left, right):
+        result = op(left, right)
+
+        if isinstance(result, numpy.ndarray):
+            return bool(result.all())
+
+        return result
+
+    return compare_values
+
+
+equal = compare(operator.eq)
+
+
+binary_operations = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': multiply,
+    '/': divide,
+    '.+': numpy.add,
+    '.-': numpy.subtract,
+    '.*': numpy.multiply,
+    './': numpy.divide,
+    '==': equal,
+    '!=': lambda left, right: not equal(left, right),
+    '<': compare(operator.lt),
+    '>': compare(operator.gt),
+    '<=': compare(operator.le),
+    '>=': compare(operator.ge),
+}
+
+
+def operation(op):
+    func = binary_operations[op]
+
+    def apply(left, right):
+        if left.__class__ is MatrixValue:
+            left = left.data
+        if right.__class__ is MatrixValue:
+            right = right.data
+
+        return wrap(func(left, right))
+
+    return apply
+
+
+operations = dict((op, operation(op)) for op in binary_operations)
+
+
+def binary_operation(op, left, right):
+    return operations[op](left, right)
+
+
+def fits(result, op, operand):
+    # Whether result op operand has the shape and element type of result
+    if isinstance(operand, numpy.ndarray):
+        try:
+            if numpy.broadcast_shapes(result.shape, operand.shape) != \
+                    result.shape:
+                return False
+        except ValueError:
+            return False
+
+        if operand.dtype.itemsize > 8:
+            return False
+
+        kind = operand.dtype.kind
+    elif operand.__class__ is int:
+        kind = 'i'
+    elif operand.__class__ is float:
+        kind = 'f'
+    else:
+        return False
+
+    if result.dtype == numpy.float64:
+        return kind in 'biuf'
+
+    # int ./ int is a float
+    return result.dtype == numpy.int64 and kind in 'bi' and op != './'
+
+
+def in_place(op, left, right):
+    # Element-wise left op right, written into left when it fits. left must
+    # be a fresh matrix that nothing else refers to.
+    func = binary_operations[op]
+
+    if right.__class__ is MatrixValue:
+        right = right.data
+
+    if left.__class__ is MatrixValue and fits(left.data, op, right):
+        func(left.data, right, out=left.data)
+
+        return left
+
+    return operations[op](left, right)
+
+
+def negate(value):
+    if isinstance(value, MatrixValue):
+        return MatrixValue(numpy.negative(value.data))
+
+    return -value
+
+
+def for_range(start, end):
+    # range() takes bools as ints, but not floats or strings
+    if not isinstance(start, int) or not isinstance(end, int):
+        raise TypeError("Range bounds must be integers")
+
+    return range(start, end + 1)
+
+
+def transpose(value):
+    if isinstance(value, MatrixValue):
+        return value.transpose()
+
+    return value
+
+
+def matrix(rows):
+    return MatrixValue(numpy.array(rows))
+
+
+def dimensions(values):
+    if len(values) == 1:
+        return values[0], values[0]
+
+    return tuple(values)
+
+
+matrix_operations = {
+    'zeros': lambda values: MatrixValue(numpy.zeros(dimensions(values))),
+    'ones': lambda values: MatrixValue(numpy.ones(dimensions(values))),
+    'eye': lambda values: MatrixValue(numpy.eye(*dimensions(values))),
+}
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import contextlib
+import glob
+import io
+import multiprocessing
+import os
+import sys
+from Mparser import Mparser
+from ParseCache import ParseCache
+from TypeChecker import TypeChecker
+
+
+# One parser per worker process, built by init_worker
+parser = None
+cache = None
+
+
+def collect_files(patterns, extension='.m'):
+    files = set()
+
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, names in os.walk(pattern):
+                for name in names:
+                    if name.endswith(extension):
+                        files.add(os.path.join(root, name))
+        elif glob.has_magic(pattern):
+            files.update(path for path in glob.glob(pattern, recursive=True)
+                         if os.path.isfile(path))
+        else:
+            files.add(pattern)
+
+    return sorted(files)
+
+
+def init_worker(use_cache=True, fast_lexer=False):
+    global parser, cache
+
+    parser = Mparser(fast_lexer=fast_lexer)
+    cache = ParseCache(parser) if use_cache else None
+
+
+def check_file(filename):
+    if parser is None:
+        init_worker()
+
+    try:
+        with open(filename, "r") as file:
+            text = file.read()
+    except IOError:
+        return filename, ["Cannot open {0} file".format(filename)]
+
+    # TypeChecker reports through print(), collect it per file
+    output = io.StringIO()
+
+    try:
+        with contextlib.redirect_stdout(output):
+            ast = (cache or parser).parse(text)
+
+            for error in parser.errors:
+                print(error)
+
+            if ast is not None:
+                TypeChecker().visit(ast)
+    except Exception as error:
+        output.write("{0}\n".format(str(error) or "Syntax error"))
+
+    return filename, output.getvalue().splitlines()
+
+
+def check_files(filenames, jobs=None, chunksize=16, use_cache=True,
+                fast_lexer=False):
+    if jobs == 1 or len(filenames) <= 1:
+        init_worker(use_cache, fast_lexer)
+
+        for filename in filenames:
+            yield check_file(filename)
+        return
+
+    with multiprocessing.Pool(jobs, initializer=init_worker,
+                              initargs=(use_cache, fast_lexer)) as pool:
+        # imap keeps the input order, so the report is deterministic
+        for result in pool.imap(check_file, filenames, chunksize):
+            yield result
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        description="Parse and type check many files in parallel")
+    arg_parser.add_argument('paths', nargs='+',
+                            help="files, directories or glob patterns")
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help="worker processes (default: CPU count)")
+    arg_parser.add_argument('--no-cache', dest='cache', action='store_false',
+                            help="always parse, do not use the parse cache")
+    arg_parser.add_argument('--fast-lexer', action='store_true',
+                            help="scan with FastScanner instead of PLY's lexer")
+    args = arg_parser.parse_args(argv)
+
+    filenames = collect_files(args.paths)
+    failed = 0
+
+    for filename, diagnostics in check_files(filenames, args.jobs,
+                                             use_cache=args.cache,
+                                             fast_lexer=args.fast_lexer):
+        if diagnostics:
+            failed += 1
+
+        for line in diagnostics:
+            print("{0}: {1}".format(filename, line))
+
+    print("Checked {0} files, {1} with diagnostics".format(
+        len(filenames), failed), file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
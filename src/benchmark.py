@@ -0,0 +1,885 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import contextlib
+import gc
+import glob
+import io
+import os
+import pickle
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import AST
+import CodeGenerator
+import Values
+from Bytecode import BytecodeCompiler
+from client import Client
+from Compiler import Compiler
+from Exceptions import RuntimeException
+from Incremental import Document
+from Interpreter import Interpreter
+from Mparser import Mparser
+from Optimizer import Optimizer
+from ParseCache import ParseCache, dumps, loads
+from scanner import Scanner, FastScanner
+from SSA import compile_program
+from Stream import source_lines, parse_statements, check_statements
+from TreePrinter import tree_lines, write_tree
+from TokenStream import TokenCache, scan
+from TypeChecker import TypeChecker
+
+
+src_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_parser():
+    return Mparser().parse
+
+
+def statements_program(n):
+    lines = []
+
+    for i in range(n):
+        lines.append("x{0} = {1} + {0} * 2;".format(i % 100, i))
+
+    return "\n".join(lines) + "\n"
+
+
+def matrix_program(n):
+    rows = []
+
+    for i in range(n):
+        rows.append(", ".join(str(i + j) for j in range(n)))
+
+    return "A = [" + ";\n".join(rows) + "];\n"
+
+
+def timed(func, *args):
+    # Like timeit, keep the cyclic collector out of the measurement
+    gc.collect()
+    gc.disable()
+
+    try:
+        start = time.perf_counter()
+        func(*args)
+
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def report(title, sizes, make_program, unit, parse):
+    print(title)
+    previous = None
+
+    for size in sizes:
+        text = make_program(size)
+        elapsed = timed(parse, text)
+        count = size if unit == 'statements' else size * size
+        line = "  {0:>8} {1:<10} {2:8.3f} s  {3:8.2f} us/{4}".format(
+            count, unit, elapsed, elapsed / count * 1e6, unit[:-1])
+
+        if previous:
+            line += "  x{0:.2f} time for x{1:.2f} input".format(
+                elapsed / previous[1], count / previous[0])
+
+        print(line)
+        previous = (count, elapsed)
+
+
+def bench_parse(args):
+    parse = make_parser()
+    scale = int(args[0]) if args else 1
+
+    report("Parse time by statement count", [s * scale for s in
+           (2500, 5000, 10000, 20000, 40000)],
+           statements_program, 'statements', parse)
+    report("Parse time by matrix literal size", [s * scale for s in
+           (50, 100, 200, 400)],
+           matrix_program, 'elements', parse)
+
+
+def process_time(code, cwd, runs):
+    total = 0.0
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, '-c', code], cwd=cwd,
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+        total += time.perf_counter() - start
+
+    return total / runs
+
+
+def bench_startup(args):
+    runs = int(args[0]) if args else 10
+    code = "from Mparser import Mparser; Mparser(freeze={0}).parse('x = 1;')"
+
+    interpreter = process_time("import ply.yacc", src_dir, runs)
+    warm = process_time(code.format(False), src_dir, runs)
+
+    # Cold start: no tables on disk, they are generated and written out
+    cold = 0.0
+
+    for _ in range(runs):
+        tmp_dir = tempfile.mkdtemp()
+
+        try:
+            for name in ('AST.py', 'Mparser.py', 'scanner.py'):
+                shutil.copy(os.path.join(src_dir, name), tmp_dir)
+            cold += process_time(code.format(True), tmp_dir, 1)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    cold /= runs
+
+    print("Process startup, mean of {0} runs".format(runs))
+    print("  python + ply import  {0:8.1f} ms".format(interpreter * 1e3))
+    print("  cold (build tables)  {0:8.1f} ms".format(cold * 1e3))
+    print("  warm (frozen tables) {0:8.1f} ms".format(warm * 1e3))
+    print("  parser setup: cold {0:.1f} ms, warm {1:.1f} ms".format(
+        (cold - interpreter) * 1e3, (warm - interpreter) * 1e3))
+
+
+def bench_server(args):
+    runs = int(args[0]) if args else 10
+    filename = os.path.join(src_dir, 'Examples', 'example3.m')
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, 'server.sock')
+    server = subprocess.Popen([sys.executable, 'Server.py', '--socket', path],
+                              cwd=src_dir)
+
+    try:
+        while not os.path.exists(path) and server.poll() is None:
+            time.sleep(0.01)
+
+        client = Client(path)
+        first = timed(lambda: client.request('check', file=filename))
+        warm = min(timed(lambda: client.request('check', file=filename))
+                   for _ in range(runs))
+        client.request('shutdown')
+        client.close()
+    finally:
+        server.wait(10)
+        shutil.rmtree(tmp_dir)
+
+    process = process_time("import batch; batch.main([{0!r}])".format(
+        filename), src_dir, runs)
+
+    print("Checking {0}".format(os.path.basename(filename)))
+    print("  new process          {0:8.1f} ms".format(process * 1e3))
+    print("  server, first check  {0:8.1f} ms".format(first * 1e3))
+    print("  server, unchanged    {0:8.1f} ms".format(warm * 1e3))
+
+
+def fuzz_text(n, seed=0):
+    rand = random.Random(seed)
+    alphabet = '"""\\\\ ab1.+;\n#'
+
+    return ''.join(rand.choice(alphabet) for _ in range(n))
+
+
+lexer_cases = [
+    ("long unterminated string", lambda n: '"' + 'a' * n),
+    ("unterminated, escaped quotes", lambda n: '"' + '\\"' * (n // 2)),
+    ("many strings per line", lambda n: '"a" ' * (n // 4)),
+    ("quote runs", lambda n: '"' * n),
+    ("quote soup", lambda n: '"x' * (n // 2)),
+    ("unterminated on every line", lambda n: '"abc\n' * (n // 5)),
+    ("random fuzz", fuzz_text),
+]
+
+
+def lex_all(scanner, text):
+    scanner.input(text)
+
+    while scanner.token():
+        pass
+
+
+def bench_lexer(args):
+    # Every case must stay within the time bound and scale linearly
+    bound = float(args[0]) if args else 2.0
+    sizes = (20000, 40000, 80000, 160000)
+    scanner = Scanner()
+    scanner.build()
+    failures = 0
+
+    for title, make_text in lexer_cases:
+        times = [min(timed(quiet, lex_all, scanner, make_text(n))
+                     for _ in range(3))
+                 for n in sizes]
+        # Time per character at the largest size relative to the smallest,
+        # a quadratic lexer would show x8 here
+        growth = (times[-1] / sizes[-1]) / (max(times[0], 1e-6) / sizes[0])
+        ok = times[-1] < bound and growth < 3.0
+
+        print("  {0:<30} {1:8.3f} s at {2} chars, x{3:.2f} time per char"
+              "  {4}".format(title, times[-1], sizes[-1], growth,
+                             'ok' if ok else 'FAIL'))
+
+        if not ok:
+            failures += 1
+
+    if failures:
+        sys.exit(1)
+
+
+def scan_result(scanner, text):
+    # All a parser or a caller can see of a scan
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        scanner.input(text)
+        tokens = [(token.type, token.value, token.lineno, token.lexpos,
+                   token.column) for token in iter(scanner.token, None)]
+
+    return tokens, output.getvalue(), scanner.errors, scanner.lexer.lineno
+
+
+def bench_fastlexer(args):
+    # FastScanner must scan the examples and fuzzed text exactly like
+    # Scanner, messages and line numbers included, before it is timed
+    fuzz_count = int(args[0]) if args else 2000
+    size = int(args[1]) if len(args) > 1 else 20000
+    rand = random.Random(0)
+    alphabet = 'ab_1209.e+-*/=!<>()[]{},;:\'"\\ \t\n\r#$x\u00e9'
+    texts = []
+
+    for filename in sorted(glob.glob(os.path.join(src_dir, 'Examples', '*.m'))
+                           + glob.glob(os.path.join(src_dir, 'Benchmarks',
+                                                    '*.m'))):
+        with open(filename, "r") as file:
+            texts.append(file.read())
+
+    texts += [make_text(200) for title, make_text in lexer_cases]
+    texts += [''.join(rand.choice(alphabet)
+                      for _ in range(rand.randrange(100)))
+              for _ in range(fuzz_count)]
+
+    scanners = []
+
+    for cls in (Scanner, FastScanner):
+        scanner = cls()
+        scanner.build()
+        scanners.append(scanner)
+
+    different = sum(scan_result(scanners[0], text) !=
+                    scan_result(scanners[1], text) for text in texts)
+    print("{0} texts, {1} scanned differently".format(len(texts), different))
+
+    text = "".join(script_lines(size))
+    print("{0} lines of statements".format(size))
+
+    for scanner in scanners:
+        parser = Mparser(fast_lexer=scanner.__class__ is FastScanner)
+        lexing = min(timed(lex_all, scanner, text) for _ in range(3))
+        parsing = min(timed(quiet, parser.parse, text) for _ in range(3))
+        print("  {0:<12} lex {1:8.3f} s  parse {2:8.3f} s".format(
+            scanner.__class__.__name__, lexing, parsing))
+
+    if different:
+        sys.exit(1)
+
+
+def bench_tokens(args):
+    # Tokens per second for tools that need no tree: scanning with either
+    # scanner, loading from the token cache, and parsing for comparison
+    size = int(args[0]) if args else 20000
+    text = "".join(script_lines(size))
+    runs = 3
+    scanner = Scanner()
+    scanner.build()
+    count = len(scan(text))
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TokenCache(directory=directory)
+        cache.scan(text)
+        parser = Mparser(fast_lexer=True)
+        cases = (('Scanner', lambda: scan(text, scanner)),
+                 ('FastScanner', lambda: scan(text)),
+                 ('token cache', lambda: cache.scan(text)),
+                 ('full parse', lambda: quiet(parser.parse, text)))
+
+        print("{0} tokens in {1} lines".format(count, size))
+
+        for name, run in cases:
+            elapsed = min(timed(run) for _ in range(runs))
+            print("  {0:<12} {1:8.3f} s  {2:12.0f} tokens/s".format(
+                name, elapsed, count / elapsed))
+
+
+def run_interpreter(ast):
+    try:
+        Interpreter().run(ast)
+    except RuntimeException:
+        pass
+
+
+def run_compiled(ast):
+    try:
+        Compiler().compile(ast).run()
+    except RuntimeException:
+        pass
+
+
+def run_bytecode(ast):
+    try:
+        BytecodeCompiler().compile(ast).run()
+    except RuntimeException:
+        pass
+
+
+def run_ssa(ast):
+    try:
+        compile_program(ast).run()
+    except RuntimeException:
+        pass
+
+
+engines = [
+    ('tree-walking', run_interpreter),
+    ('closures', run_compiled),
+    ('bytecode', run_bytecode),
+    ('ssa', run_ssa),
+]
+
+
+def quiet(func, *args):
+    with open(os.devnull, 'w') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            return func(*args)
+
+
+def bench_interpreter(args):
+    runs = 3
+    programs = args or sorted(glob.glob(os.path.join(src_dir, 'Benchmarks',
+                                                     '*.m'))) + \
+        [os.path.join(src_dir, 'Examples', 'example3.m')]
+    parse = make_parser()
+
+    for filename in programs:
+        with open(filename) as file:
+            ast = parse(file.read())
+
+        print(os.path.basename(filename))
+
+        for name, run in engines:
+            elapsed = min(timed(quiet, run, ast) for _ in range(runs))
+            print("  {0:<14} {1:8.3f} s".format(name, elapsed))
+
+
+def program_output(run, ast):
+    # What a run prints, then its result or its runtime error
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        try:
+            result = run(ast)
+        except RuntimeException as error:
+            result = error
+
+    return output.getvalue() + str(result)
+
+
+def bench_bytecode(args):
+    # The bytecode VM against the other engines on the example programs:
+    # same output, then the time of each, compiling included
+    runs = 3
+    programs = args or sorted(glob.glob(os.path.join(src_dir, 'Examples',
+                                                     '*.m'))) + \
+        sorted(glob.glob(os.path.join(src_dir, 'Benchmarks', '*.m')))
+    parse = make_parser()
+    outputs = [
+        lambda ast: Interpreter().run(ast),
+        lambda ast: Compiler().compile(ast).run(),
+        lambda ast: BytecodeCompiler().compile(ast).run(),
+    ]
+    failures = 0
+
+    for filename in programs:
+        with open(filename) as file:
+            ast = quiet(parse, file.read())
+
+        if ast is None:
+            continue
+
+        expected, *others = [program_output(run, ast) for run in outputs]
+        same = all(output == expected for output in others)
+        code = BytecodeCompiler().compile(ast)
+        print("{0}  {1} instructions  {2}".format(
+            os.path.basename(filename), len(code), 'ok' if same else 'FAIL'))
+
+        if not same:
+            failures += 1
+
+        for name, run in engines:
+            elapsed = min(timed(quiet, run, ast) for _ in range(runs))
+            print("  {0:<14} {1:8.1f} ms".format(name, elapsed * 1e3))
+
+    if failures:
+        sys.exit(1)
+
+
+def wasteful_program(n, iterations):
+    # Allocations and products that do not change in the loop, a product
+    # computed twice and a value never used
+    return "\n".join([
+        "A = ones({0}, {0});".format(n),
+        "B = eye({0});".format(n),
+        "v = ones({0}, 1);".format(n),
+        "s = 0;",
+        "for i = 1:{0} {{".format(iterations),
+        "    Z = zeros({0});".format(n),
+        "    W = eye({0}) .* 2;".format(n),
+        "    x = A * B * v;",
+        "    y = A * B * v;",
+        "    unused = A * B';",
+        "    s += x[1] + y[2] + Z[1, 1] + W[2, 2] + i;",
+        "}",
+        "print s;",
+    ]) + "\n"
+
+
+def bench_ssa(args):
+    # The SSA engine with and without its passes, against the others, and
+    # the same output on the example programs
+    size = int(args[0]) if args else 200
+    iterations = int(args[1]) if len(args) > 1 else 50
+    runs = 3
+    parse = make_parser()
+    failures = 0
+
+    for filename in sorted(glob.glob(os.path.join(src_dir, 'Examples',
+                                                  '*.m'))) + \
+            sorted(glob.glob(os.path.join(src_dir, 'Benchmarks', '*.m'))):
+        with open(filename) as file:
+            ast = quiet(parse, file.read())
+
+        if ast is not None and program_output(
+                lambda ast: Compiler().compile(ast).run(), ast) != \
+                program_output(lambda ast: compile_program(ast).run(), ast):
+            print("{0}  FAIL".format(os.path.basename(filename)))
+            failures += 1
+
+    ast = parse(wasteful_program(size, iterations))
+    cases = engines + [
+        ('ssa, no passes',
+         lambda ast: compile_program(ast, optimize=False).run()),
+    ]
+    print("{0}x{0} matrices, {1} iterations".format(size, iterations))
+
+    for name, run in cases:
+        elapsed = min(timed(quiet, run, ast) for _ in range(runs))
+        print("  {0:<14} {1:8.3f} s".format(name, elapsed))
+
+    if failures:
+        sys.exit(1)
+
+
+def run_output(run):
+    # What a run prints, then its result, with numpy arrays as matrices.
+    # Only raising an error is compared: the generated code words index,
+    # division and range errors as the engines do, not the others.
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        try:
+            result = run()
+        except Exception:
+            return output.getvalue() + 'error'
+
+    if isinstance(result, list):
+        return output.getvalue() + str([Values.wrap(value)
+                                        for value in result])
+
+    return output.getvalue() + str(Values.wrap(result))
+
+
+def bench_codegen(args):
+    # Generated modules against the engines on the example programs: the
+    # same output, then the time of run() in a module already imported
+    runs = 3
+    programs = args or sorted(glob.glob(os.path.join(src_dir, 'Examples',
+                                                     '*.m'))) + \
+        sorted(glob.glob(os.path.join(src_dir, 'Benchmarks', '*.m')))
+    parse = make_parser()
+    failures = 0
+
+    for filename in programs:
+        with open(filename) as file:
+            ast = quiet(parse, file.read())
+
+        if ast is None:
+            continue
+
+        generator = CodeGenerator.CodeGenerator()
+        module = CodeGenerator.load(generator.generate(ast))
+        same = run_output(module.run) == \
+            run_output(lambda: Interpreter().run(ast))
+        print("{0}  {1} loops vectorized  {2}".format(
+            os.path.basename(filename), generator.vectorized,
+            'ok' if same else 'FAIL'))
+
+        if not same:
+            failures += 1
+
+        for name, run in engines + [('generated',
+                                     lambda ast: run_output(module.run))]:
+            elapsed = min(timed(quiet, run, ast) for _ in range(runs))
+            print("  {0:<14} {1:8.1f} ms".format(name, elapsed * 1e3))
+
+    if failures:
+        sys.exit(1)
+
+
+def foldable_program(n):
+    # The shapes of generated code: constants, identities, A'' and zeros
+    lines = ["x = 3;", "A = [1, 2, 3; 4, 5, 6];",
+             "for i = 1:{0} {{".format(n)]
+
+    for i in range(5):
+        lines.append("    y = 2 * 3 + x * 1 - {0} / 2;".format(i))
+        lines.append("    z = -(-x) * 1 + 0 * 4;")
+        lines.append("    B = A'' + zeros(2, 3);")
+
+    lines.append("}")
+
+    return "\n".join(lines) + "\n"
+
+
+def bench_optimize(args):
+    iterations = int(args[0]) if args else 20000
+    runs = 3
+    parse = make_parser()
+    text = foldable_program(iterations)
+    optimized = parse(text)
+    elapsed = timed(Optimizer().optimize, optimized)
+
+    print("{0} loop iterations, optimizer {1:.1f} ms".format(
+        iterations, elapsed * 1e3))
+
+    for name, run in engines:
+        before = min(timed(quiet, run, parse(text)) for _ in range(runs))
+        after = min(timed(quiet, run, optimized) for _ in range(runs))
+        print("  {0:<14} {1:8.3f} s  optimized {2:8.3f} s  x{3:.2f}".format(
+            name, before, after, before / after))
+
+
+def chain_program(n, iterations):
+    return "\n".join([
+        "A = ones({0}, {0});".format(n),
+        "B = eye({0});".format(n),
+        "C = ones({0}, {0}) ./ {0};".format(n),
+        "v = ones({0}, 1);".format(n),
+        "for i = 1:{0} {{".format(iterations),
+        "    x = A * B * C * v;",
+        "    D = A .+ B .- C .+ A .* 2.5 .- B;",
+        "}",
+    ]) + "\n"
+
+
+def bench_chain(args):
+    size = int(args[0]) if args else 300
+    iterations = int(args[1]) if len(args) > 1 else 20
+    runs = 3
+    parse = make_parser()
+    text = chain_program(size, iterations)
+    optimized = Optimizer().optimize(parse(text))
+
+    print("{0}x{0} matrices, {1} iterations of A * B * C * v and a "
+          "4 op element-wise chain".format(size, iterations))
+
+    for name, run in engines:
+        before = min(timed(quiet, run, parse(text)) for _ in range(runs))
+        after = min(timed(quiet, run, optimized) for _ in range(runs))
+        print("  {0:<14} {1:8.3f} s  optimized {2:8.3f} s  x{3:.2f}".format(
+            name, before, after, before / after))
+
+
+class CountingTypeChecker(TypeChecker):
+    visits = 0
+
+    def visit(self, node):
+        self.visits += 1
+
+        return super().visit(node)
+
+
+class GetattrTypeChecker(TypeChecker):
+    # Dispatch as it was before the per-class cache
+    def visit(self, node):
+        method = 'visit_' + node.__class__.__name__
+        visitor = getattr(self, method, self.generic_visit)
+
+        return visitor(node)
+
+
+def checked_program(n):
+    lines = ["a = 1;", "b = 2.5;", "M = [1, 2; 3, 4];"]
+
+    for i in range(n):
+        lines.append("for i = 1:{0} {{ a = a + i * 2 - 1; b = b / a; }}"
+                     .format(i % 10 + 1))
+        lines.append("if (a > b) M = M' + [5, 6; 7, 8];")
+
+    return "\n".join(lines) + "\n"
+
+
+def bench_visitor(args):
+    runs = 5
+    size = int(args[0]) if args else 5000
+    ast = make_parser()(checked_program(size))
+
+    counter = CountingTypeChecker()
+    quiet(counter.visit, ast)
+
+    print("Type checking {0} node visits".format(counter.visits))
+
+    for name, checker in (('getattr', GetattrTypeChecker),
+                          ('cached', TypeChecker)):
+        elapsed = min(timed(quiet, checker().visit, ast) for _ in range(runs))
+        print("  {0:<8} {1:8.3f} s  {2:10.0f} nodes/s".format(
+            name, elapsed, counter.visits / elapsed))
+
+
+def build_statements(count):
+    # Five nodes per statement: x = 1 + y * 2.5
+    statements = []
+
+    for i in range(count):
+        value = AST.BinExpr('+', AST.IntNum(i, i, 5),
+                            AST.BinExpr('*', AST.Variable('y', None, i, 9),
+                                        AST.FloatNum(2.5, i, 13), i, 11),
+                            i, 7)
+        statements.append(AST.Assign(AST.Variable('x', None, i, 1), '=',
+                                     value, i, 3))
+
+    return statements
+
+
+def walk(node):
+    count = 1
+
+    for field in node._fields:
+        child = getattr(node, field)
+
+        if isinstance(child, AST.Node):
+            count += walk(child)
+
+    return count
+
+
+def bench_ast(args):
+    nodes = int(args[0]) if args else 1000000
+    count = nodes // 5
+
+    elapsed = timed(build_statements, count)
+    tracemalloc.start()
+    statements = build_statements(count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print("{0} AST nodes".format(count * 5))
+    print("  memory  {0:8.1f} MB, {1:.0f} bytes per node".format(
+        size / 2 ** 20, size / (count * 5)))
+    print("  build   {0:8.3f} s".format(elapsed))
+    print("  walk    {0:8.3f} s".format(
+        timed(lambda: [walk(statement) for statement in statements])))
+
+
+def script_lines(n):
+    # Mixed scalar, matrix and loop statements with a few errors in them
+    lines = ["a = 1;", "M = zeros(3, 3);"]
+
+    for i in range(n // 4):
+        lines.append("x{0} = a + {0};".format(i % 50))
+        lines.append("for i = 1:{0} {{".format(i % 7 + 1))
+        lines.append("    M = M + ones(3, 3) * {0};".format(i % 3))
+        lines.append("}")
+
+    return [line + "\n" for line in lines]
+
+
+def full_check(parse, text):
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        TypeChecker().visit(parse(text))
+
+    return output.getvalue().splitlines()
+
+
+def bench_cache(args):
+    size = int(args[0]) if args else 20000
+    text = "".join(script_lines(size))
+    parser = Mparser()
+    tmp_dir = tempfile.mkdtemp()
+
+    try:
+        cache = ParseCache(parser, tmp_dir)
+        parse = timed(parser.parse, text)
+        miss = timed(cache.parse, text)
+        hit = min(timed(cache.parse, text) for _ in range(3))
+        ast = cache.parse(text)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    data = dumps(ast)
+    pickled = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+    same = list(tree_lines(loads(data))) == list(tree_lines(parser.parse(text)))
+
+    print("{0} lines, {1} bytes of source".format(text.count("\n"), len(text)))
+    print("  parse           {0:8.1f} ms".format(parse * 1e3))
+    print("  parse and store {0:8.1f} ms".format(miss * 1e3))
+    print("  cache hit       {0:8.1f} ms  x{1:.1f} faster".format(
+        hit * 1e3, parse / hit))
+    print("  pickle.loads    {0:8.1f} ms".format(
+        timed(pickle.loads, pickled) * 1e3))
+    print("  size {0} bytes, pickle {1} bytes  {2}".format(
+        len(data), len(pickled), 'ok' if same else 'FAIL'))
+
+    if not same:
+        sys.exit(1)
+
+
+def bench_incremental(args):
+    size = int(args[0]) if args else 5000
+    lines = script_lines(size)
+    parse = make_parser()
+    random.seed(0)
+
+    full = timed(full_check, parse, "".join(lines))
+    document = Document("".join(lines))
+    print("{0} lines, full parse and check {1:8.1f} ms".format(
+        len(lines), full * 1e3))
+
+    edits = [
+        ('change a constant', lambda k: "x{0} = a + {1};\n".format(k, k + 1)),
+        ('introduce an error', lambda k: "x{0} = a + M;\n".format(k)),
+        ('retype a variable', lambda k: "a = 2.5;\n"),
+    ]
+    failures = 0
+
+    for name, make_line in edits:
+        times = []
+
+        for _ in range(20):
+            k = random.randrange(2, len(lines) - 4, 4)
+            lines[k] = make_line(k)
+            text = "".join(lines)
+            times.append(timed(lambda: document.update(text) or
+                               document.diagnostics()))
+
+        ok = document.diagnostics() == full_check(parse, text)
+        print("  {0:<20} {1:8.1f} ms per edit  {2}".format(
+            name, sorted(times)[len(times) // 2] * 1e3,
+            'ok' if ok else 'FAIL'))
+
+        if not ok:
+            failures += 1
+
+    if failures:
+        sys.exit(1)
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+
+    try:
+        func(*args)
+
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_stream(args):
+    size = int(args[0]) if args else 40000
+    parser = Mparser()
+
+    # Diagnostics are discarded, collecting them would grow with the file
+    def whole(filename):
+        with open(filename, "r") as file, open(os.devnull, "w") as null, \
+                contextlib.redirect_stdout(null):
+            TypeChecker().visit(parser.parse(file.read()))
+
+    def streamed(filename):
+        with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+            check_statements(parse_statements(source_lines(filename), parser))
+
+    with tempfile.NamedTemporaryFile('w', suffix='.m') as file:
+        file.writelines(script_lines(size))
+        file.flush()
+        print("Checking {0} lines, {1:.1f} MB".format(
+            size, os.path.getsize(file.name) / 2 ** 20))
+
+        for name, check in (('whole file', whole), ('streamed', streamed)):
+            elapsed = timed(check, file.name)
+            peak = peak_memory(check, file.name)
+            print("  {0:<12} {1:8.3f} s  peak {2:8.1f} MB".format(
+                name, elapsed, peak / 2 ** 20))
+
+
+def print_per_line(node):
+    # Two print() calls per line, as the printer did before write_tree
+    for line in tree_lines(node):
+        print('', end='')
+        print(line)
+
+
+def bench_tree(args):
+    nodes = int(args[0]) if args else 500000
+    program = AST.Program(AST.InstructionsOpt(build_statements(nodes // 5)))
+    runs = 3
+
+    print("Printing {0} AST nodes to a file".format(nodes))
+
+    with tempfile.TemporaryFile('w') as file:
+        def per_line():
+            with contextlib.redirect_stdout(file):
+                print_per_line(program)
+
+        for name, write in (('print per line', per_line),
+                            ('write_tree', lambda: write_tree(program, file)),
+                            ('max_lines=1000', lambda: write_tree(
+                                program, file, max_lines=1000))):
+            elapsed = min(timed(write) for _ in range(runs))
+            print("  {0:<16} {1:8.3f} s".format(name, elapsed))
+
+
+benchmarks = {
+    'ast': bench_ast,
+    'bytecode': bench_bytecode,
+    'cache': bench_cache,
+    'chain': bench_chain,
+    'codegen': bench_codegen,
+    'fastlexer': bench_fastlexer,
+    'incremental': bench_incremental,
+    'interpreter': bench_interpreter,
+    'lexer': bench_lexer,
+    'optimize': bench_optimize,
+    'parse': bench_parse,
+    'server': bench_server,
+    'ssa': bench_ssa,
+    'startup': bench_startup,
+    'stream': bench_stream,
+    'tokens': bench_tokens,
+    'tree': bench_tree,
+    'visitor': bench_visitor,
+}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in benchmarks:
+        print("Usage: {0} {1} [args]".format(
+            sys.argv[0], '|'.join(sorted(benchmarks))))
+        sys.exit(1)
+
+    benchmarks[sys.argv[1]](sys.argv[2:])
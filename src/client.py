@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+# Only the standard library here, the server holds the parser
+def default_socket():
+    return os.path.join(tempfile.gettempdir(),
+                        'mparser-{0}.sock'.format(os.getuid()))
+
+
+class Client(object):
+    def __init__(self, path=None):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path or default_socket())
+        self.file = self.socket.makefile('rw', encoding='utf-8')
+        self.last_id = 0
+
+    def request(self, method, **params):
+        self.last_id += 1
+        params['id'] = self.last_id
+        params['method'] = method
+
+        self.file.write(json.dumps(params) + "\n")
+        self.file.flush()
+
+        response = json.loads(self.file.readline())
+
+        if 'error' in response:
+            raise Exception(response['error'])
+
+        return response['result']
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        description="Send requests to a running Server.py --socket")
+    arg_parser.add_argument('method', choices=('check', 'parse', 'print'))
+    arg_parser.add_argument('files', nargs='+')
+    arg_parser.add_argument('--socket', default=default_socket(),
+                            help="server socket (default: %(default)s)")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        client = Client(args.socket)
+    except OSError:
+        if args.method != 'check':
+            print("No server at {0}".format(args.socket), file=sys.stderr)
+            return 2
+
+        # Without a server, check in this process
+        import batch
+
+        return batch.main(args.files)
+
+    failed = 0
+
+    for filename in args.files:
+        try:
+            result = client.request(args.method,
+                                    file=os.path.abspath(filename))
+        except Exception as error:
+            print("{0}: {1}".format(filename, error))
+            failed += 1
+            continue
+
+        if args.method == 'print':
+            print(result['tree'], end='')
+            continue
+
+        if result['diagnostics']:
+            failed += 1
+
+        for line in result['diagnostics']:
+            print("{0}: {1}".format(filename, line))
+
+    client.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,11 @@
 
+import os
 import sys
-import ply.yacc as yacc
 from Mparser import Mparser
-from TreePrinter import TreePrinter
+from ParseCache import ParseCache
+from Stream import stream_size, source_lines, parse_statements, \
+    print_statements
+from TreePrinter import TreePrinter, write_tree
 
 
 if __name__ == '__main__':
@@ -14,8 +17,19 @@ if __name__ == '__main__':
         print("Cannot open {0} file".format(filename))
         sys.exit(0)
 
-    Mparser = Mparser()
-    parser = yacc.yacc(module=Mparser)
+    parser = Mparser()
+
+    if os.path.getsize(filename) >= stream_size:
+        # One statement in memory at a time
+        file.close()
+        print_statements(parse_statements(source_lines(filename), parser))
+        sys.exit(0)
+
     text = file.read()
-    ast = parser.parse(text, lexer=Mparser.scanner)
-    ast.printTree()
+    ast = ParseCache(parser).parse(text)
+
+    for error in parser.errors:
+        print(error)
+
+    if ast is not None:
+        write_tree(ast, sys.stdout)
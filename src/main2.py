@@ -1,7 +1,10 @@
 
+import os
 import sys
-import ply.yacc as yacc
 from Mparser import Mparser
+from ParseCache import ParseCache
+from Stream import stream_size, source_lines, parse_statements, \
+    check_statements
 from TreePrinter import TreePrinter
 from TypeChecker import TypeChecker
 
@@ -14,11 +17,23 @@ if __name__ == '__main__':
         print("Cannot open {0} file".format(filename))
         sys.exit(0)
 
-    Mparser = Mparser()
-    parser = yacc.yacc(module=Mparser)
+    parser = Mparser()
+
+    if os.path.getsize(filename) >= stream_size:
+        # One statement in memory at a time
+        file.close()
+        check_statements(parse_statements(source_lines(filename), parser))
+        sys.exit(0)
+
     text = file.read()
 
-    ast = parser.parse(text, lexer=Mparser.scanner)
+    ast = ParseCache(parser).parse(text)
+
+    for error in parser.errors:
+        print(error)
+
     typeChecker = TypeChecker()   
-    typeChecker.visit(ast)   # or alternatively ast.accept(typeChecker)
+
+    if ast is not None:
+        typeChecker.visit(ast)   # or alternatively ast.accept(typeChecker)
     
@@ -0,0 +1,31 @@
+
+import sys
+from Exceptions import RuntimeException
+from Interpreter import Interpreter
+from Mparser import Mparser
+from Optimizer import Optimizer
+
+
+if __name__ == '__main__':
+    try:
+        filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+        file = open(filename, "r")
+    except IOError:
+        print("Cannot open {0} file".format(filename))
+        sys.exit(0)
+
+    parser = Mparser()
+    text = file.read()
+
+    ast = parser.parse(text)
+
+    if parser.errors:
+        for error in parser.errors:
+            print(error)
+        sys.exit(1)
+
+    try:
+        Interpreter().run(Optimizer().optimize(ast))
+    except RuntimeException as error:
+        print(error)
+        sys.exit(1)
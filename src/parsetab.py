@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'left,right=ADDASSIGNSUBASSIGNMULASSIGNDIVASSIGNleftEQNEQleft<>LEQGEQleft+-DOTADDDOTSUBleft*/DOTMULDOTDIVrightUMINUSnonassocIFnonassocELSEADDASSIGN BREAK CONTINUE DIVASSIGN DOTADD DOTDIV DOTMUL DOTSUB ELSE EQ EYE FLOAT FOR GEQ ID IF INTNUM LEQ MULASSIGN NEQ ONES PRINT RETURN STRING SUBASSIGN WHILE ZEROSprogram : instructions_optinstructions_opt : instructions instructions_opt : instructions : instructions instruction instructions : instruction instruction : inst \';\'\n                       | condition \n                       | expr \';\' \n                       | inst \',\'\n                       | expr \',\' inst : ids \'=\' expr\n                | ids ADDASSIGN expr\n                | ids SUBASSIGN expr\n                | ids MULASSIGN expr\n                | ids DIVASSIGN expr ids : ID\n               | ID \'[\' values \']\' inst : BREAK inst : CONTINUE inst : RETURN\n                | RETURN values \n                | RETURN expr inst : PRINT values\n                | PRINT expr expr : expr \'+\' expr\n                | expr \'-\' expr\n                | expr \'*\' expr\n                | expr \'/\' expr expr : expr DOTADD expr\n                | expr DOTSUB expr\n                | expr DOTMUL expr\n                | expr DOTDIV expr expr : expr EQ expr\n                | expr GEQ expr\n                | expr LEQ expr\n                | expr NEQ expr\n                | expr \'<\' expr\n                | expr \'>\' exprexpr : \'(\' expr \')\' expr : expr "\'" expr : \'-\' expr %prec UMINUSexpr : ids\n                | integer\n                | float\n                | string\n                | matrix integer : INTNUM float : FLOAT string : STRING matrix : ZEROS \'(\' values \')\'\n                  | ONES \'(\' values \')\'\n                  | EYE \'(\' values \')\' matrix : \'[\' rows \']\'\n                  | \'[\' rows \';\' \']\' rows : values rows : rows \';\' values values : expr values : values \',\' expr  block : \'{\' instructions_opt \'}\'  block : instruction  condition : if_condition\n                      | for_condition\n                      | while_condition  if_condition : if_cond if_condition : if_cond ELSE block if_condition : if_cond ELSE if_condition if_cond : IF \'(\' expr \')\' block  for_condition : FOR ids \'=\' range block  range : expr \':\' expr  while_condition : WHILE \'(\' expr \')\' block '
+_lr_signature = 'left,right=ADDASSIGNSUBASSIGNMULASSIGNDIVASSIGNleftEQNEQleft<>LEQGEQleft+-DOTADDDOTSUBleft*/DOTMULDOTDIVrightUMINUSADDASSIGN BREAK CONTINUE DIVASSIGN DOTADD DOTDIV DOTMUL DOTSUB ELSE EQ EYE FLOAT FOR GEQ ID IF INTNUM LEQ MULASSIGN NEQ ONES PRINT RETURN STRING SUBASSIGN WHILE ZEROSprogram : instructions_optinstructions_opt : instructions instructions_opt : instructions : instructions instruction instructions : instruction instruction : inst \';\'\n                       | condition \n                       | expr \';\' \n                       | inst \',\'\n                       | expr \',\' instruction : error \';\' inst : ids \'=\' expr\n                | ids ADDASSIGN expr\n                | ids SUBASSIGN expr\n                | ids MULASSIGN expr\n                | ids DIVASSIGN expr ids : ID\n               | ID \'[\' values \']\' inst : BREAK inst : CONTINUE inst : RETURN\n                | RETURN values \n                | RETURN expr inst : PRINT values\n                | PRINT expr expr : expr \'+\' expr\n                | expr \'-\' expr\n                | expr \'*\' expr\n                | expr \'/\' expr expr : expr DOTADD expr\n                | expr DOTSUB expr\n                | expr DOTMUL expr\n                | expr DOTDIV expr expr : expr EQ expr\n                | expr GEQ expr\n                | expr LEQ expr\n                | expr NEQ expr\n                | expr \'<\' expr\n                | expr \'>\' exprexpr : \'(\' expr \')\' expr : expr "\'" expr : \'-\' expr %prec UMINUSexpr : ids\n                | integer\n                | float\n                | string\n                | matrix integer : INTNUM float : FLOAT string : STRING matrix : ZEROS \'(\' values \')\'\n                  | ONES \'(\' values \')\'\n                  | EYE \'(\' values \')\' matrix : \'[\' rows \']\'\n                  | \'[\' rows \';\' \']\' rows : values rows : rows \';\' values values : expr values : values \',\' expr  block : \'{\' instructions \'}\'\n                  | \'{\' \'}\'  block : instruction  condition : if_condition\n                      | for_condition\n                      | while_condition  if_condition : if_cond if_condition : if_cond ELSE block if_condition : if_cond ELSE if_condition if_cond : IF \'(\' expr \')\' block  for_condition : FOR ids \'=\' range block  range : expr \':\' expr  while_condition : WHILE \'(\' expr \')\' block '
     
-_lr_action_items = {'$end':([0,1,2,3,4,6,13,14,15,24,34,35,36,37,38,101,102,104,123,124,126,127,],[-3,0,-1,-2,-5,-7,-61,-62,-63,-64,-4,-6,-9,-8,-10,-65,-61,-60,-59,-68,-70,-67,]),'BREAK':([0,3,4,6,13,14,15,18,19,20,21,22,24,27,28,29,34,35,36,37,38,53,61,64,70,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,101,102,103,104,112,113,116,118,119,120,121,122,123,124,126,127,128,],[9,9,-5,-7,-61,-62,-63,-43,-44,-45,-46,-16,-64,-47,-48,-49,-4,-6,-9,-8,-10,-40,-42,-41,9,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-65,-61,9,-60,-17,-54,9,9,-50,-51,-52,9,-59,-68,-70,-67,-69,]),'CONTINUE':([0,3,4,6,13,14,15,18,19,20,21,22,24,27,28,29,34,35,36,37,38,53,61,64,70,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,101,102,103,104,112,113,116,118,119,120,121,122,123,124,126,127,128,],[10,10,-5,-7,-61,-62,-63,-43,-44,-45,-46,-16,-64,-47,-48,-49,-4,-6,-9,-8,-10,-40,-42,-41,10,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-65,-61,10,-60,-17,-54,10,10,-50,-51,-52,10,-59,-68,-70,-67,-69,]),'RETURN':([0,3,4,6,13,14,15,18,19,20,21,22,24,27,28,29,34,35,36,37,38,53,61,64,70,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,101,102,103,104,112,113,116,118,119,120,121,122,123,124,126,127,128,],[11,11,-5,-7,-61,-62,-63,-43,-44,-45,-46,-16,-64,-47,-48,-49,-4,-6,-9,-8,-10,-40,-42,-41,11,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-65,-61,11,-60,-17,-54,11,11,-50,-51,-52,11,-59,-68,-70,-67,-69,]),'PRINT':([0,3,4,6,13,14,15,18,19,20,21,22,24,27,28,29,34,35,36,37,38,53,61,64,70,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,101,102,103,104,112,113,116,118,119,120,121,122,123,124,126,127,128,],[12,12,-5,-7,-61,-62,-63,-43,-44,-45,-46,-16,-64,-47,-48,-49,-4,-6,-9,-8,-10,-40,-42,-41,12,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-65,-61,12,-60,-17,-54,12,12,-50,-51,-52,12,-59,-68,-70,-67,-69,]),'(':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[17,17,-5,-7,17,17,-61,-62,-63,17,17,-43,-44,-45,-46,-16,17,-64,72,-47,-48,-49,73,74,75,76,-4,-6,-9,-8,-10,17,17,17,17,17,17,17,17,17,17,17,17,17,17,-40,17,17,17,17,17,-42,-41,17,17,17,17,17,17,17,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,17,-39,-53,17,-65,-61,17,-60,17,-17,-54,17,17,-50,-51,-52,17,-59,-68,17,-70,-67,-69,]),'-':([0,3,4,6,7,8,11,12,13,14,15,16,17,18,19,20,21,22,23,24,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,60,61,63,64,65,66,69,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,100,101,102,103,104,105,106,110,111,112,113,116,117,118,119,120,121,122,123,124,125,126,127,128,],[16,16,-5,-7,40,-42,16,16,-61,-62,-63,16,16,-43,-44,-45,-46,-16,16,-64,-47,-48,-49,-4,-6,-9,-8,-10,16,16,16,16,16,16,16,16,16,16,16,16,16,16,-40,16,16,16,16,16,40,-42,40,-41,40,16,40,16,16,16,16,16,16,-25,-26,-27,-28,-29,-30,-31,-32,40,40,40,40,40,40,40,40,40,40,40,16,-39,-53,16,-65,-61,16,-60,16,40,40,40,-17,-54,16,40,16,-50,-51,-52,16,-59,-68,16,-70,-67,40,]),'ID':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[22,22,-5,-7,22,22,-61,-62,-63,22,22,-43,-44,-45,-46,-16,22,-64,22,-47,-48,-49,-4,-6,-9,-8,-10,22,22,22,22,22,22,22,22,22,22,22,22,22,22,-40,22,22,22,22,22,-42,-41,22,22,22,22,22,22,22,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,22,-39,-53,22,-65,-61,22,-60,22,-17,-54,22,22,-50,-51,-52,22,-59,-68,22,-70,-67,-69,]),'FOR':([0,3,4,6,13,14,15,18,19,20,21,22,24,27,28,29,34,35,36,37,38,53,61,64,70,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,101,102,103,104,112,113,116,118,119,120,121,122,123,124,126,127,128,],[25,25,-5,-7,-61,-62,-63,-43,-44,-45,-46,-16,-64,-47,-48,-49,-4,-6,-9,-8,-10,-40,-42,-41,25,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-65,-61,25,-60,-17,-54,25,25,-50,-51,-52,25,-59,-68,-70,-67,-69,]),'WHILE':([0,3,4,6,13,14,15,18,19,20,21,22,24,27,28,29,34,35,36,37,38,53,61,64,70,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,101,102,103,104,112,113,116,118,119,120,121,122,123,124,126,127,128,],[26,26,-5,-7,-61,-62,-63,-43,-44,-45,-46,-16,-64,-47,-48,-49,-4,-6,-9,-8,-10,-40,-42,-41,26,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-65,-61,26,-60,-17,-54,26,26,-50,-51,-52,26,-59,-68,-70,-67,-69,]),'INTNUM':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[27,27,-5,-7,27,27,-61,-62,-63,27,27,-43,-44,-45,-46,-16,27,-64,-47,-48,-49,-4,-6,-9,-8,-10,27,27,27,27,27,27,27,27,27,27,27,27,27,27,-40,27,27,27,27,27,-42,-41,27,27,27,27,27,27,27,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,27,-39,-53,27,-65,-61,27,-60,27,-17,-54,27,27,-50,-51,-52,27,-59,-68,27,-70,-67,-69,]),'FLOAT':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[28,28,-5,-7,28,28,-61,-62,-63,28,28,-43,-44,-45,-46,-16,28,-64,-47,-48,-49,-4,-6,-9,-8,-10,28,28,28,28,28,28,28,28,28,28,28,28,28,28,-40,28,28,28,28,28,-42,-41,28,28,28,28,28,28,28,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,28,-39,-53,28,-65,-61,28,-60,28,-17,-54,28,28,-50,-51,-52,28,-59,-68,28,-70,-67,-69,]),'STRING':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[29,29,-5,-7,29,29,-61,-62,-63,29,29,-43,-44,-45,-46,-16,29,-64,-47,-48,-49,-4,-6,-9,-8,-10,29,29,29,29,29,29,29,29,29,29,29,29,29,29,-40,29,29,29,29,29,-42,-41,29,29,29,29,29,29,29,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,29,-39,-53,29,-65,-61,29,-60,29,-17,-54,29,29,-50,-51,-52,29,-59,-68,29,-70,-67,-69,]),'ZEROS':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[30,30,-5,-7,30,30,-61,-62,-63,30,30,-43,-44,-45,-46,-16,30,-64,-47,-48,-49,-4,-6,-9,-8,-10,30,30,30,30,30,30,30,30,30,30,30,30,30,30,-40,30,30,30,30,30,-42,-41,30,30,30,30,30,30,30,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,30,-39,-53,30,-65,-61,30,-60,30,-17,-54,30,30,-50,-51,-52,30,-59,-68,30,-70,-67,-69,]),'ONES':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[31,31,-5,-7,31,31,-61,-62,-63,31,31,-43,-44,-45,-46,-16,31,-64,-47,-48,-49,-4,-6,-9,-8,-10,31,31,31,31,31,31,31,31,31,31,31,31,31,31,-40,31,31,31,31,31,-42,-41,31,31,31,31,31,31,31,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,31,-39,-53,31,-65,-61,31,-60,31,-17,-54,31,31,-50,-51,-52,31,-59,-68,31,-70,-67,-69,]),'EYE':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[32,32,-5,-7,32,32,-61,-62,-63,32,32,-43,-44,-45,-46,-16,32,-64,-47,-48,-49,-4,-6,-9,-8,-10,32,32,32,32,32,32,32,32,32,32,32,32,32,32,-40,32,32,32,32,32,-42,-41,32,32,32,32,32,32,32,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,32,-39,-53,32,-65,-61,32,-60,32,-17,-54,32,32,-50,-51,-52,32,-59,-68,32,-70,-67,-69,]),'[':([0,3,4,6,11,12,13,14,15,16,17,18,19,20,21,22,23,24,27,28,29,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,61,64,66,70,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,96,97,99,100,101,102,103,104,105,112,113,116,118,119,120,121,122,123,124,125,126,127,128,],[23,23,-5,-7,23,23,-61,-62,-63,23,23,-43,-44,-45,-46,66,23,-64,-47,-48,-49,-4,-6,-9,-8,-10,23,23,23,23,23,23,23,23,23,23,23,23,23,23,-40,23,23,23,23,23,-42,-41,23,23,23,23,23,23,23,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,23,-39,-53,23,-65,-61,23,-60,23,-17,-54,23,23,-50,-51,-52,23,-59,-68,23,-70,-67,-69,]),'IF':([0,3,4,6,13,14,15,18,19,20,21,22,24,27,28,29,34,35,36,37,38,53,61,64,70,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,101,102,103,104,112,113,116,118,119,120,121,122,123,124,126,127,128,],[33,33,-5,-7,-61,-62,-63,-43,-44,-45,-46,-16,-64,-47,-48,-49,-4,-6,-9,-8,-10,-40,-42,-41,33,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-65,-61,33,-60,-17,-54,33,33,-50,-51,-52,33,-59,-68,-70,-67,-69,]),'}':([3,4,6,13,14,15,24,34,35,36,37,38,101,102,103,104,115,123,124,126,127,],[-2,-5,-7,-61,-62,-63,-64,-4,-6,-9,-8,-10,-65,-61,-3,-60,123,-59,-68,-70,-67,]),';':([5,7,8,9,10,11,18,19,20,21,22,27,28,29,53,59,60,61,62,63,64,67,68,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,111,112,113,114,119,120,121,],[35,37,-42,-18,-19,-20,-43,-44,-45,-46,-16,-47,-48,-49,-40,-21,-22,-42,-23,-24,-41,100,-55,-57,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-11,-12,-13,-14,-15,-39,-53,-58,-17,-54,-56,-50,-51,-52,]),',':([5,7,8,9,10,11,18,19,20,21,22,27,28,29,53,59,60,61,62,63,64,68,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,98,99,107,108,109,111,112,113,114,119,120,121,],[36,38,-42,-18,-19,-20,-43,-44,-45,-46,-16,-47,-48,-49,-40,96,-22,-42,96,-24,-41,96,-57,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-11,-12,-13,-14,-15,-39,96,-53,96,96,96,-58,-17,-54,96,-50,-51,-52,]),'ELSE':([6,13,14,15,24,35,36,37,38,101,102,104,123,124,126,127,],[-7,-61,-62,-63,70,-6,-9,-8,-10,-65,-61,-60,-59,-68,-70,-67,]),'+':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[39,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,39,-42,39,-41,39,39,-25,-26,-27,-28,-29,-30,-31,-32,39,39,39,39,39,39,39,39,39,39,39,-39,-53,39,39,39,-17,-54,39,-50,-51,-52,39,]),'*':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[41,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,41,-42,41,-41,41,41,41,41,-27,-28,41,41,-31,-32,41,41,41,41,41,41,41,41,41,41,41,-39,-53,41,41,41,-17,-54,41,-50,-51,-52,41,]),'/':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[42,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,42,-42,42,-41,42,42,42,42,-27,-28,42,42,-31,-32,42,42,42,42,42,42,42,42,42,42,42,-39,-53,42,42,42,-17,-54,42,-50,-51,-52,42,]),'DOTADD':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[43,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,43,-42,43,-41,43,43,-25,-26,-27,-28,-29,-30,-31,-32,43,43,43,43,43,43,43,43,43,43,43,-39,-53,43,43,43,-17,-54,43,-50,-51,-52,43,]),'DOTSUB':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[44,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,44,-42,44,-41,44,44,-25,-26,-27,-28,-29,-30,-31,-32,44,44,44,44,44,44,44,44,44,44,44,-39,-53,44,44,44,-17,-54,44,-50,-51,-52,44,]),'DOTMUL':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[45,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,45,-42,45,-41,45,45,45,45,-27,-28,45,45,-31,-32,45,45,45,45,45,45,45,45,45,45,45,-39,-53,45,45,45,-17,-54,45,-50,-51,-52,45,]),'DOTDIV':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[46,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,46,-42,46,-41,46,46,46,46,-27,-28,46,46,-31,-32,46,46,46,46,46,46,46,46,46,46,46,-39,-53,46,46,46,-17,-54,46,-50,-51,-52,46,]),'EQ':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[47,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,47,-42,47,-41,47,47,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,47,47,47,47,47,-39,-53,47,47,47,-17,-54,47,-50,-51,-52,47,]),'GEQ':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[48,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,48,-42,48,-41,48,48,-25,-26,-27,-28,-29,-30,-31,-32,48,-34,-35,48,-37,-38,48,48,48,48,48,-39,-53,48,48,48,-17,-54,48,-50,-51,-52,48,]),'LEQ':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[49,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,49,-42,49,-41,49,49,-25,-26,-27,-28,-29,-30,-31,-32,49,-34,-35,49,-37,-38,49,49,49,49,49,-39,-53,49,49,49,-17,-54,49,-50,-51,-52,49,]),'NEQ':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[50,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,50,-42,50,-41,50,50,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,50,50,50,50,50,-39,-53,50,50,50,-17,-54,50,-50,-51,-52,50,]),'<':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[51,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,51,-42,51,-41,51,51,-25,-26,-27,-28,-29,-30,-31,-32,51,-34,-35,51,-37,-38,51,51,51,51,51,-39,-53,51,51,51,-17,-54,51,-50,-51,-52,51,]),'>':([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[52,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,52,-42,52,-41,52,52,-25,-26,-27,-28,-29,-30,-31,-32,52,-34,-35,52,-37,-38,52,52,52,52,52,-39,-53,52,52,52,-17,-54,52,-50,-51,-52,52,]),"'":([7,8,18,19,20,21,22,27,28,29,53,60,61,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,97,99,106,110,111,112,113,117,119,120,121,128,],[53,-42,-43,-44,-45,-46,-16,-47,-48,-49,-40,53,-42,53,-41,53,53,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,53,53,53,53,53,-39,-53,53,53,53,-17,-54,53,-50,-51,-52,53,]),'=':([8,22,71,112,],[54,-16,105,-17,]),'ADDASSIGN':([8,22,112,],[55,-16,-17,]),'SUBASSIGN':([8,22,112,],[56,-16,-17,]),'MULASSIGN':([8,22,112,],[57,-16,-17,]),'DIVASSIGN':([8,22,112,],[58,-16,-17,]),')':([18,19,20,21,22,27,28,29,53,61,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,106,107,108,109,110,111,112,113,119,120,121,],[-43,-44,-45,-46,-16,-47,-48,-49,-40,-42,-41,97,-57,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,118,119,120,121,122,-58,-17,-54,-50,-51,-52,]),']':([18,19,20,21,22,27,28,29,53,61,64,67,68,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,98,99,100,111,112,113,114,119,120,121,],[-43,-44,-45,-46,-16,-47,-48,-49,-40,-42,-41,99,-55,-57,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,112,-53,113,-58,-17,-54,-56,-50,-51,-52,]),':':([18,19,20,21,22,27,28,29,53,61,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,112,113,117,119,120,121,],[-43,-44,-45,-46,-16,-47,-48,-49,-40,-42,-41,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-17,-54,125,-50,-51,-52,]),'{':([18,19,20,21,22,27,28,29,53,61,64,70,77,78,79,80,81,82,83,84,85,86,87,88,89,90,97,99,112,113,116,118,119,120,121,122,128,],[-43,-44,-45,-46,-16,-47,-48,-49,-40,-42,-41,103,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-53,-17,-54,103,103,-50,-51,-52,103,-69,]),}
+_lr_action_items = {'$end':([0,1,2,3,4,6,14,15,16,25,35,36,37,38,39,55,103,104,106,118,126,127,129,130,],[-3,0,-1,-2,-5,-7,-63,-64,-65,-66,-4,-6,-9,-8,-10,-11,-67,-63,-62,-61,-60,-70,-72,-69,]),'error':([0,3,4,6,14,15,16,19,20,21,22,23,25,28,29,30,35,36,37,38,39,54,55,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,103,104,105,106,114,115,117,118,119,121,122,123,124,125,126,127,129,130,131,],[8,8,-5,-7,-63,-64,-65,-44,-45,-46,-47,-17,-66,-48,-49,-50,-4,-6,-9,-8,-10,-41,-11,-43,-42,8,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-67,-63,8,-62,-18,-55,8,-61,8,8,-51,-52,-53,8,-60,-70,-72,-69,-71,]),'BREAK':([0,3,4,6,14,15,16,19,20,21,22,23,25,28,29,30,35,36,37,38,39,54,55,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,103,104,105,106,114,115,117,118,119,121,122,123,124,125,126,127,129,130,131,],[10,10,-5,-7,-63,-64,-65,-44,-45,-46,-47,-17,-66,-48,-49,-50,-4,-6,-9,-8,-10,-41,-11,-43,-42,10,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-67,-63,10,-62,-18,-55,10,-61,10,10,-51,-52,-53,10,-60,-70,-72,-69,-71,]),'CONTINUE':([0,3,4,6,14,15,16,19,20,21,22,23,25,28,29,30,35,36,37,38,39,54,55,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,103,104,105,106,114,115,117,118,119,121,122,123,124,125,126,127,129,130,131,],[11,11,-5,-7,-63,-64,-65,-44,-45,-46,-47,-17,-66,-48,-49,-50,-4,-6,-9,-8,-10,-41,-11,-43,-42,11,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-67,-63,11,-62,-18,-55,11,-61,11,11,-51,-52,-53,11,-60,-70,-72,-69,-71,]),'RETURN':([0,3,4,6,14,15,16,19,20,21,22,23,25,28,29,30,35,36,37,38,39,54,55,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,103,104,105,106,114,115,117,118,119,121,122,123,124,125,126,127,129,130,131,],[12,12,-5,-7,-63,-64,-65,-44,-45,-46,-47,-17,-66,-48,-49,-50,-4,-6,-9,-8,-10,-41,-11,-43,-42,12,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-67,-63,12,-62,-18,-55,12,-61,12,12,-51,-52,-53,12,-60,-70,-72,-69,-71,]),'PRINT':([0,3,4,6,14,15,16,19,20,21,22,23,25,28,29,30,35,36,37,38,39,54,55,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,103,104,105,106,114,115,117,118,119,121,122,123,124,125,126,127,129,130,131,],[13,13,-5,-7,-63,-64,-65,-44,-45,-46,-47,-17,-66,-48,-49,-50,-4,-6,-9,-8,-10,-41,-11,-43,-42,13,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-67,-63,13,-62,-18,-55,13,-61,13,13,-51,-52,-53,13,-60,-70,-72,-69,-71,]),'(':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[18,18,-5,-7,18,18,-63,-64,-65,18,18,-44,-45,-46,-47,-17,18,-66,74,-48,-49,-50,75,76,77,78,-4,-6,-9,-8,-10,18,18,18,18,18,18,18,18,18,18,18,18,18,18,-41,-11,18,18,18,18,18,-43,-42,18,18,18,18,18,18,18,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,18,-40,-54,18,-67,-63,18,-62,18,-18,-55,18,-61,18,18,-51,-52,-53,18,-60,-70,18,-72,-69,-71,]),'-':([0,3,4,6,7,9,12,13,14,15,16,17,18,19,20,21,22,23,24,25,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,62,63,65,66,67,68,71,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,101,102,103,104,105,106,107,108,112,113,114,115,117,118,119,120,121,122,123,124,125,126,127,128,129,130,131,],[17,17,-5,-7,41,-43,17,17,-63,-64,-65,17,17,-44,-45,-46,-47,-17,17,-66,-48,-49,-50,-4,-6,-9,-8,-10,17,17,17,17,17,17,17,17,17,17,17,17,17,17,-41,-11,17,17,17,17,17,41,-43,41,-42,41,17,41,17,17,17,17,17,17,-26,-27,-28,-29,-30,-31,-32,-33,41,41,41,41,41,41,41,41,41,41,41,17,-40,-54,17,-67,-63,17,-62,17,41,41,41,-18,-55,17,-61,17,41,17,-51,-52,-53,17,-60,-70,17,-72,-69,41,]),'ID':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[23,23,-5,-7,23,23,-63,-64,-65,23,23,-44,-45,-46,-47,-17,23,-66,23,-48,-49,-50,-4,-6,-9,-8,-10,23,23,23,23,23,23,23,23,23,23,23,23,23,23,-41,-11,23,23,23,23,23,-43,-42,23,23,23,23,23,23,23,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,23,-40,-54,23,-67,-63,23,-62,23,-18,-55,23,-61,23,23,-51,-52,-53,23,-60,-70,23,-72,-69,-71,]),'FOR':([0,3,4,6,14,15,16,19,20,21,22,23,25,28,29,30,35,36,37,38,39,54,55,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,103,104,105,106,114,115,117,118,119,121,122,123,124,125,126,127,129,130,131,],[26,26,-5,-7,-63,-64,-65,-44,-45,-46,-47,-17,-66,-48,-49,-50,-4,-6,-9,-8,-10,-41,-11,-43,-42,26,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-67,-63,26,-62,-18,-55,26,-61,26,26,-51,-52,-53,26,-60,-70,-72,-69,-71,]),'WHILE':([0,3,4,6,14,15,16,19,20,21,22,23,25,28,29,30,35,36,37,38,39,54,55,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,103,104,105,106,114,115,117,118,119,121,122,123,124,125,126,127,129,130,131,],[27,27,-5,-7,-63,-64,-65,-44,-45,-46,-47,-17,-66,-48,-49,-50,-4,-6,-9,-8,-10,-41,-11,-43,-42,27,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-67,-63,27,-62,-18,-55,27,-61,27,27,-51,-52,-53,27,-60,-70,-72,-69,-71,]),'INTNUM':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[28,28,-5,-7,28,28,-63,-64,-65,28,28,-44,-45,-46,-47,-17,28,-66,-48,-49,-50,-4,-6,-9,-8,-10,28,28,28,28,28,28,28,28,28,28,28,28,28,28,-41,-11,28,28,28,28,28,-43,-42,28,28,28,28,28,28,28,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,28,-40,-54,28,-67,-63,28,-62,28,-18,-55,28,-61,28,28,-51,-52,-53,28,-60,-70,28,-72,-69,-71,]),'FLOAT':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[29,29,-5,-7,29,29,-63,-64,-65,29,29,-44,-45,-46,-47,-17,29,-66,-48,-49,-50,-4,-6,-9,-8,-10,29,29,29,29,29,29,29,29,29,29,29,29,29,29,-41,-11,29,29,29,29,29,-43,-42,29,29,29,29,29,29,29,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,29,-40,-54,29,-67,-63,29,-62,29,-18,-55,29,-61,29,29,-51,-52,-53,29,-60,-70,29,-72,-69,-71,]),'STRING':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[30,30,-5,-7,30,30,-63,-64,-65,30,30,-44,-45,-46,-47,-17,30,-66,-48,-49,-50,-4,-6,-9,-8,-10,30,30,30,30,30,30,30,30,30,30,30,30,30,30,-41,-11,30,30,30,30,30,-43,-42,30,30,30,30,30,30,30,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,30,-40,-54,30,-67,-63,30,-62,30,-18,-55,30,-61,30,30,-51,-52,-53,30,-60,-70,30,-72,-69,-71,]),'ZEROS':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[31,31,-5,-7,31,31,-63,-64,-65,31,31,-44,-45,-46,-47,-17,31,-66,-48,-49,-50,-4,-6,-9,-8,-10,31,31,31,31,31,31,31,31,31,31,31,31,31,31,-41,-11,31,31,31,31,31,-43,-42,31,31,31,31,31,31,31,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,31,-40,-54,31,-67,-63,31,-62,31,-18,-55,31,-61,31,31,-51,-52,-53,31,-60,-70,31,-72,-69,-71,]),'ONES':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[32,32,-5,-7,32,32,-63,-64,-65,32,32,-44,-45,-46,-47,-17,32,-66,-48,-49,-50,-4,-6,-9,-8,-10,32,32,32,32,32,32,32,32,32,32,32,32,32,32,-41,-11,32,32,32,32,32,-43,-42,32,32,32,32,32,32,32,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,32,-40,-54,32,-67,-63,32,-62,32,-18,-55,32,-61,32,32,-51,-52,-53,32,-60,-70,32,-72,-69,-71,]),'EYE':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[33,33,-5,-7,33,33,-63,-64,-65,33,33,-44,-45,-46,-47,-17,33,-66,-48,-49,-50,-4,-6,-9,-8,-10,33,33,33,33,33,33,33,33,33,33,33,33,33,33,-41,-11,33,33,33,33,33,-43,-42,33,33,33,33,33,33,33,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,33,-40,-54,33,-67,-63,33,-62,33,-18,-55,33,-61,33,33,-51,-52,-53,33,-60,-70,33,-72,-69,-71,]),'[':([0,3,4,6,12,13,14,15,16,17,18,19,20,21,22,23,24,25,28,29,30,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,63,66,68,72,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,98,99,101,102,103,104,105,106,107,114,115,117,118,119,121,122,123,124,125,126,127,128,129,130,131,],[24,24,-5,-7,24,24,-63,-64,-65,24,24,-44,-45,-46,-47,68,24,-66,-48,-49,-50,-4,-6,-9,-8,-10,24,24,24,24,24,24,24,24,24,24,24,24,24,24,-41,-11,24,24,24,24,24,-43,-42,24,24,24,24,24,24,24,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,24,-40,-54,24,-67,-63,24,-62,24,-18,-55,24,-61,24,24,-51,-52,-53,24,-60,-70,24,-72,-69,-71,]),'IF':([0,3,4,6,14,15,16,19,20,21,22,23,25,28,29,30,35,36,37,38,39,54,55,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,103,104,105,106,114,115,117,118,119,121,122,123,124,125,126,127,129,130,131,],[34,34,-5,-7,-63,-64,-65,-44,-45,-46,-47,-17,-66,-48,-49,-50,-4,-6,-9,-8,-10,-41,-11,-43,-42,34,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-67,-63,34,-62,-18,-55,34,-61,34,34,-51,-52,-53,34,-60,-70,-72,-69,-71,]),'}':([4,6,14,15,16,25,35,36,37,38,39,55,103,104,105,106,117,118,126,127,129,130,],[-5,-7,-63,-64,-65,-66,-4,-6,-9,-8,-10,-11,-67,-63,118,-62,126,-61,-60,-70,-72,-69,]),';':([5,7,8,9,10,11,12,19,20,21,22,23,28,29,30,54,61,62,63,64,65,66,69,70,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,113,114,115,116,122,123,124,],[36,38,55,-43,-19,-20,-21,-44,-45,-46,-47,-17,-48,-49,-50,-41,-22,-23,-43,-24,-25,-42,102,-56,-58,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-12,-13,-14,-15,-16,-40,-54,-59,-18,-55,-57,-51,-52,-53,]),',':([5,7,9,10,11,12,19,20,21,22,23,28,29,30,54,61,62,63,64,65,66,70,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,100,101,109,110,111,113,114,115,116,122,123,124,],[37,39,-43,-19,-20,-21,-44,-45,-46,-47,-17,-48,-49,-50,-41,98,-23,-43,98,-25,-42,98,-58,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-12,-13,-14,-15,-16,-40,98,-54,98,98,98,-59,-18,-55,98,-51,-52,-53,]),'ELSE':([6,14,15,16,25,36,37,38,39,55,103,104,106,118,126,127,129,130,],[-7,-63,-64,-65,72,-6,-9,-8,-10,-11,-67,-63,-62,-61,-60,-70,-72,-69,]),'+':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[40,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,40,-43,40,-42,40,40,-26,-27,-28,-29,-30,-31,-32,-33,40,40,40,40,40,40,40,40,40,40,40,-40,-54,40,40,40,-18,-55,40,-51,-52,-53,40,]),'*':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[42,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,42,-43,42,-42,42,42,42,42,-28,-29,42,42,-32,-33,42,42,42,42,42,42,42,42,42,42,42,-40,-54,42,42,42,-18,-55,42,-51,-52,-53,42,]),'/':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[43,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,43,-43,43,-42,43,43,43,43,-28,-29,43,43,-32,-33,43,43,43,43,43,43,43,43,43,43,43,-40,-54,43,43,43,-18,-55,43,-51,-52,-53,43,]),'DOTADD':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[44,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,44,-43,44,-42,44,44,-26,-27,-28,-29,-30,-31,-32,-33,44,44,44,44,44,44,44,44,44,44,44,-40,-54,44,44,44,-18,-55,44,-51,-52,-53,44,]),'DOTSUB':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[45,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,45,-43,45,-42,45,45,-26,-27,-28,-29,-30,-31,-32,-33,45,45,45,45,45,45,45,45,45,45,45,-40,-54,45,45,45,-18,-55,45,-51,-52,-53,45,]),'DOTMUL':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[46,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,46,-43,46,-42,46,46,46,46,-28,-29,46,46,-32,-33,46,46,46,46,46,46,46,46,46,46,46,-40,-54,46,46,46,-18,-55,46,-51,-52,-53,46,]),'DOTDIV':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[47,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,47,-43,47,-42,47,47,47,47,-28,-29,47,47,-32,-33,47,47,47,47,47,47,47,47,47,47,47,-40,-54,47,47,47,-18,-55,47,-51,-52,-53,47,]),'EQ':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[48,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,48,-43,48,-42,48,48,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,48,48,48,48,48,-40,-54,48,48,48,-18,-55,48,-51,-52,-53,48,]),'GEQ':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[49,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,49,-43,49,-42,49,49,-26,-27,-28,-29,-30,-31,-32,-33,49,-35,-36,49,-38,-39,49,49,49,49,49,-40,-54,49,49,49,-18,-55,49,-51,-52,-53,49,]),'LEQ':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[50,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,50,-43,50,-42,50,50,-26,-27,-28,-29,-30,-31,-32,-33,50,-35,-36,50,-38,-39,50,50,50,50,50,-40,-54,50,50,50,-18,-55,50,-51,-52,-53,50,]),'NEQ':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[51,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,51,-43,51,-42,51,51,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,51,51,51,51,51,-40,-54,51,51,51,-18,-55,51,-51,-52,-53,51,]),'<':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[52,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,52,-43,52,-42,52,52,-26,-27,-28,-29,-30,-31,-32,-33,52,-35,-36,52,-38,-39,52,52,52,52,52,-40,-54,52,52,52,-18,-55,52,-51,-52,-53,52,]),'>':([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[53,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,53,-43,53,-42,53,53,-26,-27,-28,-29,-30,-31,-32,-33,53,-35,-36,53,-38,-39,53,53,53,53,53,-40,-54,53,53,53,-18,-55,53,-51,-52,-53,53,]),"'":([7,9,19,20,21,22,23,28,29,30,54,62,63,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,99,101,108,112,113,114,115,120,122,123,124,131,],[54,-43,-44,-45,-46,-47,-17,-48,-49,-50,-41,54,-43,54,-42,54,54,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,54,54,54,54,54,-40,-54,54,54,54,-18,-55,54,-51,-52,-53,54,]),'=':([9,23,73,114,],[56,-17,107,-18,]),'ADDASSIGN':([9,23,114,],[57,-17,-18,]),'SUBASSIGN':([9,23,114,],[58,-17,-18,]),'MULASSIGN':([9,23,114,],[59,-17,-18,]),'DIVASSIGN':([9,23,114,],[60,-17,-18,]),')':([19,20,21,22,23,28,29,30,54,63,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,108,109,110,111,112,113,114,115,122,123,124,],[-44,-45,-46,-47,-17,-48,-49,-50,-41,-43,-42,99,-58,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,121,122,123,124,125,-59,-18,-55,-51,-52,-53,]),']':([19,20,21,22,23,28,29,30,54,63,66,69,70,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,100,101,102,113,114,115,116,122,123,124,],[-44,-45,-46,-47,-17,-48,-49,-50,-41,-43,-42,101,-56,-58,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,114,-54,115,-59,-18,-55,-57,-51,-52,-53,]),':':([19,20,21,22,23,28,29,30,54,63,66,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,114,115,120,122,123,124,],[-44,-45,-46,-47,-17,-48,-49,-50,-41,-43,-42,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-18,-55,128,-51,-52,-53,]),'{':([19,20,21,22,23,28,29,30,54,63,66,72,79,80,81,82,83,84,85,86,87,88,89,90,91,92,99,101,114,115,119,121,122,123,124,125,131,],[-44,-45,-46,-47,-17,-48,-49,-50,-41,-43,-42,105,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-40,-54,-18,-55,105,105,-51,-52,-53,105,-71,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'program':([0,],[1,]),'instructions_opt':([0,103,],[2,115,]),'instructions':([0,103,],[3,3,]),'instruction':([0,3,70,103,116,118,122,],[4,34,104,4,104,104,104,]),'inst':([0,3,70,103,116,118,122,],[5,5,5,5,5,5,5,]),'condition':([0,3,70,103,116,118,122,],[6,6,6,6,6,6,6,]),'expr':([0,3,11,12,16,17,23,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,66,70,72,73,74,75,76,96,100,103,105,116,118,122,125,],[7,7,60,63,64,65,69,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,69,7,106,69,69,69,110,111,69,7,117,7,7,7,128,]),'ids':([0,3,11,12,16,17,23,25,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,66,70,72,73,74,75,76,96,100,103,105,116,118,122,125,],[8,8,61,61,61,61,61,71,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,8,61,61,61,61,61,61,61,8,61,8,8,8,61,]),'if_condition':([0,3,70,103,116,118,122,],[13,13,102,13,13,13,13,]),'for_condition':([0,3,70,103,116,118,122,],[14,14,14,14,14,14,14,]),'while_condition':([0,3,70,103,116,118,122,],[15,15,15,15,15,15,15,]),'integer':([0,3,11,12,16,17,23,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,66,70,72,73,74,75,76,96,100,103,105,116,118,122,125,],[18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,]),'float':([0,3,11,12,16,17,23,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,66,70,72,73,74,75,76,96,100,103,105,116,118,122,125,],[19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,]),'string':([0,3,11,12,16,17,23,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,66,70,72,73,74,75,76,96,100,103,105,116,118,122,125,],[20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,]),'matrix':([0,3,11,12,16,17,23,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,66,70,72,73,74,75,76,96,100,103,105,116,118,122,125,],[21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,]),'if_cond':([0,3,70,103,116,118,122,],[24,24,24,24,24,24,24,]),'values':([11,12,23,66,73,74,75,100,],[59,62,68,98,107,108,109,114,]),'rows':([23,],[67,]),'block':([70,116,118,122,],[101,124,126,127,]),'range':([105,],[116,]),}
+_lr_goto_items = {'program':([0,],[1,]),'instructions_opt':([0,],[2,]),'instructions':([0,105,],[3,117,]),'instruction':([0,3,72,105,117,119,121,125,],[4,35,106,4,35,106,106,106,]),'inst':([0,3,72,105,117,119,121,125,],[5,5,5,5,5,5,5,5,]),'condition':([0,3,72,105,117,119,121,125,],[6,6,6,6,6,6,6,6,]),'expr':([0,3,12,13,17,18,24,40,41,42,43,44,45,46,47,48,49,50,51,52,53,56,57,58,59,60,68,72,74,75,76,77,78,98,102,105,107,117,119,121,125,128,],[7,7,62,65,66,67,71,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,71,7,108,71,71,71,112,113,71,7,120,7,7,7,7,131,]),'ids':([0,3,12,13,17,18,24,26,40,41,42,43,44,45,46,47,48,49,50,51,52,53,56,57,58,59,60,68,72,74,75,76,77,78,98,102,105,107,117,119,121,125,128,],[9,9,63,63,63,63,63,73,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,9,63,63,63,63,63,63,63,9,63,9,9,9,9,63,]),'if_condition':([0,3,72,105,117,119,121,125,],[14,14,104,14,14,14,14,14,]),'for_condition':([0,3,72,105,117,119,121,125,],[15,15,15,15,15,15,15,15,]),'while_condition':([0,3,72,105,117,119,121,125,],[16,16,16,16,16,16,16,16,]),'integer':([0,3,12,13,17,18,24,40,41,42,43,44,45,46,47,48,49,50,51,52,53,56,57,58,59,60,68,72,74,75,76,77,78,98,102,105,107,117,119,121,125,128,],[19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,]),'float':([0,3,12,13,17,18,24,40,41,42,43,44,45,46,47,48,49,50,51,52,53,56,57,58,59,60,68,72,74,75,76,77,78,98,102,105,107,117,119,121,125,128,],[20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,]),'string':([0,3,12,13,17,18,24,40,41,42,43,44,45,46,47,48,49,50,51,52,53,56,57,58,59,60,68,72,74,75,76,77,78,98,102,105,107,117,119,121,125,128,],[21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,]),'matrix':([0,3,12,13,17,18,24,40,41,42,43,44,45,46,47,48,49,50,51,52,53,56,57,58,59,60,68,72,74,75,76,77,78,98,102,105,107,117,119,121,125,128,],[22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,]),'if_cond':([0,3,72,105,117,119,121,125,],[25,25,25,25,25,25,25,25,]),'values':([12,13,24,68,75,76,77,102,],[61,64,70,100,109,110,111,116,]),'rows':([24,],[69,]),'block':([72,119,121,125,],[103,127,129,130,]),'range':([107,],[119,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,74 +27,76 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> program","S'",1,None,None,None),
-  ('program -> instructions_opt','program',1,'p_program','Mparser.py',40),
-  ('instructions_opt -> instructions','instructions_opt',1,'p_instructions_opt_1','Mparser.py',45),
-  ('instructions_opt -> <empty>','instructions_opt',0,'p_instructions_opt_2','Mparser.py',50),
-  ('instructions -> instructions instruction','instructions',2,'p_instructions_1','Mparser.py',53),
-  ('instructions -> instruction','instructions',1,'p_instructions_2','Mparser.py',58),
-  ('instruction -> inst ;','instruction',2,'p_instruction','Mparser.py',63),
-  ('instruction -> condition','instruction',1,'p_instruction','Mparser.py',64),
-  ('instruction -> expr ;','instruction',2,'p_instruction','Mparser.py',65),
-  ('instruction -> inst ,','instruction',2,'p_instruction','Mparser.py',66),
-  ('instruction -> expr ,','instruction',2,'p_instruction','Mparser.py',67),
-  ('inst -> ids = expr','inst',3,'p_inst_assign','Mparser.py',72),
-  ('inst -> ids ADDASSIGN expr','inst',3,'p_inst_assign','Mparser.py',73),
-  ('inst -> ids SUBASSIGN expr','inst',3,'p_inst_assign','Mparser.py',74),
-  ('inst -> ids MULASSIGN expr','inst',3,'p_inst_assign','Mparser.py',75),
-  ('inst -> ids DIVASSIGN expr','inst',3,'p_inst_assign','Mparser.py',76),
-  ('ids -> ID','ids',1,'p_ids','Mparser.py',81),
-  ('ids -> ID [ values ]','ids',4,'p_ids','Mparser.py',82),
-  ('inst -> BREAK','inst',1,'p_break','Mparser.py',90),
-  ('inst -> CONTINUE','inst',1,'p_continue','Mparser.py',95),
-  ('inst -> RETURN','inst',1,'p_return','Mparser.py',100),
-  ('inst -> RETURN values','inst',2,'p_return','Mparser.py',101),
-  ('inst -> RETURN expr','inst',2,'p_return','Mparser.py',102),
-  ('inst -> PRINT values','inst',2,'p_print','Mparser.py',112),
-  ('inst -> PRINT expr','inst',2,'p_print','Mparser.py',113),
-  ('expr -> expr + expr','expr',3,'p_expr_binary','Mparser.py',118),
-  ('expr -> expr - expr','expr',3,'p_expr_binary','Mparser.py',119),
-  ('expr -> expr * expr','expr',3,'p_expr_binary','Mparser.py',120),
-  ('expr -> expr / expr','expr',3,'p_expr_binary','Mparser.py',121),
-  ('expr -> expr DOTADD expr','expr',3,'p_expr_elementwise','Mparser.py',126),
-  ('expr -> expr DOTSUB expr','expr',3,'p_expr_elementwise','Mparser.py',127),
-  ('expr -> expr DOTMUL expr','expr',3,'p_expr_elementwise','Mparser.py',128),
-  ('expr -> expr DOTDIV expr','expr',3,'p_expr_elementwise','Mparser.py',129),
-  ('expr -> expr EQ expr','expr',3,'p_expr_eq','Mparser.py',134),
-  ('expr -> expr GEQ expr','expr',3,'p_expr_eq','Mparser.py',135),
-  ('expr -> expr LEQ expr','expr',3,'p_expr_eq','Mparser.py',136),
-  ('expr -> expr NEQ expr','expr',3,'p_expr_eq','Mparser.py',137),
-  ('expr -> expr < expr','expr',3,'p_expr_eq','Mparser.py',138),
-  ('expr -> expr > expr','expr',3,'p_expr_eq','Mparser.py',139),
-  ('expr -> ( expr )','expr',3,'p_expr_paren','Mparser.py',144),
-  ("expr -> expr '",'expr',2,'p_expr_transpose','Mparser.py',149),
-  ('expr -> - expr','expr',2,'p_expr_negative','Mparser.py',154),
-  ('expr -> ids','expr',1,'p_expr','Mparser.py',159),
-  ('expr -> integer','expr',1,'p_expr','Mparser.py',160),
-  ('expr -> float','expr',1,'p_expr','Mparser.py',161),
-  ('expr -> string','expr',1,'p_expr','Mparser.py',162),
-  ('expr -> matrix','expr',1,'p_expr','Mparser.py',163),
-  ('integer -> INTNUM','integer',1,'p_integer','Mparser.py',168),
-  ('float -> FLOAT','float',1,'p_float','Mparser.py',173),
-  ('string -> STRING','string',1,'p_string','Mparser.py',178),
-  ('matrix -> ZEROS ( values )','matrix',4,'p_matrix_operations','Mparser.py',183),
-  ('matrix -> ONES ( values )','matrix',4,'p_matrix_operations','Mparser.py',184),
-  ('matrix -> EYE ( values )','matrix',4,'p_matrix_operations','Mparser.py',185),
-  ('matrix -> [ rows ]','matrix',3,'p_matrix_init','Mparser.py',190),
-  ('matrix -> [ rows ; ]','matrix',4,'p_matrix_init','Mparser.py',191),
-  ('rows -> values','rows',1,'p_rows','Mparser.py',196),
-  ('rows -> rows ; values','rows',3,'p_rows_2','Mparser.py',201),
-  ('values -> expr','values',1,'p_values','Mparser.py',206),
-  ('values -> values , expr','values',3,'p_values_2','Mparser.py',211),
-  ('block -> { instructions_opt }','block',3,'p_block','Mparser.py',216),
-  ('block -> instruction','block',1,'p_block_2','Mparser.py',221),
-  ('condition -> if_condition','condition',1,'p_conditional','Mparser.py',226),
-  ('condition -> for_condition','condition',1,'p_conditional','Mparser.py',227),
-  ('condition -> while_condition','condition',1,'p_conditional','Mparser.py',228),
-  ('if_condition -> if_cond','if_condition',1,'p_if','Mparser.py',233),
-  ('if_condition -> if_cond ELSE block','if_condition',3,'p_if_2','Mparser.py',238),
-  ('if_condition -> if_cond ELSE if_condition','if_condition',3,'p_if_3','Mparser.py',244),
-  ('if_cond -> IF ( expr ) block','if_cond',5,'p_if_cond','Mparser.py',250),
-  ('for_condition -> FOR ids = range block','for_condition',5,'p_for','Mparser.py',255),
-  ('range -> expr : expr','range',3,'p_range','Mparser.py',260),
-  ('while_condition -> WHILE ( expr ) block','while_condition',5,'p_while','Mparser.py',265),
+  ('program -> instructions_opt','program',1,'p_program','Mparser.py',169),
+  ('instructions_opt -> instructions','instructions_opt',1,'p_instructions_opt_1','Mparser.py',177),
+  ('instructions_opt -> <empty>','instructions_opt',0,'p_instructions_opt_2','Mparser.py',183),
+  ('instructions -> instructions instruction','instructions',2,'p_instructions_1','Mparser.py',186),
+  ('instructions -> instruction','instructions',1,'p_instructions_2','Mparser.py',192),
+  ('instruction -> inst ;','instruction',2,'p_instruction','Mparser.py',197),
+  ('instruction -> condition','instruction',1,'p_instruction','Mparser.py',198),
+  ('instruction -> expr ;','instruction',2,'p_instruction','Mparser.py',199),
+  ('instruction -> inst ,','instruction',2,'p_instruction','Mparser.py',200),
+  ('instruction -> expr ,','instruction',2,'p_instruction','Mparser.py',201),
+  ('instruction -> error ;','instruction',2,'p_instruction_error','Mparser.py',206),
+  ('inst -> ids = expr','inst',3,'p_inst_assign','Mparser.py',214),
+  ('inst -> ids ADDASSIGN expr','inst',3,'p_inst_assign','Mparser.py',215),
+  ('inst -> ids SUBASSIGN expr','inst',3,'p_inst_assign','Mparser.py',216),
+  ('inst -> ids MULASSIGN expr','inst',3,'p_inst_assign','Mparser.py',217),
+  ('inst -> ids DIVASSIGN expr','inst',3,'p_inst_assign','Mparser.py',218),
+  ('ids -> ID','ids',1,'p_ids','Mparser.py',224),
+  ('ids -> ID [ values ]','ids',4,'p_ids','Mparser.py',225),
+  ('inst -> BREAK','inst',1,'p_break','Mparser.py',235),
+  ('inst -> CONTINUE','inst',1,'p_continue','Mparser.py',240),
+  ('inst -> RETURN','inst',1,'p_return','Mparser.py',245),
+  ('inst -> RETURN values','inst',2,'p_return','Mparser.py',246),
+  ('inst -> RETURN expr','inst',2,'p_return','Mparser.py',247),
+  ('inst -> PRINT values','inst',2,'p_print','Mparser.py',258),
+  ('inst -> PRINT expr','inst',2,'p_print','Mparser.py',259),
+  ('expr -> expr + expr','expr',3,'p_expr_binary','Mparser.py',265),
+  ('expr -> expr - expr','expr',3,'p_expr_binary','Mparser.py',266),
+  ('expr -> expr * expr','expr',3,'p_expr_binary','Mparser.py',267),
+  ('expr -> expr / expr','expr',3,'p_expr_binary','Mparser.py',268),
+  ('expr -> expr DOTADD expr','expr',3,'p_expr_elementwise','Mparser.py',274),
+  ('expr -> expr DOTSUB expr','expr',3,'p_expr_elementwise','Mparser.py',275),
+  ('expr -> expr DOTMUL expr','expr',3,'p_expr_elementwise','Mparser.py',276),
+  ('expr -> expr DOTDIV expr','expr',3,'p_expr_elementwise','Mparser.py',277),
+  ('expr -> expr EQ expr','expr',3,'p_expr_eq','Mparser.py',283),
+  ('expr -> expr GEQ expr','expr',3,'p_expr_eq','Mparser.py',284),
+  ('expr -> expr LEQ expr','expr',3,'p_expr_eq','Mparser.py',285),
+  ('expr -> expr NEQ expr','expr',3,'p_expr_eq','Mparser.py',286),
+  ('expr -> expr < expr','expr',3,'p_expr_eq','Mparser.py',287),
+  ('expr -> expr > expr','expr',3,'p_expr_eq','Mparser.py',288),
+  ('expr -> ( expr )','expr',3,'p_expr_paren','Mparser.py',294),
+  ("expr -> expr '",'expr',2,'p_expr_transpose','Mparser.py',299),
+  ('expr -> - expr','expr',2,'p_expr_negative','Mparser.py',305),
+  ('expr -> ids','expr',1,'p_expr','Mparser.py',310),
+  ('expr -> integer','expr',1,'p_expr','Mparser.py',311),
+  ('expr -> float','expr',1,'p_expr','Mparser.py',312),
+  ('expr -> string','expr',1,'p_expr','Mparser.py',313),
+  ('expr -> matrix','expr',1,'p_expr','Mparser.py',314),
+  ('integer -> INTNUM','integer',1,'p_integer','Mparser.py',319),
+  ('float -> FLOAT','float',1,'p_float','Mparser.py',324),
+  ('string -> STRING','string',1,'p_string','Mparser.py',329),
+  ('matrix -> ZEROS ( values )','matrix',4,'p_matrix_operations','Mparser.py',334),
+  ('matrix -> ONES ( values )','matrix',4,'p_matrix_operations','Mparser.py',335),
+  ('matrix -> EYE ( values )','matrix',4,'p_matrix_operations','Mparser.py',336),
+  ('matrix -> [ rows ]','matrix',3,'p_matrix_init','Mparser.py',342),
+  ('matrix -> [ rows ; ]','matrix',4,'p_matrix_init','Mparser.py',343),
+  ('rows -> values','rows',1,'p_rows','Mparser.py',348),
+  ('rows -> rows ; values','rows',3,'p_rows_2','Mparser.py',353),
+  ('values -> expr','values',1,'p_values','Mparser.py',359),
+  ('values -> values , expr','values',3,'p_values_2','Mparser.py',364),
+  ('block -> { instructions }','block',3,'p_block','Mparser.py',370),
+  ('block -> { }','block',2,'p_block','Mparser.py',371),
+  ('block -> instruction','block',1,'p_block_2','Mparser.py',381),
+  ('condition -> if_condition','condition',1,'p_conditional','Mparser.py',387),
+  ('condition -> for_condition','condition',1,'p_conditional','Mparser.py',388),
+  ('condition -> while_condition','condition',1,'p_conditional','Mparser.py',389),
+  ('if_condition -> if_cond','if_condition',1,'p_if','Mparser.py',394),
+  ('if_condition -> if_cond ELSE block','if_condition',3,'p_if_2','Mparser.py',399),
+  ('if_condition -> if_cond ELSE if_condition','if_condition',3,'p_if_3','Mparser.py',405),
+  ('if_cond -> IF ( expr ) block','if_cond',5,'p_if_cond','Mparser.py',411),
+  ('for_condition -> FOR ids = range block','for_condition',5,'p_for','Mparser.py',417),
+  ('range -> expr : expr','range',3,'p_range','Mparser.py',423),
+  ('while_condition -> WHILE ( expr ) block','while_condition',5,'p_while','Mparser.py',428),
 ]
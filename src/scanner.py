@@ -2,28 +2,101 @@
 # -*- coding: utf-8 -*-
 
 
+import array
+import bisect
+import functools
+import re
 import ply.lex as lex
+from ply.lex import LexToken
+
+
+newline = re.compile('\n')
+escapes = {'n': '\n', 't': '\t', '"': '"', '\\': '\\'}
+
+
+def string_value(text):
+    # Contents of a STRING token without the quotes, escapes resolved
+    if '\\' not in text:
+        return text[1:-1]
+
+    chars = []
+    i = 1
+
+    while i < len(text) - 1:
+        char = text[i]
+
+        if char == '\\':
+            i += 1
+            char = escapes.get(text[i], '\\' + text[i])
+
+        chars.append(char)
+        i += 1
+
+    return ''.join(chars)
 
 
 class Scanner(object):
     def find_column(self, token):
-        last_cr = self.lexer.lexdata.rfind('\n', 0, token.lexpos)
+        return self.column(token.lexpos)
 
-        if last_cr < 0:
-            last_cr = 0
+    def column(self, lexpos):
+        # Offsets of line starts are indexed once per input()
+        line = bisect.bisect_right(self.line_starts, lexpos) - 1
 
-        column = (token.lexpos - last_cr) + 1
-
-        return column
+        return lexpos - self.line_starts[line] + 1
 
     def build(self):
         self.lexer = lex.lex(object=self)
 
     def input(self, text):
         self.lexer.input(text)
+        self.lexer.lineno = 1
+        self.lexer.line_start = 0
+        self.pending = []
+        self.last_line = self.previous_line = 0
+        self.errors = 0
+        self.line_starts = array.array('L', [0])
+        self.line_starts.extend(match.end() for match in
+                                newline.finditer(text))
 
     def token(self):
-        return self.lexer.token()
+        if self.pending:
+            token = self.pending.pop()
+        else:
+            token = self.lexer.token()
+
+            if token:
+                # Tokens arrive in order, so the current line start is known
+                token.column = token.lexpos - self.lexer.line_start + 1
+
+        if token:
+            self.previous_line = self.last_line
+            self.last_line = token.lineno
+
+        return token
+
+    def replay(self, tokens):
+        # token() returns tokens scanned before, in order, then ends
+        self.input('')
+        self.pending = tokens[::-1]
+
+    def push(self, token):
+        # Pushed back tokens come out of token() first, the last pushed first
+        self.pending.append(token)
+
+    def starts_line(self, token):
+        # Whether the last token returned is the first on its line
+        return token.lineno > self.previous_line
+
+    def synthetic(self, type, line_no, col_no):
+        token = lex.LexToken()
+        token.type = token.value = type
+        token.lineno = line_no
+        token.lexpos = -1
+        token.column = col_no
+        token.synthetic = True
+
+        return token
 
     reserved = {
         'if': 'IF',
@@ -98,11 +171,16 @@ class Scanner(object):
         return t
 
     def t_STRING(self, t):
-        r"\"(.*)+\""
+        r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
         t.value = str(t.value)
 
         return t
 
+    def t_UNTERMINATED_STRING(self, t):
+        r'"[^"\\\n]*(?:\\.[^"\\\n]*)*'
+        print("Unterminated string at line %d" % t.lexer.lineno)
+        self.errors += 1
+
     def t_COMMENT(self, t):
         r'\#.*'
         pass
@@ -111,7 +189,192 @@ class Scanner(object):
         r'\n+'
 
         t.lexer.lineno += len(t.value)
+        t.lexer.line_start = t.lexpos + len(t.value)
+
+    def t_ILLEGAL(self, t):
+        r"([^a-zA-Z0-9_ \t\n+\-*/(){}\[\],;'=:<>.!\"\#]|!(?!=)|\.(?![+\-*/0-9]))+"
+        # Runs of characters that start no token. PLY's t_error path copies
+        # the rest of the input for every illegal character.
+        for char in t.value:
+            print("Illegal character '%s'" % char)
+
+        self.errors += len(t.value)
 
     def t_error(self, t):
         print("Illegal character '%s'" % t.value[0])
+        self.errors += 1
         t.lexer.skip(1)
+
+
+def master_regex(cls):
+    # One regex of a Scanner class's rules, in PLY's order: function rules
+    # as defined, string rules longest first, then literals. Ignored
+    # characters and line breaks are taken in front of a token, the last
+    # branch catches what t_error would get.
+    rules = {}
+
+    for klass in reversed(cls.__mro__):
+        rules.update(vars(klass))
+
+    functions = sorted((value for name, value in rules.items()
+                        if name.startswith('t_') and
+                        name not in ('t_error', 't_newline') and
+                        callable(value)),
+                       key=lambda function: function.__code__.co_firstlineno)
+    strings = sorted(((name, value) for name, value in rules.items()
+                      if name.startswith('t_') and name != 't_ignore' and
+                      isinstance(value, str)),
+                     key=lambda rule: len(rule[1]), reverse=True)
+    branches = ['(?P<{0}>{1})'.format(function.__name__[2:], function.__doc__)
+                for function in functions]
+    branches += ['(?P<{0}>{1})'.format(name[2:], value)
+                 for name, value in strings]
+    branches.append('(?P<literal>[{0}])'.format(
+        ''.join(map(re.escape, rules['literals']))))
+    branches.append(r'(?P<end>\Z)|(?P<error>.)')
+
+    return re.compile('[{0}]*(?:{1})'.format(
+        re.escape(rules['t_ignore'] + '\n'), '|'.join(branches)), re.VERBOSE)
+
+
+# What FastLexer.token() does with a match
+SKIP = 0
+TOKEN = 1
+ID = 2
+INTNUM = 3
+FLOAT = 4
+LITERAL = 5
+UNTERMINATED = 6
+ILLEGAL = 7
+
+
+class FastLexer(object):
+    # Stands in for the PLY lexer of a Scanner. input() scans the whole text
+    # with one regex into two arrays, the group and end of each match, and
+    # token() makes LexTokens from them on demand. Lexical errors are
+    # printed when token() reaches them, with the line number it has then,
+    # like PLY.
+
+    actions = {
+        'COMMENT': SKIP,
+        'end': SKIP,
+        'ID': ID,
+        'INTNUM': INTNUM,
+        'FLOAT': FLOAT,
+        'literal': LITERAL,
+        'UNTERMINATED_STRING': UNTERMINATED,
+        'ILLEGAL': ILLEGAL,
+        'error': ILLEGAL,
+    }
+
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.regex = master_regex(type(scanner))
+        self.blanks = scanner.t_ignore + '\n'
+        # (action, token type) by group number, lastindex of a match is
+        # always one of the named groups
+        self.groups = [None] * (self.regex.groups + 1)
+
+        for name, index in self.regex.groupindex.items():
+            self.groups[index] = (self.actions.get(name, TOKEN), name)
+
+        self.input('')
+
+    def input(self, text):
+        groups = array.array('B')
+        ends = array.array('L')
+        add_group = groups.append
+        add_end = ends.append
+
+        for match in self.regex.finditer(text):
+            add_group(match.lastindex)
+            add_end(match.end())
+
+        self.lexdata = text
+        self.match_groups = groups
+        self.match_ends = ends
+        # Lines count on from lineno, which may be set after input()
+        self.lineno = 1
+        self.line_start = 0
+        # token() returns the next token or None, without a Python call
+        self.token = functools.partial(next, self.tokens(), None)
+
+    def tokens(self):
+        # Runs from the first token(), once the Scanner has indexed the
+        # line starts
+        text = self.lexdata
+        actions = self.groups
+        blanks = self.blanks
+        reserved = self.scanner.reserved
+        line_starts = self.scanner.line_starts
+        lines = len(line_starts)
+        lineno = self.lineno
+        line = 0
+        next_line = line_starts[1] if lines > 1 else len(text) + 1
+        end = 0
+
+        for group, match_end in zip(self.match_groups, self.match_ends):
+            action, type = actions[group]
+            start = end
+            end = match_end
+
+            if action == SKIP:
+                continue
+
+            value = text[start:end]
+
+            if value[0] in blanks:
+                value = value.lstrip(blanks)
+                start = end - len(value)
+
+            if start >= next_line:
+                # Line breaks before the token, counted like t_newline
+                new_line = bisect.bisect_right(line_starts, start, line) - 1
+                lineno += new_line - line
+                line = new_line
+                next_line = line_starts[line + 1] if line + 1 < lines \
+                    else len(text) + 1
+                self.lineno = lineno
+                self.line_start = line_starts[line]
+
+            if action >= UNTERMINATED:
+                self.report(action, value)
+                continue
+
+            token = LexToken()
+            token.lineno = lineno
+            token.lexpos = start
+
+            if action == ID:
+                type = reserved.get(value, 'ID')
+            elif action == LITERAL:
+                type = value
+            elif action == INTNUM:
+                value = int(value)
+            elif action == FLOAT:
+                value = float(value)
+
+            token.type = type
+            token.value = value
+
+            yield token
+
+        self.lineno = lineno + lines - 1 - line
+        self.line_start = line_starts[-1]
+
+    def report(self, action, value):
+        # The messages of Scanner's error rules
+        if action == UNTERMINATED:
+            print("Unterminated string at line %d" % self.lineno)
+            self.scanner.errors += 1
+        else:
+            for char in value:
+                print("Illegal character '%s'" % char)
+
+            self.scanner.errors += len(value)
+
+
+class FastScanner(Scanner):
+    # Scanner with the PLY lexer replaced by a FastLexer, same tokens
+    def build(self):
+        self.lexer = FastLexer(self)
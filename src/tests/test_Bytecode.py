@@ -0,0 +1,38 @@
+import contextlib
+import io
+import unittest
+from Bytecode import BytecodeCompiler
+from Interpreter import Interpreter
+from Mparser import Mparser
+
+
+def output(run, text):
+    ast = Mparser().parse(text)
+    stdout = io.StringIO()
+
+    with contextlib.redirect_stdout(stdout):
+        run(ast)
+
+    return stdout.getvalue()
+
+
+class EmptyBlockTest(unittest.TestCase):
+
+    def assertSameOutput(self, text):
+        self.assertEqual(
+            output(lambda ast: BytecodeCompiler().compile(ast).run(), text),
+            output(lambda ast: Interpreter().run(ast), text))
+
+    def test_empty_if_body(self):
+        self.assertSameOutput("if (1 < 2) { }\nif (1 > 2) { } else { }\n"
+                              "print 1;\n")
+
+    def test_empty_while_body(self):
+        self.assertSameOutput("w = 0;\nwhile (w > 0) { }\nprint w;\n")
+
+    def test_empty_for_body(self):
+        self.assertSameOutput("for i = 1:2 { }\nprint i;\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
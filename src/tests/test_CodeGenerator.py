@@ -0,0 +1,50 @@
+import unittest
+import CodeGenerator
+from Exceptions import RuntimeException
+from Interpreter import Interpreter
+from Mparser import Mparser
+
+
+class RuntimeErrorTest(unittest.TestCase):
+    # The generated code fails with the engines' messages
+
+    def assertSameError(self, text, message):
+        ast = Mparser().parse(text)
+
+        with self.assertRaises(RuntimeException) as engine:
+            Interpreter().run(ast)
+        with self.assertRaises(RuntimeError) as generated:
+            CodeGenerator.load(CodeGenerator.generate(ast)).run()
+
+        self.assertEqual(str(engine.exception), message)
+        self.assertEqual(str(generated.exception), message)
+
+    def test_index_out_of_bounds(self):
+        self.assertSameError("A = zeros(3); for i = 1:5 { A[i, 1] = 1; }",
+                             "Line 1: Invalid index for A")
+
+    def test_index_below_one(self):
+        self.assertSameError("A = ones(2);\nA[0] = 1;\n",
+                             "Line 2: Invalid index for A")
+        self.assertSameError("A = ones(2);\nB = A;\nx = A[1, 1] + B[0, 1];\n",
+                             "Line 3: Invalid index for B")
+
+    def test_division_by_zero(self):
+        self.assertSameError("x = 1 / 0;",
+                             "Line 1: integer division or modulo by zero")
+        self.assertSameError("x = 2.5;\ny = 0;\nx /= y;\n",
+                             "Line 3: float division by zero")
+
+    def test_range_bounds(self):
+        self.assertSameError("x = 1.5;\nfor i = 1:x { print i; }\n",
+                             "Line 2: Range bounds must be integers")
+
+    def test_empty_range_leaves_counter_unbound(self):
+        ast = Mparser().parse("for i = 3:1 { x = 1; }\nprint i;\n")
+
+        with self.assertRaises(UnboundLocalError):
+            CodeGenerator.load(CodeGenerator.generate(ast)).run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from Compiler import Compiler
+from Mparser import Mparser
+
+
+class EmptyBlockTest(unittest.TestCase):
+
+    def run_program(self, text):
+        return Compiler().compile(Mparser().parse(text)).run()
+
+    def test_empty_if_body(self):
+        self.run_program("if (1 < 2) { }\nif (1 > 2) { } else { }\n")
+
+    def test_empty_while_body(self):
+        self.run_program("i = 0;\nwhile (i > 0) { }\n")
+
+    def test_empty_for_body(self):
+        program = Compiler().compile(Mparser().parse("for i = 1:2 { }\n"))
+        program.run()
+
+        self.assertEqual(program.variables()['i'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from Incremental import Document
+
+
+class RepeatedStatementTest(unittest.TestCase):
+    # Identical statements are separate chunks, checked in their own place
+
+    def test_edit_keeps_repeated_chunks_apart(self):
+        document = Document("print y;\ny = 2;\nprint y;\n")
+        self.assertEqual(document.diagnostics(),
+                         ["Line 1: print operation with unknown variable"])
+
+        document.update("print y;\ny = 3;\nprint y;\n")
+
+        self.assertIsNot(document.chunks[0], document.chunks[2])
+        self.assertEqual(document.diagnostics(),
+                         ["Line 1: print operation with unknown variable"])
+
+    def test_edit_matches_whole_check(self):
+        text = "x = 1;\nprint x;\nx = 1;\nprint x;\nx = 1;\n"
+        document = Document(text)
+        document.update(text.replace("print x;\nx = 1;\nprint x;",
+                                     "print x;\nprint x;\nx = 1;\nprint x;"))
+
+        self.assertEqual(len(set(map(id, document.chunks))),
+                         len(document.chunks))
+        self.assertEqual(document.diagnostics(),
+                         Document(''.join(document.lines)).diagnostics())
+
+
+if __name__ == '__main__':
+    unittest.main()
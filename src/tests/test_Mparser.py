@@ -0,0 +1,63 @@
+import unittest
+import AST
+from Mparser import Mparser
+
+
+class EndOfInputTest(unittest.TestCase):
+    def parse(self, text):
+        parser = Mparser()
+        ast = parser.parse(text)
+
+        return ast, [str(error) for error in parser.errors]
+
+    def test_open_blocks_are_closed(self):
+        ast, errors = self.parse("x = 1;\nB = A * ones(3, 2);\n"
+                                 "for i = 1:3 {\nbreak;\n")
+        instructions = ast.instructions_opt.instructions
+
+        self.assertEqual(errors, ["Line 4: Unexpected end of input"])
+        self.assertEqual([node.__class__ for node in instructions],
+                         [AST.Assign, AST.Assign, AST.ForCondition])
+
+    def test_completed_statements_are_kept(self):
+        ast, errors = self.parse("x = 1;\nif (x) {\n y = (1 +\n")
+        instructions = ast.instructions_opt.instructions
+
+        self.assertEqual(errors, ["Line 3: Unexpected end of input"])
+        self.assertEqual([node.__class__ for node in instructions],
+                         [AST.Assign, AST.Error])
+
+
+
+class StrayTokenTest(unittest.TestCase):
+    def parse(self, text):
+        parser = Mparser()
+        ast = parser.parse(text)
+        instructions = ast.instructions_opt.instructions
+
+        return ([node.__class__ for node in instructions],
+                [str(error) for error in parser.errors])
+
+    def test_stray_brace_keeps_statements(self):
+        self.assertEqual(self.parse("x = 1; } y = 2;"),
+                         ([AST.Assign, AST.Error, AST.Assign],
+                          ["Line 1: Syntax error at '}'"]))
+        self.assertEqual(self.parse("x = 1;\n}\ny = 2;\nz = ;\nw = 3;"),
+                         ([AST.Assign, AST.Error, AST.Assign, AST.Error,
+                           AST.Assign],
+                          ["Line 2: Syntax error at '}'",
+                           "Line 4: Syntax error at ';'"]))
+
+    def test_stray_brace_after_block(self):
+        self.assertEqual(self.parse("if (1) { x = 1; } }\ny = 2;"),
+                         ([AST.IfCondition, AST.Error, AST.Assign],
+                          ["Line 1: Syntax error at '}'"]))
+
+    def test_stray_semicolon(self):
+        self.assertEqual(self.parse("x = 1;\n;\ny = 2;"),
+                         ([AST.Assign, AST.Error, AST.Assign],
+                          ["Line 2: Syntax error at ';'"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
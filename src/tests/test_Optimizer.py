@@ -0,0 +1,33 @@
+import unittest
+from Exceptions import RuntimeException
+from Interpreter import Interpreter
+from Mparser import Mparser
+from Optimizer import AssignedTypes, Optimizer
+
+
+unchecked_block = """B = ones(2, 2);
+if (1) { B = ones(3, 3); }
+C = zeros(2, 2) + B;
+print C;
+"""
+
+
+class UncheckedBlockTest(unittest.TestCase):
+    # The checker skips a block under a condition that is not a boolean
+
+    def test_block_assignment_is_collected(self):
+        ast = Mparser().parse(unchecked_block)
+
+        self.assertNotIn('B', AssignedTypes().collect(ast))
+
+    def test_optimized_program_still_fails(self):
+        parser = Mparser()
+
+        for ast in (parser.parse(unchecked_block),
+                    Optimizer().optimize(parser.parse(unchecked_block))):
+            with self.assertRaises(RuntimeException):
+                Interpreter().run(ast)
+
+
+if __name__ == '__main__':
+    unittest.main()
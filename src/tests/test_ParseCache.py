@@ -0,0 +1,30 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from ParseCache import ParseCache
+
+
+class StoreTest(unittest.TestCase):
+    def test_failed_store_leaves_no_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ParseCache(directory=directory)
+
+            with mock.patch('os.replace', side_effect=OSError):
+                ast = cache.parse("x = 1;\n")
+
+            self.assertIsNotNone(ast)
+            self.assertEqual([names for path, dirs, names in
+                              os.walk(directory) if names], [])
+
+    def test_store_then_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ParseCache(directory=directory)
+            cache.parse("x = 1;\n")
+
+            self.assertTrue(os.path.exists(cache.path("x = 1;\n")))
+            self.assertIsNotNone(cache.parse("x = 1;\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import io
+import json
+import unittest
+from Server import Server
+
+
+def serve(requests):
+    # Responses of the server to requests sent as JSON lines
+    output = io.StringIO()
+    Server().serve(io.StringIO(''.join(json.dumps(request) + "\n"
+                                       for request in requests)), output)
+
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class EditTest(unittest.TestCase):
+    def test_edit_with_repeated_lines_keeps_diagnostics(self):
+        unknown = "Line 1: print operation with unknown variable"
+        responses = serve([
+            {'id': 1, 'method': 'check', 'file': 'repeated.m',
+             'text': "print y;\ny = 2;\nprint y;\n"},
+            {'id': 2, 'method': 'check', 'file': 'repeated.m',
+             'text': "print y;\ny = 3;\nprint y;\n"},
+        ])
+
+        self.assertEqual([response['id'] for response in responses], [1, 2])
+        self.assertEqual(responses[0]['result']['diagnostics'], [unknown])
+        self.assertEqual(responses[1]['result']['diagnostics'], [unknown])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from TokenStream import TokenCache
+
+
+class StoreTest(unittest.TestCase):
+    def test_failed_store_leaves_no_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TokenCache(directory=directory)
+
+            with mock.patch('os.replace', side_effect=OSError):
+                stream = cache.scan("x = 1;\n")
+
+            self.assertEqual(len(stream), 4)
+            self.assertEqual([names for path, dirs, names in
+                              os.walk(directory) if names], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import contextlib
+import io
+import unittest
+from Mparser import Mparser
+from TypeChecker import TypeChecker
+
+
+def check(text):
+    # Diagnostics of the checker, one per line
+    ast = Mparser().parse(text)
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        TypeChecker().visit(ast)
+
+    return output.getvalue().splitlines()
+
+
+class BlockScopeTest(unittest.TestCase):
+    # Blocks share the variables of the program, as every engine runs them
+
+    def test_if_assignment_outlives_block(self):
+        self.assertEqual(check("if (1 == 1) { y = 2; }\nprint y;\n"), [])
+
+    def test_loop_assignment_and_counter_outlive_loop(self):
+        self.assertEqual(check("for i = 1:3 { z = i; }\nprint z, i;\n"), [])
+        self.assertEqual(check("w = 0;\nwhile (w < 3) { w += 1; v = w; }\n"
+                               "print v;\n"), [])
+
+    def test_block_variables_live_in_program_table(self):
+        checker = TypeChecker()
+        checker.visit(Mparser().parse("if (1 == 1) { y = 2; }\n"
+                                      "for i = 1:3 {\n"
+                                      "    while (i < 0) { z = i; }\n"
+                                      "}\n"))
+
+        self.assertIsNone(checker.table.parent)
+        self.assertEqual(sorted(checker.table.symbol_table), ['i', 'y', 'z'])
+
+    def test_unknown_variable_still_reported(self):
+        self.assertEqual(check("print y;\n"),
+                         ["Line 1: print operation with unknown variable"])
+
+
+class ElementStoreTest(unittest.TestCase):
+    # Storing an element keeps the matrix and its sizes
+
+    def test_matrix_type_is_kept(self):
+        self.assertEqual(check("A = zeros(2, 3);\nA[1, 1] = 2;\n"
+                               "A[1, 2] += 1;\nB = A * ones(3, 4);\n"
+                               "D = A';\nprint B, D;\n"), [])
+
+    def test_sizes_are_kept(self):
+        self.assertEqual(check("A = zeros(2, 3);\nA[1, 1] = 2;\n"
+                               "C = A * ones(2, 2);\n"),
+                         ["Line 3: Invalid dimensions for matrices  (2x3) "
+                          "and (2x2)"])
+
+    def test_element_must_be_numeric(self):
+        self.assertEqual(check("A = ones(3);\nA[1, 1] = ones(3);\n"
+                               "A[2, 2] += \"a\";\n"),
+                         ["Line 2: Invalid assigning of matrix3x3 to a "
+                          "matrix element",
+                          "Line 3: Invalid assigning of string to a "
+                          "matrix element"])
+
+    def test_symbolic_sizes_are_kept(self):
+        checker = TypeChecker()
+        checker.visit(Mparser().parse("for n = 1:3 { }\nA = zeros(3, n);\n"
+                                      "A[1, 1] = 2;\n"))
+        matrix = checker.table.get('A').type
+
+        self.assertTrue(matrix.is_matrix)
+        self.assertIs(matrix.cols, checker.table.get('n').dim)
+
+
+if __name__ == '__main__':
+    unittest.main()